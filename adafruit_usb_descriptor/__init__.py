@@ -0,0 +1,55 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import importlib
+
+"""
+USB descriptor generation
+=========================
+
+Submodules are imported the first time they're read as attributes of the package,
+so ``import adafruit_usb_descriptor`` doesn't import any of them::
+
+    import adafruit_usb_descriptor as usb
+    usb.hid.ReportDescriptor.GENERIC_MOUSE_REPORT
+
+``import adafruit_usb_descriptor.hid`` and ``from adafruit_usb_descriptor import
+hid`` work as before.
+"""
+
+# Submodules the package imports on first use.
+MODULES = ("standard", "cdc", "hid", "midi", "msc", "audio", "audio10",
+           "util", "frozen", "descriptor_set", "enumeration", "usbip", "batch", "cache",
+           "emit", "codegen", "planner", "instrument", "columnar", "parse", "sysfs",
+           "capture", "diff", "spec", "msos", "fuzz")
+
+
+def __getattr__(name):
+    if name not in MODULES:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    # Importing a submodule also sets it as an attribute of the package, so this is
+    # only called once for each.
+    return importlib.import_module("." + name, __name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULES))
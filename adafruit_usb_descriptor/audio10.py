@@ -23,6 +23,7 @@
 import struct
 
 from . import standard
+from . import util
 
 """
 Audio specific descriptors
@@ -45,26 +46,21 @@ class AudioControlInterface:
 
     def __init__(self, *,
                  description,
-                 units_and_terminals=[],
-                 audio_streaming_interfaces=[],
-                 midi_streaming_interfaces=[]):
+                 units_and_terminals=None,
+                 audio_streaming_interfaces=None,
+                 midi_streaming_interfaces=None):
         self.description = description
         self.bcdADC = 0x0100
-        self.units_and_terminals = units_and_terminals
-        self.audio_streaming_interfaces = audio_streaming_interfaces
-        self.midi_streaming_interfaces = midi_streaming_interfaces
+        self.units_and_terminals = units_and_terminals if units_and_terminals is not None else []
+        self.audio_streaming_interfaces = audio_streaming_interfaces if audio_streaming_interfaces is not None else []
+        self.midi_streaming_interfaces = midi_streaming_interfaces if midi_streaming_interfaces is not None else []
 
     @property
     def bLength(self):
         return self.fixed_bLength + len(self.audio_streaming_interfaces) + len(self.midi_streaming_interfaces)
 
     def notes(self):
-        notes = [str(self)]
-        for a in self.audio_streaming_interfaces:
-            notes.extend(a.notes())
-        for m in self.midi_streaming_interfaces:
-            notes.extend(m.notes())
-        return notes
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         units_and_terminals = bytes(self.units_and_terminals)
@@ -0,0 +1,149 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+import concurrent.futures
+import itertools
+import time
+import traceback
+
+from . import frozen
+
+"""
+Batch builds
+============
+
+Builds every variant of a board × feature matrix in a process pool.
+
+The builder is a module level function, so it can be pickled, that takes one
+variant dict and returns something picklable, usually the serialized descriptors.
+Variants that have the same `key` are built once. Results stream back as they
+finish.
+"""
+
+# ``error`` is the formatted traceback when the builder raised, otherwise None.
+# ``seconds`` is the builder's run time in the worker.
+Result = collections.namedtuple("Result", ("variant", "value", "seconds", "error"))
+
+_worker_cache = {}
+
+
+def variants(matrix, *, exclude=None):
+    """Yields a dict for every combination of the values in ``matrix``, which maps
+       each axis name to a list of values. Combinations for which ``exclude`` returns
+       true are skipped."""
+    names = list(matrix)
+    for values in itertools.product(*(matrix[name] for name in names)):
+        variant = dict(zip(names, values))
+        if exclude is None or not exclude(variant):
+            yield variant
+
+
+def default_key(variant):
+    return tuple(sorted(variant.items()))
+
+
+def shared(key, factory):
+    """Returns ``factory()`` frozen with `frozen.freeze`, calling it only once per
+       worker process for each ``key``.
+
+       Builders use it to reuse sub-function trees that are identical across
+       variants, such as a HID function with the same reports. Every call for a
+       ``key`` returns the same frozen tree, which `util.join_interfaces` renumbers
+       by copying only the descriptors that change.
+    """
+    try:
+        return _worker_cache[key]
+    except KeyError:
+        value = _worker_cache[key] = frozen.freeze(factory())
+        return value
+
+
+def _initialize_worker(modules):
+    # Pay for imports once per worker instead of once per variant.
+    for module in modules:
+        __import__(module)
+
+
+def _run(builder, variant):
+    start = time.perf_counter()
+    try:
+        value = builder(variant)
+        error = None
+    except Exception:
+        value = None
+        error = traceback.format_exc()
+    return value, time.perf_counter() - start, error
+
+
+def build(matrix, builder, *,
+          workers=None,
+          key=default_key,
+          exclude=None,
+          preload=("adafruit_usb_descriptor.standard",
+                   "adafruit_usb_descriptor.cdc",
+                   "adafruit_usb_descriptor.hid",
+                   "adafruit_usb_descriptor.midi",
+                   "adafruit_usb_descriptor.msc",
+                   "adafruit_usb_descriptor.util")):
+    """Yields a `Result` for every variant as soon as it's built.
+
+       ``matrix`` is a dict for `variants` or an iterable of variant dicts. Variants
+       with equal ``key(variant)`` are built once and share the result, so pass a key
+       that ignores axes the builder doesn't use. ``workers`` is the process count,
+       defaulting to the number of CPUs. ``workers=0`` builds in this process.
+       ``preload`` modules are imported once by each worker when it starts.
+    """
+    if isinstance(matrix, dict):
+        matrix = variants(matrix, exclude=exclude)
+    groups = collections.OrderedDict()
+    for variant in matrix:
+        groups.setdefault(key(variant), []).append(variant)
+
+    if workers == 0:
+        for group in groups.values():
+            value, seconds, error = _run(builder, group[0])
+            for variant in group:
+                yield Result(variant, value, seconds, error)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers,
+                                                initializer=_initialize_worker,
+                                                initargs=(preload,)) as executor:
+        futures = {executor.submit(_run, builder, group[0]): group
+                   for group in groups.values()}
+        for future in concurrent.futures.as_completed(futures):
+            value, seconds, error = future.result()
+            for variant in futures[future]:
+                yield Result(variant, value, seconds, error)
+
+
+def summary(results):
+    """Returns counts and timing totals for a list of `Result` s."""
+    seconds = [r.seconds for r in results]
+    return {
+        "variants": len(results),
+        "errors": sum(1 for r in results if r.error is not None),
+        "total_seconds": sum(seconds),
+        "max_seconds": max(seconds, default=0.0),
+        "mean_seconds": sum(seconds) / len(seconds) if seconds else 0.0,
+    }
@@ -0,0 +1,224 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import hashlib
+import os
+import struct
+import tempfile
+
+"""
+Generated output cache
+======================
+
+Content addressed on-disk cache for serialized descriptors and the artifacts
+emitted from them, keyed by a structural hash of the descriptor tree.
+"""
+
+_library_version = None
+
+
+def library_version():
+    """Returns a digest of this library's source. It changes whenever the code that
+       serializes or emits descriptors might have."""
+    global _library_version
+    if _library_version is None:
+        digest = hashlib.sha256()
+        package = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(package, name), "rb") as f:
+                    digest.update(f.read())
+        _library_version = digest.hexdigest()
+    return _library_version
+
+
+def _update(digest, value, active):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        digest.update("{}:{!r};".format(type(value).__name__, value).encode())
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        digest.update(b"bytes:%d:" % len(value))
+        digest.update(value)
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"list:%d[" % len(value))
+        for item in value:
+            _update(digest, item, active)
+        digest.update(b"]")
+    elif isinstance(value, dict):
+        digest.update(b"dict:%d{" % len(value))
+        for k in sorted(value, key=repr):
+            _update(digest, k, active)
+            _update(digest, value[k], active)
+        digest.update(b"}")
+    elif hasattr(value, "__dict__"):
+        if id(value) in active:
+            # A reference back up the tree.
+            digest.update(b"cycle;")
+            return
+        active.add(id(value))
+        cls = type(value)
+        digest.update("{}.{}(".format(cls.__module__, cls.__qualname__).encode())
+        derived = getattr(cls, "derived_fields", ())
+        for name in sorted(vars(value)):
+            if name in derived:
+                continue
+            digest.update(name.encode() + b"=")
+            _update(digest, vars(value)[name], active)
+        digest.update(b")")
+        active.discard(id(value))
+    else:
+        raise TypeError("Can't hash {!r}".format(value))
+
+
+def structural_hash(tree):
+    """Returns a hex digest of every field of every descriptor in ``tree`` and the
+       `library_version`. ``tree`` is a descriptor or any nesting of lists, tuples
+       and dicts of them. The ``derived_fields`` that serialization fills in are
+       skipped so the hash is the same before and after serializing."""
+    digest = hashlib.sha256(library_version().encode())
+    _update(digest, tree, set())
+    return digest.hexdigest()
+
+
+_magic = b"USBC\x01"
+_count = struct.Struct("<I")
+_name_length = struct.Struct("<H")
+_data_length = struct.Struct("<I")
+
+
+def _encode(artifacts):
+    parts = [_magic, _count.pack(len(artifacts))]
+    for name, data in sorted(artifacts.items()):
+        encoded_name = name.encode()
+        parts += [_name_length.pack(len(encoded_name)), encoded_name,
+                  _data_length.pack(len(data)), bytes(data)]
+    return b"".join(parts)
+
+
+def _decode(blob):
+    if not blob.startswith(_magic):
+        raise ValueError("Not a cache entry")
+    offset = len(_magic)
+    count = _count.unpack_from(blob, offset)[0]
+    offset += _count.size
+    artifacts = {}
+    for _ in range(count):
+        length = _name_length.unpack_from(blob, offset)[0]
+        offset += _name_length.size
+        name = blob[offset:offset + length].decode()
+        offset += length
+        length = _data_length.unpack_from(blob, offset)[0]
+        offset += _data_length.size
+        if offset + length > len(blob):
+            raise ValueError("Truncated cache entry")
+        artifacts[name] = blob[offset:offset + length]
+        offset += length
+    return artifacts
+
+
+class DescriptorCache:
+    """Directory of cached artifacts, least recently used first out past ``max_bytes``.
+
+       Entries are written to a temporary file and renamed into place, so concurrent
+       build workers only ever see complete entries. A reader that loses a race with
+       eviction sees a miss.
+    """
+    suffix = ".usbc"
+
+    def __init__(self, path, *, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def _entry(self, key):
+        return os.path.join(self.path, key + self.suffix)
+
+    def get(self, key):
+        """Returns the dict of artifacts for ``key`` or None."""
+        path = self._entry(key)
+        try:
+            with open(path, "rb") as f:
+                artifacts = _decode(f.read())
+            os.utime(path)
+        except (OSError, ValueError, struct.error):
+            return None
+        return artifacts
+
+    def put(self, key, artifacts):
+        """Stores ``artifacts``, a dict from name to bytes, under ``key``."""
+        fd, temporary = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_encode(artifacts))
+            os.replace(temporary, self._entry(key))
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def get_or_build(self, tree, build):
+        """Returns the artifacts for ``tree``, calling ``build(tree)`` only on a miss.
+
+           ``build`` returns a dict from artifact name to bytes, for example the
+           serialized image under ``"image"`` and emitted C source under ``"c"``.
+        """
+        key = structural_hash(tree)
+        artifacts = self.get(key)
+        if artifacts is None:
+            artifacts = build(tree)
+            self.put(key, artifacts)
+        return artifacts
+
+    def evict(self):
+        """Removes the least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.path):
+            if not entry.name.endswith(self.suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(self.suffix):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
@@ -0,0 +1,451 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+import struct
+import time
+
+from . import audio
+from . import hid
+from . import midi
+from . import parse
+from . import standard
+
+"""
+usbmon captures
+===============
+
+Streams pcap and pcapng captures of Linux usbmon traffic, as saved by Wireshark or
+``tcpdump -i usbmonN``, one record at a time so that captures of any size can be
+read without loading them.
+
+`Decoder` follows each device's enumeration: it pairs GET_DESCRIPTOR requests with
+their responses, decodes them with `parse` and remembers the interfaces of the
+configuration. Interrupt and bulk payloads on HID endpoints are then decoded with
+`hid.ReportDecoder` and those on MIDI streaming endpoints with
+`midi.unpack_event_packets`. `Throughput` counts the bytes read and the time
+taken.
+"""
+
+LINKTYPE_USB_LINUX = 189
+LINKTYPE_USB_LINUX_MMAPPED = 220
+
+URB_SUBMIT = ord("S")
+URB_COMPLETE = ord("C")
+URB_ERROR = ord("E")
+
+TRANSFER_ISOCHRONOUS = 0
+TRANSFER_INTERRUPT = 1
+TRANSFER_CONTROL = 2
+TRANSFER_BULK = 3
+
+REQUEST_GET_DESCRIPTOR = 0x06
+REQUEST_SET_CONFIGURATION = 0x09
+DESCRIPTOR_TYPE_HID_REPORT = 0x22
+
+# One usbmon event. ``endpoint`` is the address, with 0x80 for IN. ``setup`` is
+# the 8 byte setup packet of control submissions, otherwise None.
+Urb = collections.namedtuple("Urb", ("timestamp", "id", "type", "transfer_type", "endpoint",
+                                     "device", "bus", "setup", "status", "length", "data"))
+
+# A GET_DESCRIPTOR response. ``descriptor`` is None until a configuration or BOS
+# response is complete, or when it doesn't decode.
+DescriptorEvent = collections.namedtuple("DescriptorEvent", (
+    "timestamp", "bus", "device", "bDescriptorType", "index", "wIndex", "data", "descriptor"))
+# A report on a HID endpoint. ``report_id`` and ``values`` are from
+# `hid.ReportDecoder.decode` and None without a captured report descriptor.
+ReportEvent = collections.namedtuple("ReportEvent", (
+    "timestamp", "bus", "device", "endpoint", "data", "report_id", "values"))
+# A transfer on a MIDI streaming endpoint. ``packets`` are its USB-MIDI event
+# packets as ``(cable_number, code_index, midi_bytes)`` from
+# `midi.unpack_event_packets`.
+MIDIEvent = collections.namedtuple("MIDIEvent", (
+    "timestamp", "bus", "device", "endpoint", "data", "packets"))
+
+_PCAP_MAGIC = 0xA1B2C3D4
+_PCAP_MAGIC_NANOSECONDS = 0xA1B23C4D
+_PCAPNG_SECTION = 0x0A0D0D0A
+_PCAPNG_BYTE_ORDER = 0x1A2B3C4D
+_PCAPNG_INTERFACE = 1
+_PCAPNG_SIMPLE_PACKET = 3
+_PCAPNG_ENHANCED_PACKET = 6
+_PCAPNG_TSRESOL = 9
+
+# Without the byte order, which comes from the file.
+_usbmon_fmt = "QBBBBHbbqiiII8s"
+_usbmon_mmapped_fmt = _usbmon_fmt + "iiII"
+_iso_descriptor_size = 16
+_setup = struct.Struct("<BBHHH")
+_u16 = struct.Struct("<H")
+
+
+class Throughput:
+    """Bytes and packets read from a capture and the seconds taken."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.packets = 0
+        self.seconds = 0.0
+
+    @property
+    def megabytes_per_second(self):
+        if not self.seconds:
+            return 0.0
+        return self.bytes / self.seconds / 1e6
+
+    def __repr__(self):
+        return "<{} {} bytes {} packets {:.1f} MB/s>".format(
+            type(self).__name__, self.bytes, self.packets, self.megabytes_per_second)
+
+
+def _read(stream, size, throughput, *, optional=False):
+    """Reads exactly ``size`` bytes, or nothing at the end of an ``optional`` read."""
+    data = stream.read(size)
+    if len(data) != size:
+        if optional and not data:
+            return data
+        raise ValueError("Capture truncated")
+    if throughput is not None:
+        throughput.bytes += size
+    return data
+
+
+def _pcap_records(stream, magic, throughput):
+    header = magic + _read(stream, 20, throughput)
+    order = "<" if struct.unpack("<I", magic)[0] in (_PCAP_MAGIC, _PCAP_MAGIC_NANOSECONDS) else ">"
+    number, _, _, _, _, _, linktype = struct.unpack(order + "IHHiIII", header)
+    scale = 1e-9 if number == _PCAP_MAGIC_NANOSECONDS else 1e-6
+    record = struct.Struct(order + "IIII")
+    while True:
+        header = _read(stream, record.size, throughput, optional=True)
+        if not header:
+            return
+        seconds, fraction, captured, _ = record.unpack(header)
+        data = _read(stream, captured, throughput)
+        if throughput is not None:
+            throughput.packets += 1
+        yield seconds + fraction * scale, linktype, order, data
+
+
+def _tsresol(options, order):
+    offset = 0
+    while offset + 4 <= len(options):
+        code, length = struct.unpack_from(order + "HH", options, offset)
+        if code == 0:
+            break
+        if code == _PCAPNG_TSRESOL and length >= 1:
+            value = options[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def _pcapng_records(stream, magic, throughput):
+    order = "<"
+    # Link type and timestamp resolution of each interface in the section.
+    interfaces = []
+    header = magic + _read(stream, 4, throughput)
+    while header:
+        # The section header's type reads the same in either byte order.
+        if header[:4] == magic:
+            # Its byte order magic says how to read the section, its length included.
+            byte_order = _read(stream, 4, throughput)
+            order = "<" if struct.unpack("<I", byte_order)[0] == _PCAPNG_BYTE_ORDER else ">"
+            length = struct.unpack(order + "I", header[4:])[0]
+            if length < 28 or length % 4:
+                raise ValueError("Bad pcapng section length {}".format(length))
+            _read(stream, length - 12, throughput)
+            interfaces = []
+        else:
+            block_type, length = struct.unpack(order + "II", header)
+            if length < 12 or length % 4:
+                raise ValueError("Bad pcapng block length {}".format(length))
+            body = _read(stream, length - 8, throughput)
+            if block_type == _PCAPNG_INTERFACE:
+                linktype = struct.unpack_from(order + "H", body)[0]
+                interfaces.append((linktype, _tsresol(body[8:-4], order)))
+            elif block_type == _PCAPNG_ENHANCED_PACKET:
+                interface, high, low, captured, _ = struct.unpack_from(order + "IIIII", body)
+                if interface >= len(interfaces) or 20 + captured > len(body) - 4:
+                    raise ValueError("Bad pcapng packet block")
+                linktype, resolution = interfaces[interface]
+                if throughput is not None:
+                    throughput.packets += 1
+                yield ((high << 32 | low) * resolution, linktype, order,
+                       body[20:20 + captured])
+            elif block_type == _PCAPNG_SIMPLE_PACKET:
+                if not interfaces:
+                    raise ValueError("pcapng packet before any interface")
+                original = struct.unpack_from(order + "I", body)[0]
+                if throughput is not None:
+                    throughput.packets += 1
+                yield None, interfaces[0][0], order, body[4:4 + min(original, len(body) - 8)]
+        header = _read(stream, 8, throughput, optional=True)
+
+
+def iter_records(stream, throughput=None):
+    """Yields ``(timestamp, linktype, byte_order, data)`` for each packet in the pcap
+       or pcapng capture read from binary ``stream``. ``byte_order`` is the struct
+       prefix of the host that wrote it. ``throughput``, a `Throughput`, counts what
+       is read."""
+    magic = _read(stream, 4, throughput, optional=True)
+    if not magic:
+        return
+    if struct.unpack("<I", magic)[0] == _PCAPNG_SECTION:
+        yield from _pcapng_records(stream, magic, throughput)
+    elif (struct.unpack("<I", magic)[0] in (_PCAP_MAGIC, _PCAP_MAGIC_NANOSECONDS) or
+          struct.unpack(">I", magic)[0] in (_PCAP_MAGIC, _PCAP_MAGIC_NANOSECONDS)):
+        yield from _pcap_records(stream, magic, throughput)
+    else:
+        raise ValueError("Not a pcap or pcapng capture")
+
+
+_usbmon_structs = {}
+
+
+def _usbmon_struct(linktype, order):
+    key = (linktype, order)
+    try:
+        return _usbmon_structs[key]
+    except KeyError:
+        fmt = _usbmon_mmapped_fmt if linktype == LINKTYPE_USB_LINUX_MMAPPED else _usbmon_fmt
+        packer = _usbmon_structs[key] = struct.Struct(order + fmt)
+        return packer
+
+
+def iter_urbs(stream, throughput=None):
+    """Yields an `Urb` for each usbmon packet in the capture read from ``stream``.
+       Packets of other link types are skipped."""
+    for timestamp, linktype, order, data in iter_records(stream, throughput):
+        if linktype not in (LINKTYPE_USB_LINUX, LINKTYPE_USB_LINUX_MMAPPED):
+            continue
+        packer = _usbmon_struct(linktype, order)
+        if len(data) < packer.size:
+            raise ValueError("Truncated usbmon header")
+        fields = packer.unpack_from(data)
+        (urb_id, urb_type, transfer_type, endpoint, device, bus, flag_setup, _,
+         seconds, microseconds, status, length, captured, setup) = fields[:14]
+        start = packer.size
+        if linktype == LINKTYPE_USB_LINUX_MMAPPED and transfer_type == TRANSFER_ISOCHRONOUS:
+            start += fields[17] * _iso_descriptor_size
+        if timestamp is None:
+            timestamp = seconds + microseconds * 1e-6
+        yield Urb(timestamp, urb_id, urb_type, transfer_type, endpoint, device, bus,
+                  setup if flag_setup == 0 else None, status, length,
+                  memoryview(data)[start:start + captured])
+
+
+class _Device:
+    def __init__(self):
+        # Longest response to each GET_DESCRIPTOR by (type, index, wIndex).
+        self.responses = {}
+        self.configurations = {}
+        self.configuration_value = None
+        # Report decoders by interface number.
+        self.reports = {}
+        # ("hid" or "midi", interface number) by endpoint address.
+        self.routes = {}
+
+    def route(self):
+        configuration = self.configurations.get(self.configuration_value)
+        if configuration is None and self.configurations:
+            configuration = next(iter(self.configurations.values()))
+        self.routes = {}
+        if configuration is None:
+            return
+        for interface in configuration:
+            if not isinstance(interface, standard.InterfaceDescriptor):
+                continue
+            if interface.bInterfaceClass == hid.HID_CLASS:
+                kind = "hid"
+            elif (interface.bInterfaceClass == audio.AUDIO_CLASS_DEVICE and
+                  interface.bInterfaceSubClass == audio.AUDIO_SUBCLASS_MIDI_STREAMING):
+                kind = "midi"
+            else:
+                continue
+            for endpoint in interface.subdescriptors:
+                if isinstance(endpoint, standard.EndpointDescriptor):
+                    self.routes.setdefault(endpoint.bEndpointAddress,
+                                           (kind, interface.bInterfaceNumber))
+
+
+class Decoder:
+    """Decodes the usbmon traffic of every device in a capture into events.
+
+       Feed it `Urb` s in capture order with `feed`, or a whole capture with
+       `events`. State is kept per bus and device number, so one decoder follows
+       every device in the capture.
+    """
+
+    def __init__(self):
+        self.devices = {}
+        self.throughput = Throughput()
+        self._pending = {}
+
+    def events(self, stream):
+        """Yields the events of the capture read from ``stream``. ``throughput`` is
+           updated when it finishes."""
+        start = time.perf_counter() - self.throughput.seconds
+        try:
+            for urb in iter_urbs(stream, self.throughput):
+                yield from self.feed(urb)
+        finally:
+            self.throughput.seconds = time.perf_counter() - start
+
+    def feed(self, urb):
+        """Returns the events that ``urb`` completes."""
+        key = (urb.bus, urb.device)
+        device = self.devices.get(key)
+        if device is None:
+            device = self.devices[key] = _Device()
+        if urb.transfer_type == TRANSFER_CONTROL:
+            return self._control(urb, device)
+        if urb.transfer_type not in (TRANSFER_INTERRUPT, TRANSFER_BULK) or not urb.data:
+            return ()
+        # IN data arrives with a successful completion and OUT data with the
+        # submission, whose status is always -EINPROGRESS.
+        if urb.endpoint & 0x80:
+            if urb.type != URB_COMPLETE or urb.status != 0:
+                return ()
+        elif urb.type != URB_SUBMIT:
+            return ()
+        route = device.routes.get(urb.endpoint)
+        if route is None:
+            return ()
+        kind, interface = route
+        if kind == "hid":
+            return self._report(urb, device, interface)
+        return self._midi(urb)
+
+    def _control(self, urb, device):
+        pending_key = (urb.bus, urb.id)
+        if urb.type == URB_SUBMIT:
+            if urb.setup is None:
+                return ()
+            bmRequestType, bRequest, wValue, wIndex, _ = _setup.unpack(urb.setup)
+            if bRequest == REQUEST_GET_DESCRIPTOR and bmRequestType & 0x80:
+                self._pending[pending_key] = (wValue, wIndex)
+            elif bRequest == REQUEST_SET_CONFIGURATION and bmRequestType == 0:
+                device.configuration_value = wValue & 0xFF
+                device.route()
+            return ()
+        request = self._pending.pop(pending_key, None)
+        if request is None or urb.status != 0 or not urb.data:
+            return ()
+        wValue, wIndex = request
+        return (self._descriptor(urb, device, wValue >> 8, wValue & 0xFF, wIndex),)
+
+    def _descriptor(self, urb, device, bDescriptorType, index, wIndex):
+        key = (bDescriptorType, index, wIndex)
+        data = bytes(urb.data)
+        # Hosts often read the start of a descriptor before the whole thing.
+        previous = device.responses.get(key)
+        if previous is not None and len(previous) > len(data) and previous.startswith(data):
+            data = previous
+        device.responses[key] = data
+        try:
+            descriptor = self._decode(device, bDescriptorType, wIndex, data)
+        except ValueError:
+            descriptor = None
+        return DescriptorEvent(urb.timestamp, urb.bus, urb.device, bDescriptorType, index,
+                               wIndex, data, descriptor)
+
+    def _decode(self, device, bDescriptorType, wIndex, data):
+        if bDescriptorType == standard.DeviceDescriptor.bDescriptorType:
+            if len(data) < standard.DeviceDescriptor.bLength:
+                return None
+            return parse.parse_device(data[:standard.DeviceDescriptor.bLength])
+        if bDescriptorType in (standard.ConfigurationDescriptor.bDescriptorType,
+                               standard.DESCRIPTOR_TYPE_BOS):
+            if len(data) < 4 or len(data) < _u16.unpack_from(data, 2)[0]:
+                return None
+            data = data[:_u16.unpack_from(data, 2)[0]]
+            if bDescriptorType == standard.DESCRIPTOR_TYPE_BOS:
+                return parse.parse_bos(data)
+            configuration = parse.parse_configuration(data)
+            device.configurations[configuration[0].bConfigurationValue] = configuration
+            device.route()
+            return configuration
+        if bDescriptorType == standard.StringDescriptor.bDescriptorType:
+            return parse.parse_string(data[:data[0]])
+        if bDescriptorType == DESCRIPTOR_TYPE_HID_REPORT:
+            device.reports[wIndex] = hid.ReportDecoder(data)
+            return hid.ReportDescriptor(description=parse.DESCRIPTION, report_descriptor=data)
+        return parse.decode(data[:data[0]])
+
+    def _report(self, urb, device, interface):
+        data = bytes(urb.data)
+        decoder = device.reports.get(interface)
+        report_id = values = None
+        if decoder is not None:
+            try:
+                report_id, values = decoder.decode(data)
+            except ValueError:
+                pass
+        return (ReportEvent(urb.timestamp, urb.bus, urb.device, urb.endpoint, data, report_id,
+                            values),)
+
+    def _midi(self, urb):
+        data = bytes(urb.data)
+        try:
+            packets = list(midi.unpack_event_packets(data))
+        except ValueError:
+            packets = None
+        return (MIDIEvent(urb.timestamp, urb.bus, urb.device, urb.endpoint, data, packets),)
+
+
+def measure(path):
+    """Decodes the capture at ``path`` and returns its `Throughput`."""
+    decoder = Decoder()
+    with open(path, "rb", buffering=1 << 20) as stream:
+        for _ in decoder.events(stream):
+            pass
+    return decoder.throughput
+
+
+class Writer:
+    """Writes `Urb` s to binary ``stream`` as a pcap capture, such as a fixture for
+       `Decoder`."""
+
+    def __init__(self, stream, *, linktype=LINKTYPE_USB_LINUX_MMAPPED, snaplen=0x40000):
+        self.stream = stream
+        self.linktype = linktype
+        self._usbmon = _usbmon_struct(linktype, "<")
+        self._record = struct.Struct("<IIII")
+        stream.write(struct.pack("<IHHiIII", _PCAP_MAGIC, 2, 4, 0, 0, snaplen, linktype))
+
+    def write(self, urb):
+        data = bytes(urb.data)
+        seconds = int(urb.timestamp)
+        microseconds = int(round((urb.timestamp - seconds) * 1e6))
+        fields = [urb.id, urb.type, urb.transfer_type, urb.endpoint, urb.device, urb.bus,
+                  0 if urb.setup is not None else ord("-"),
+                  0 if data else (ord("<") if urb.endpoint & 0x80 else ord(">")),
+                  seconds, microseconds, urb.status, urb.length, len(data),
+                  bytes(urb.setup) if urb.setup is not None else bytes(8)]
+        if self.linktype == LINKTYPE_USB_LINUX_MMAPPED:
+            fields += [0, 0, 0, 0]
+        header = self._usbmon.pack(*fields)
+        size = len(header) + len(data)
+        self.stream.write(self._record.pack(seconds, microseconds, size, size))
+        self.stream.write(header)
+        self.stream.write(data)
@@ -22,7 +22,9 @@
 
 import struct
 
+from . import frozen
 from . import standard
+from . import util
 
 """
 CDC specific descriptors
@@ -45,15 +47,20 @@ CDC_SUBCLASS_MCCM = 0x04
 CDC_SUBCLASS_CCM = 0x05
 CDC_SUBCLASS_ETH = 0x06
 CDC_SUBCLASS_ATM = 0x07
+CDC_SUBCLASS_NCM = 0x0D  # Network Control Model
 
 CDC_PROTOCOL_NONE = 0x0
 CDC_PROTOCOL_V25TER = 0x01   # Common AT commands
 # Many other protocols omitted.
 
+CDC_DATA_PROTOCOL_NONE = 0x00
+CDC_DATA_PROTOCOL_NTB = 0x01  # Network Transfer Blocks, used by NCM
+
 class Header:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
     bDescriptorSubtype = 0x00
     fmt = "<BBB" + "H"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bcdCDC")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -63,7 +70,7 @@ class Header:
         self.bcdCDC = bcdCDC
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -77,7 +84,11 @@ class CallManagement:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
     bDescriptorSubtype = 0x01
     fmt = "<BBB" + "BB"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bmCapabilities",
+              "bDataInterface")
     bLength = struct.calcsize(fmt)
+    # Offset by `util.join_interfaces`.
+    interface_fields = ("bDataInterface",)
 
     def __init__(self, *,
                  description,
@@ -88,7 +99,7 @@ class CallManagement:
         self.bDataInterface = bDataInterface
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -103,6 +114,7 @@ class AbstractControlManagement:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
     bDescriptorSubtype = 0x02
     fmt = "<BBB" + "B"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bmCapabilities")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -112,7 +124,7 @@ class AbstractControlManagement:
         self.bmCapabilities = bmCapabilities
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -127,6 +139,7 @@ class DirectLineManagement:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
     bDescriptorSubtype = 0x03
     fmt = "<BBB" + "B"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bmCapabilities")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -136,7 +149,7 @@ class DirectLineManagement:
         self.bmCapabilities = bmCapabilities
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -151,6 +164,8 @@ class Union:
     bDescriptorSubtype = 0x06
     fixed_fmt = "<BBB" + "B"     # not including bSlaveInterface_list
     fixed_bLength = struct.calcsize(fixed_fmt)
+    # Offset by `util.join_interfaces`.
+    interface_fields = ("bMasterInterface", "bSlaveInterface_list")
 
     @property
     def bLength(self):
@@ -166,7 +181,7 @@ class Union:
         self.bSlaveInterface_list = bSlaveInterface_list
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fixed_fmt,
@@ -174,3 +189,413 @@ class Union:
                            self.bDescriptorType,
                            self.bDescriptorSubtype,
                            self.bMasterInterface) + bytes(self.bSlaveInterface_list)
+
+
+
+class EthernetNetworking:
+    bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
+    bDescriptorSubtype = 0x0F
+    fmt = "<BBB" + "BIHHB"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "iMACAddress",
+              "bmEthernetStatistics", "wMaxSegmentSize", "wNumberMCFilters",
+              "bNumberPowerFilters")
+    bLength = struct.calcsize(fmt)
+
+    def __init__(self, *,
+                 description,
+                 iMACAddress,
+                 bmEthernetStatistics=0,
+                 # Ethernet frame size without the CRC.
+                 wMaxSegmentSize=1514,
+                 wNumberMCFilters=0,
+                 bNumberPowerFilters=0):
+        self.description = description
+        self.iMACAddress = iMACAddress
+        self.bmEthernetStatistics = bmEthernetStatistics
+        self.wMaxSegmentSize = wMaxSegmentSize
+        self.wNumberMCFilters = wNumberMCFilters
+        self.bNumberPowerFilters = bNumberPowerFilters
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.bDescriptorSubtype,
+                           self.iMACAddress,
+                           self.bmEthernetStatistics,
+                           self.wMaxSegmentSize,
+                           self.wNumberMCFilters,
+                           self.bNumberPowerFilters)
+
+
+class NetworkControlModel:
+    bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
+    bDescriptorSubtype = 0x1A
+    fmt = "<BBB" + "HB"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bcdNcmVersion",
+              "bmNetworkCapabilities")
+    bLength = struct.calcsize(fmt)
+
+    def __init__(self, *,
+                 description,
+                 bcdNcmVersion=0x0100,
+                 bmNetworkCapabilities=0):
+        self.description = description
+        self.bcdNcmVersion = bcdNcmVersion
+        self.bmNetworkCapabilities = bmNetworkCapabilities
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.bDescriptorSubtype,
+                           self.bcdNcmVersion,
+                           self.bmNetworkCapabilities)
+
+
+class NTBParameters:
+    """Response to the NCM GET_NTB_PARAMETERS request. It isn't part of the
+       configuration descriptor."""
+    fmt = "<HH" + "IHHHH" + "IHHHH"
+    wLength = struct.calcsize(fmt)
+
+    NTB16 = 0x01
+    NTB32 = 0x02
+
+    def __init__(self, *,
+                 description="NTB parameters",
+                 bmNtbFormatsSupported=NTB16,
+                 dwNtbInMaxSize=2048,
+                 wNdpInDivisor=4,
+                 wNdpInPayloadRemainder=0,
+                 wNdpInAlignment=4,
+                 dwNtbOutMaxSize=2048,
+                 wNdpOutDivisor=4,
+                 wNdpOutPayloadRemainder=0,
+                 wNdpOutAlignment=4,
+                 wNtbOutMaxDatagrams=0):
+        self.description = description
+        self.bmNtbFormatsSupported = bmNtbFormatsSupported
+        self.dwNtbInMaxSize = dwNtbInMaxSize
+        self.wNdpInDivisor = wNdpInDivisor
+        self.wNdpInPayloadRemainder = wNdpInPayloadRemainder
+        self.wNdpInAlignment = wNdpInAlignment
+        self.dwNtbOutMaxSize = dwNtbOutMaxSize
+        self.wNdpOutDivisor = wNdpOutDivisor
+        self.wNdpOutPayloadRemainder = wNdpOutPayloadRemainder
+        self.wNdpOutAlignment = wNdpOutAlignment
+        self.wNtbOutMaxDatagrams = wNtbOutMaxDatagrams
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.wLength,
+                           self.bmNtbFormatsSupported,
+                           self.dwNtbInMaxSize,
+                           self.wNdpInDivisor,
+                           self.wNdpInPayloadRemainder,
+                           self.wNdpInAlignment,
+                           0,
+                           self.dwNtbOutMaxSize,
+                           self.wNdpOutDivisor,
+                           self.wNdpOutPayloadRemainder,
+                           self.wNdpOutAlignment,
+                           self.wNtbOutMaxDatagrams)
+
+
+def network_interfaces(*,
+                       description="NCM",
+                       iMACAddress,
+                       subclass=CDC_SUBCLASS_NCM,
+                       speed=standard.SPEED_FULL,
+                       wMaxSegmentSize=1514,
+                       bInterval=0x10,
+                       iInterface=0,
+                       iFunction=0):
+    """Returns ``[iad, comm, data, data_alternate]`` for `util.join_interfaces`.
+
+       ``subclass`` is `CDC_SUBCLASS_NCM` or `CDC_SUBCLASS_ETH` for ECM. The data
+       interface has no endpoints in its default setting as both models require.
+       The host selects the alternate setting with the bulk endpoints, which are
+       sized for bus ``speed``. ``bInterval`` sets the notification endpoint's
+       polling interval.
+    """
+    wMaxPacketSize = standard.EndpointDescriptor.max_packet_size(
+        standard.EndpointDescriptor.TYPE_BULK, speed)
+    functional = [
+        Header(description="{} header".format(description), bcdCDC=0x0120),
+        Union(description="{} union".format(description),
+              bMasterInterface=0x00,
+              bSlaveInterface_list=[0x01]),
+        EthernetNetworking(description="{} ethernet".format(description),
+                           iMACAddress=iMACAddress,
+                           wMaxSegmentSize=wMaxSegmentSize),
+    ]
+    data_protocol = CDC_DATA_PROTOCOL_NONE
+    if subclass == CDC_SUBCLASS_NCM:
+        functional.append(NetworkControlModel(description="{} NCM".format(description)))
+        data_protocol = CDC_DATA_PROTOCOL_NTB
+
+    comm = standard.InterfaceDescriptor(
+        description="{} comm".format(description),
+        bInterfaceClass=CDC_CLASS_COMM,
+        bInterfaceSubClass=subclass,
+        bInterfaceProtocol=CDC_PROTOCOL_NONE,
+        iInterface=iInterface,
+        subdescriptors=functional + [
+            standard.EndpointDescriptor(
+                description="{} notification in".format(description),
+                bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_IN,
+                bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+                wMaxPacketSize=16,
+                bInterval=bInterval)
+        ])
+    data = standard.InterfaceDescriptor(
+        description="{} data".format(description),
+        bInterfaceNumber=0x1,
+        bInterfaceClass=CDC_CLASS_DATA,
+        bInterfaceProtocol=data_protocol,
+        subdescriptors=[])
+    data_alternate = standard.InterfaceDescriptor(
+        description="{} data active".format(description),
+        bInterfaceNumber=0x1,
+        bAlternateSetting=1,
+        bInterfaceClass=CDC_CLASS_DATA,
+        bInterfaceProtocol=data_protocol,
+        subdescriptors=[
+            standard.EndpointDescriptor(
+                description="{} data in".format(description),
+                bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_IN,
+                bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+                wMaxPacketSize=wMaxPacketSize,
+                bInterval=0),
+            standard.EndpointDescriptor(
+                description="{} data out".format(description),
+                bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_OUT,
+                bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+                wMaxPacketSize=wMaxPacketSize,
+                bInterval=0),
+        ])
+    iad = standard.InterfaceAssociationDescriptor(
+        description="{} IAD".format(description),
+        bFirstInterface=0x00,
+        bInterfaceCount=0x02,
+        bFunctionClass=CDC_CLASS_COMM,
+        bFunctionSubClass=subclass,
+        bFunctionProtocol=CDC_PROTOCOL_NONE,
+        iFunction=iFunction)
+    return [iad, comm, data, data_alternate]
+
+
+# Functional descriptors that are identical for every ACM function. They never
+# reference interface numbers so `acm_functions` shares one instance of each. They
+# are frozen so a change to one can't leak into other functions and calls.
+_shared_descriptors = {}
+
+def _shared(cls, **kwargs):
+    key = (cls,) + tuple(sorted(kwargs.items()))
+    descriptor = _shared_descriptors.get(key)
+    if descriptor is None:
+        descriptor = frozen.freeze(cls(**kwargs))
+        _shared_descriptors[key] = descriptor
+    return descriptor
+
+
+def acm_functions(count=1, *,
+                  description="CDC",
+                  speed=standard.SPEED_FULL,
+                  bInterval=0x10,
+                  bmCapabilities=0x02,
+                  iInterface=0,
+                  iFunction=0):
+    """Returns ``count`` ACM serial functions, each a list of ``[iad, comm, data]`` for
+       `util.join_interfaces`.
+
+       The bulk endpoints are sized for bus ``speed`` and ``bInterval`` sets the
+       polling interval of the notification endpoint. ``bmCapabilities`` goes in
+       the Abstract Control Management descriptor. The Header and Abstract Control
+       Management descriptors are frozen and shared by all functions. Use
+       `frozen.replace` to change one.
+    """
+    header = _shared(Header, description="CDC Header", bcdCDC=0x0110)
+    acm = _shared(AbstractControlManagement,
+                  description="CDC Abstract Control Management",
+                  bmCapabilities=bmCapabilities)
+    wMaxPacketSize = standard.EndpointDescriptor.max_packet_size(
+        standard.EndpointDescriptor.TYPE_BULK, speed)
+
+    functions = []
+    for i in range(count):
+        name = description if count == 1 else "{} {}".format(description, i)
+        comm = standard.InterfaceDescriptor(
+            description="{} comm".format(name),
+            bInterfaceClass=CDC_CLASS_COMM,
+            bInterfaceSubClass=CDC_SUBCLASS_ACM,
+            bInterfaceProtocol=CDC_PROTOCOL_NONE,
+            iInterface=iInterface,
+            subdescriptors=[
+                header,
+                CallManagement(description="{} call management".format(name),
+                               bmCapabilities=0x01,
+                               bDataInterface=0x01),
+                acm,
+                Union(description="{} union".format(name),
+                      bMasterInterface=0x00,
+                      bSlaveInterface_list=[0x01]),
+                standard.EndpointDescriptor(
+                    description="{} notification in".format(name),
+                    bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_IN,
+                    bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+                    wMaxPacketSize=0x10,
+                    bInterval=bInterval),
+            ])
+        data = standard.InterfaceDescriptor(
+            description="{} data".format(name),
+            bInterfaceNumber=0x1,
+            bInterfaceClass=CDC_CLASS_DATA,
+            iInterface=iInterface,
+            subdescriptors=[
+                standard.EndpointDescriptor(
+                    description="{} data in".format(name),
+                    bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_IN,
+                    bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+                    wMaxPacketSize=wMaxPacketSize,
+                    bInterval=0),
+                standard.EndpointDescriptor(
+                    description="{} data out".format(name),
+                    bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_OUT,
+                    bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+                    wMaxPacketSize=wMaxPacketSize,
+                    bInterval=0),
+            ])
+        iad = standard.InterfaceAssociationDescriptor(
+            description="{} IAD".format(name),
+            bFirstInterface=0x00,
+            bInterfaceCount=0x02,
+            bFunctionClass=CDC_CLASS_COMM,
+            bFunctionSubClass=CDC_SUBCLASS_ACM,
+            bFunctionProtocol=CDC_PROTOCOL_NONE,
+            iFunction=iFunction)
+        functions.append([iad, comm, data])
+    return functions
+
+
+NTH16_SIGNATURE = 0x484D434E  # "NCMH"
+NDP16_SIGNATURE = 0x304D434E  # "NCM0", datagrams without CRC
+
+_nth16 = struct.Struct("<IHHHH")
+_ndp16 = struct.Struct("<IHH")
+_datagram_pointer16 = struct.Struct("<HH")
+
+
+def _align(offset, divisor, remainder=0):
+    return offset + (remainder - offset) % divisor
+
+
+def pack_ntb16(buffer, frames, *,
+               wSequence=0,
+               parameters=None,
+               divisor=4,
+               payload_remainder=0,
+               ndp_alignment=4):
+    """Batches as many leading Ethernet ``frames`` (a sequence of bytes-like objects)
+       as fit into one NTB16 in ``buffer``.
+
+       Each datagram starts at an offset that is ``payload_remainder`` modulo
+       ``divisor`` and the NDP16 that points at them is placed after the last one on
+       an ``ndp_alignment`` boundary. When ``parameters``, the device's
+       `NTBParameters`, is given, its IN divisor, remainder, alignment and
+       ``dwNtbInMaxSize`` are used instead. Frames are copied straight into
+       ``buffer`` and padding comes from one zeroed buffer per call, so nothing is
+       copied or allocated per frame. Returns ``(wBlockLength, count)``, where
+       ``count`` is the number of leading ``frames`` packed. The rest go in the next
+       transfer. With no ``frames`` the NTB holds an empty NDP16.
+    """
+    buffer = memoryview(buffer)
+    capacity = min(len(buffer), 0xFFFF)
+    if parameters is not None:
+        divisor = parameters.wNdpInDivisor
+        payload_remainder = parameters.wNdpInPayloadRemainder
+        ndp_alignment = parameters.wNdpInAlignment
+        capacity = min(capacity, parameters.dwNtbInMaxSize)
+    # Find how many frames fit before copying anything.
+    offset = _nth16.size
+    count = 0
+    for frame in frames:
+        end = _align(offset, divisor, payload_remainder) + len(frame)
+        # Room for an NDP16 with this datagram's entry and the terminator.
+        ndp_end = (_align(end, ndp_alignment) + _ndp16.size +
+                   (count + 2) * _datagram_pointer16.size)
+        if ndp_end > capacity:
+            break
+        offset = end
+        count += 1
+    if count == 0 and frames:
+        raise ValueError("Frame of {} bytes doesn't fit in a {} byte NTB".format(len(frames[0]), capacity))
+
+    ndp_index = _align(offset, ndp_alignment)
+    # The entries end with a null one, and an NDP16 is at least 16 bytes, so an
+    # empty NTB gets two.
+    entries = max(count + 1, 2)
+    ndp_length = _ndp16.size + entries * _datagram_pointer16.size
+    _ndp16.pack_into(buffer, ndp_index, NDP16_SIGNATURE, ndp_length, 0)
+    pointer = ndp_index + _ndp16.size
+    # Padding is always shorter than the divisor or the NDP alignment.
+    zeros = memoryview(bytes(max(divisor, ndp_alignment)))
+    offset = _nth16.size
+    for i in range(count):
+        frame = frames[i]
+        start = _align(offset, divisor, payload_remainder)
+        if start > offset:
+            buffer[offset:start] = zeros[:start - offset]
+        offset = start + len(frame)
+        buffer[start:offset] = frame
+        _datagram_pointer16.pack_into(buffer, pointer, start, len(frame))
+        pointer += _datagram_pointer16.size
+    if ndp_index > offset:
+        buffer[offset:ndp_index] = zeros[:ndp_index - offset]
+    for _ in range(entries - count):
+        _datagram_pointer16.pack_into(buffer, pointer, 0, 0)
+        pointer += _datagram_pointer16.size
+    block_length = pointer
+    _nth16.pack_into(buffer, 0, NTH16_SIGNATURE, _nth16.size, wSequence, block_length, ndp_index)
+    return block_length, count
+
+
+def unpack_ntb16(buffer):
+    """Yields a `memoryview` of every datagram in the NTB16 held in ``buffer``.
+
+       Raises ValueError when the headers are malformed or point outside the block.
+    """
+    buffer = memoryview(buffer)
+    if len(buffer) < _nth16.size:
+        raise ValueError("NTB16 too short")
+    signature, header_length, _, block_length, ndp_index = _nth16.unpack_from(buffer)
+    if signature != NTH16_SIGNATURE or header_length != _nth16.size:
+        raise ValueError("Bad NTH16")
+    if block_length > len(buffer):
+        raise ValueError("NTB16 block length {} exceeds buffer".format(block_length))
+    seen = set()
+    while ndp_index:
+        if ndp_index in seen or ndp_index % 4 or ndp_index + _ndp16.size > block_length:
+            raise ValueError("Bad NDP16 index {}".format(ndp_index))
+        seen.add(ndp_index)
+        signature, ndp_length, next_index = _ndp16.unpack_from(buffer, ndp_index)
+        if signature & 0x00FFFFFF != NDP16_SIGNATURE & 0x00FFFFFF or ndp_length < 16 or ndp_index + ndp_length > block_length:
+            raise ValueError("Bad NDP16 at {}".format(ndp_index))
+        for pointer in range(ndp_index + _ndp16.size, ndp_index + ndp_length - 3, 4):
+            index, length = _datagram_pointer16.unpack_from(buffer, pointer)
+            if index == 0 or length == 0:
+                break
+            if index + length > block_length:
+                raise ValueError("Datagram at {} exceeds NTB16".format(index))
+            yield buffer[index:index + length]
+        ndp_index = next_index
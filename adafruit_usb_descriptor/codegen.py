@@ -0,0 +1,184 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import struct
+
+from . import standard
+from . import util
+
+"""
+Specialized serializers
+=======================
+
+Compiles a descriptor tree into a generated function that packs the whole tree
+with one `struct.Struct`. The tree's shape (its classes, their order and the
+number of endpoints and capabilities) is fixed at compile time, while every field
+is read again on each call, so changing a value only means calling it again.
+
+Descriptors with ``fields`` naming each slot of their ``fmt`` are packed inline,
+unless one of their ``derived_fields`` is among them and isn't computed here. Any
+other descriptor is serialized with ``bytes()`` on each call and must keep the
+length it had when the tree was compiled.
+"""
+
+# Generated functions by shape, shared by every tree with the same shape.
+_compiled = {}
+
+
+def _segments(tree):
+    """Returns ``(node, fmt, expressions)`` for ``tree`` in serialization order.
+       ``expressions`` are the node's fields as ints for constants and names for
+       attributes to read on each call. ``fmt`` is None for opaque nodes, whose
+       ``expressions`` is their length."""
+    segments = []
+    # Depth of the opaque descriptor whose bytes() include the ones nested in it.
+    opaque_depth = None
+    for depth, _, node in util.walk(tree):
+        if opaque_depth is not None:
+            if depth > opaque_depth:
+                continue
+            opaque_depth = None
+        overrides = {}
+        if isinstance(node, standard.InterfaceDescriptor):
+            node.bNumEndpoints = sum(
+                1 for d in node.subdescriptors
+                if d.bDescriptorType == standard.EndpointDescriptor.bDescriptorType)
+            overrides["bNumEndpoints"] = node.bNumEndpoints
+        elif isinstance(node, standard.BOSDescriptor):
+            bytes(node)
+            overrides["wTotalLength"] = node.wTotalLength
+            overrides["bNumDeviceCaps"] = node.bNumDeviceCaps
+        fields = getattr(type(node), "fields", None)
+        derived = getattr(type(node), "derived_fields", ())
+        if fields is None or any(name in fields and name not in overrides for name in derived):
+            # Fields computed by __bytes__, such as the lengths of the MS OS 2.0
+            # headers, are only right when it runs.
+            segments.append((node, None, len(bytes(node))))
+            opaque_depth = depth
+            continue
+        instance = vars(node)
+        expressions = []
+        for name in fields:
+            if name in overrides:
+                expressions.append(overrides[name])
+            elif name in instance:
+                expressions.append(name)
+            else:
+                # Class attributes such as bLength are constants of the shape.
+                expressions.append(getattr(node, name))
+        segments.append((node, node.fmt, tuple(expressions)))
+    return segments
+
+
+def _shape(segments):
+    return tuple((type(node), fmt, expressions) for node, fmt, expressions in segments)
+
+
+def _generate(shape):
+    """Returns the source of ``values(nodes)`` for ``shape``."""
+    names = ["n{}".format(i) for i in range(len(shape))]
+    lines = ["def values(nodes):"]
+    if names:
+        lines.append("    {}, = nodes".format(", ".join(names)))
+    arguments = []
+    for name, (_, fmt, expressions) in zip(names, shape):
+        if fmt is None:
+            lines.append("    {0}b = _bytes({0})".format(name))
+            lines.append("    if len({0}b) != {1}:".format(name, expressions))
+            lines.append("        raise ValueError(_length_error.format({0}, {1}, len({0}b)))"
+                         .format(name, expressions))
+            arguments.append("{}b".format(name))
+            continue
+        for expression in expressions:
+            if isinstance(expression, str):
+                arguments.append("{}.{}".format(name, expression))
+            else:
+                arguments.append(repr(expression))
+    lines.append("    return ({}{})".format(", ".join(arguments), "," if len(arguments) == 1 else ""))
+    return "\n".join(lines) + "\n"
+
+
+def _format(shape):
+    parts = ["<"]
+    for _, fmt, expressions in shape:
+        if fmt is None:
+            parts.append("{}s".format(expressions))
+        else:
+            # All of the descriptor formats are little endian.
+            parts.append(fmt.lstrip("<"))
+    return "".join(parts)
+
+
+def _compile(shape):
+    try:
+        return _compiled[shape]
+    except KeyError:
+        pass
+    source = _generate(shape)
+    namespace = {
+        "_bytes": bytes,
+        "_length_error": "{!r} was compiled with {} bytes but serializes to {}",
+    }
+    exec(compile(source, "<serializer>", "exec"), namespace)
+    compiled = _compiled[shape] = (struct.Struct(_format(shape)), namespace["values"], source)
+    return compiled
+
+
+class Serializer:
+    """Packs ``tree``, a descriptor or nested lists of them, in one call.
+
+       Call it to get the same bytes as serializing each descriptor in order. After
+       adding or removing descriptors, endpoints or capabilities, compile a new
+       one. Changing field values needs nothing.
+    """
+
+    def __init__(self, tree):
+        segments = _segments(tree)
+        shape = _shape(segments)
+        self.tree = tree
+        self.nodes = tuple(node for node, _, _ in segments)
+        self.struct, self._values, self.source = _compile(shape)
+        self.size = self.struct.size
+
+    def values(self):
+        """Returns the flat argument list for `pack`, read from the tree now."""
+        return self._values(self.nodes)
+
+    def pack(self, values):
+        """Packs a flat argument list like the one from `values`."""
+        return self.struct.pack(*values)
+
+    def pack_into(self, buffer, offset=0):
+        """Packs the tree into ``buffer`` at ``offset``."""
+        self.struct.pack_into(buffer, offset, *self._values(self.nodes))
+
+    def __call__(self):
+        return self.struct.pack(*self._values(self.nodes))
+
+    def __len__(self):
+        return self.size
+
+
+def compile_serializer(tree):
+    """Returns a `Serializer` for ``tree``. Trees with the same shape share one
+       generated function and `struct.Struct`."""
+    return Serializer(tree)
@@ -0,0 +1,209 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import array
+
+from . import standard
+
+"""
+Columnar decoding
+=================
+
+Decodes a corpus of concatenated descriptor blobs into NumPy structured arrays,
+one per descriptor class, with a column per field. The dtypes come from each
+class's ``fmt`` and ``fields``.
+
+The corpus is scanned once to index where each descriptor starts. Each class's
+descriptors are then gathered into one array with a single vectorized index,
+rather than unpacked one at a time.
+
+NumPy is optional for the rest of the library but required here.
+"""
+
+# Classes indexed by `Corpus`, by bDescriptorType.
+CLASSES = {
+    cls.bDescriptorType: cls
+    for cls in (standard.DeviceDescriptor,
+                standard.ConfigurationDescriptor,
+                standard.InterfaceAssociationDescriptor,
+                standard.InterfaceDescriptor,
+                standard.EndpointDescriptor)
+}
+
+_struct_types = {"B": "u1", "H": "u2", "I": "u4", "Q": "u8",
+                 "b": "i1", "h": "i2", "i": "i4", "q": "i8"}
+
+# Columns of `Corpus.endpoints`.
+ENDPOINT_COLUMNS = (("record", "i8"), ("idVendor", "u2"), ("idProduct", "u2"),
+                    ("bConfigurationValue", "u1"), ("bInterfaceNumber", "u1"),
+                    ("bAlternateSetting", "u1"), ("bInterfaceClass", "u1"),
+                    ("bEndpointAddress", "u1"), ("transfer_type", "u1"),
+                    ("wMaxPacketSize", "u2"), ("bInterval", "u1"))
+
+
+def _numpy():
+    # Imported on first use, so importing this module stays cheap.
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("columnar decoding needs NumPy") from None
+    return numpy
+
+
+def dtype(cls):
+    """Returns the packed little endian NumPy structured dtype of descriptor class
+       ``cls``, with one field per entry in its ``fields``."""
+    np = _numpy()
+    codes = cls.fmt.lstrip("<")
+    if len(codes) != len(cls.fields):
+        raise ValueError("{} fmt doesn't match its fields".format(cls.__name__))
+    return np.dtype([(name, "<" + _struct_types[code]) for name, code in zip(cls.fields, codes)])
+
+
+class Corpus:
+    """Index of the descriptors in ``data``, concatenated descriptor blobs such as
+       configurations from many devices, each optionally after its device descriptor.
+
+       ``data`` is bytes-like or an iterable of bytes-like blobs. A record, the
+       descriptors of one device, starts at each device descriptor and at each
+       configuration descriptor that doesn't follow its device's. Descriptors shorter
+       than their class are counted in ``short`` and not indexed. Raises ValueError
+       when a bLength is less than 2 or runs past the end.
+    """
+
+    def __init__(self, data):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = b"".join(data)
+        self.data = bytes(data)
+        self.short = 0
+        self._offsets = {kind: array.array("q") for kind in CLASSES}
+        self._records = {kind: array.array("q") for kind in CLASSES}
+        # Row of the interface each endpoint follows, or -1.
+        self._endpoint_interfaces = array.array("q")
+        self._scan()
+
+    def _scan(self):
+        data = self.data
+        end = len(data)
+        minimum = {kind: cls.bLength for kind, cls in CLASSES.items()}
+        offsets = self._offsets
+        records = self._records
+        endpoint_interfaces = self._endpoint_interfaces
+        device = standard.DeviceDescriptor.bDescriptorType
+        configuration = standard.ConfigurationDescriptor.bDescriptorType
+        interface = standard.InterfaceDescriptor.bDescriptorType
+        endpoint = standard.EndpointDescriptor.bDescriptorType
+
+        record = -1
+        # Whether the current record started with a device descriptor and hasn't
+        # seen a configuration yet.
+        awaiting_configuration = False
+        interface_row = -1
+        offset = 0
+        while offset < end:
+            length = data[offset]
+            if length < 2 or offset + length > end:
+                raise ValueError("Malformed descriptor at offset {}".format(offset))
+            kind = data[offset + 1]
+            if kind == device:
+                record += 1
+                awaiting_configuration = True
+                interface_row = -1
+            elif kind == configuration:
+                if not awaiting_configuration:
+                    record += 1
+                awaiting_configuration = False
+                interface_row = -1
+            if kind in minimum:
+                if length < minimum[kind]:
+                    self.short += 1
+                else:
+                    if kind == interface:
+                        interface_row = len(offsets[kind])
+                    elif kind == endpoint:
+                        endpoint_interfaces.append(interface_row)
+                    offsets[kind].append(offset)
+                    records[kind].append(max(record, 0))
+            offset += length
+        self.record_count = record + 1
+
+    def __len__(self):
+        return sum(len(offsets) for offsets in self._offsets.values())
+
+    def offsets(self, cls):
+        """Returns the offsets of the ``cls`` descriptors as an int64 array."""
+        np = _numpy()
+        return np.frombuffer(self._offsets[cls.bDescriptorType], dtype=np.int64)
+
+    def records(self, cls):
+        """Returns the record number of each ``cls`` descriptor."""
+        np = _numpy()
+        return np.frombuffer(self._records[cls.bDescriptorType], dtype=np.int64)
+
+    def table(self, cls):
+        """Returns every ``cls`` descriptor as one row of a structured array of
+           `dtype` ``(cls)``."""
+        np = _numpy()
+        row_type = dtype(cls)
+        offsets = self.offsets(cls)
+        if len(offsets) == 0:
+            return np.zeros(0, dtype=row_type)
+        raw = np.frombuffer(self.data, dtype=np.uint8)
+        rows = raw[offsets[:, None] + np.arange(row_type.itemsize)]
+        return rows.view(row_type).reshape(-1)
+
+    def endpoints(self):
+        """Returns a structured array with a row for every endpoint, joined with its
+           device, configuration and interface. See `ENDPOINT_COLUMNS`. Fields of
+           descriptors a record doesn't have are 0."""
+        np = _numpy()
+        endpoints = self.table(standard.EndpointDescriptor)
+        result = np.zeros(len(endpoints), dtype=list(ENDPOINT_COLUMNS))
+        if len(endpoints) == 0:
+            return result
+        endpoint_records = self.records(standard.EndpointDescriptor)
+        result["record"] = endpoint_records
+        result["bEndpointAddress"] = endpoints["bEndpointAddress"]
+        result["transfer_type"] = endpoints["bmAttributes"] & 0x03
+        result["wMaxPacketSize"] = endpoints["wMaxPacketSize"]
+        result["bInterval"] = endpoints["bInterval"]
+
+        for cls, names in ((standard.DeviceDescriptor, ("idVendor", "idProduct")),
+                           (standard.ConfigurationDescriptor, ("bConfigurationValue",))):
+            rows = self.table(cls)
+            if len(rows) == 0:
+                continue
+            # Row of each record's first descriptor, or -1.
+            by_record = np.full(self.record_count, -1, dtype=np.int64)
+            records, first = np.unique(self.records(cls), return_index=True)
+            by_record[records] = first
+            row = by_record[endpoint_records]
+            present = row >= 0
+            for name in names:
+                result[name][present] = rows[name][row[present]]
+
+        interfaces = self.table(standard.InterfaceDescriptor)
+        row = np.frombuffer(self._endpoint_interfaces, dtype=np.int64)
+        present = row >= 0
+        for name in ("bInterfaceNumber", "bAlternateSetting", "bInterfaceClass"):
+            result[name][present] = interfaces[name][row[present]]
+        return result
@@ -0,0 +1,158 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import struct
+
+from . import frozen
+from . import standard
+
+"""
+Frozen descriptor sets
+======================
+
+Precomputed GET_DESCRIPTOR responses for emulating a device on the host side.
+"""
+
+DESCRIPTOR_TYPE_HID_REPORT = 0x22
+
+class DescriptorSet:
+    """Every descriptor a device returns to GET_DESCRIPTOR, frozen into one image.
+
+       ``configurations`` is a list of descriptor sequences, each starting with its
+       `standard.ConfigurationDescriptor` and followed by the descriptors that come
+       after it, such as the result of `util.join_interfaces`. Their ``wTotalLength``
+       and ``bNumInterfaces`` are filled in. ``strings`` is a `standard.StringTable`
+       or a list of `standard.StringDescriptor` s starting with the LANGID list.
+       ``hid_reports`` maps interface numbers to HID report descriptors.
+
+       Responses are looked up by ``(bDescriptorType, index, wIndex)``, where
+       ``wIndex`` is the LANGID for strings, the interface for HID reports and 0
+       otherwise.
+    """
+
+    def __init__(self, *,
+                 device,
+                 configurations,
+                 strings=None,
+                 bos=None,
+                 hid_reports=None):
+        self.device = device
+        self.configurations = list(configurations)
+        self.strings = strings
+        self.bos = bos
+        self.hid_reports = hid_reports if hid_reports is not None else {}
+        self.freeze()
+
+    def freeze(self):
+        """Serializes everything again. Call it after changing a descriptor."""
+        responses = [((self.device.bDescriptorType, 0, 0), bytes(self.device))]
+
+        for index, configuration in enumerate(self.configurations):
+            header = configuration[0]
+            body = b''.join(map(bytes, configuration[1:]))
+            header = frozen.update(header,
+                                   wTotalLength=header.bLength + len(body),
+                                   bNumInterfaces=sum(
+                                       1 for d in configuration[1:]
+                                       if d.bDescriptorType == standard.InterfaceDescriptor.bDescriptorType
+                                       and d.bAlternateSetting == 0))
+            if header is not configuration[0]:
+                # A frozen header was replaced by a filled in copy.
+                self.configurations[index] = [header] + list(configuration[1:])
+            responses.append(((header.bDescriptorType, index, 0), bytes(header) + body))
+
+        self.default_langid = standard.LANGID_ENGLISH_US
+        if isinstance(self.strings, standard.StringTable):
+            self.default_langid = self.strings.langids[0]
+            responses.append(((standard.StringDescriptor.bDescriptorType, 0, 0),
+                              self.strings.descriptor(0)))
+            for index in range(1, len(self.strings)):
+                for langid in self.strings.langids:
+                    responses.append(((standard.StringDescriptor.bDescriptorType, index, langid),
+                                      self.strings.descriptor(index, langid)))
+        elif self.strings:
+            langids = bytes(self.strings[0])[2:4]
+            if len(langids) == 2:
+                self.default_langid = struct.unpack("<H", langids)[0]
+            for index, string in enumerate(self.strings):
+                langid = self.default_langid if index else 0
+                responses.append(((standard.StringDescriptor.bDescriptorType, index, langid),
+                                  bytes(string)))
+
+        if self.bos is not None:
+            responses.append(((self.bos.bDescriptorType, 0, 0), bytes(self.bos)))
+
+        for interface, report in self.hid_reports.items():
+            responses.append(((DESCRIPTOR_TYPE_HID_REPORT, 0, interface), bytes(report)))
+
+        self.image = memoryview(b''.join(bytes(r) for _, r in responses))
+        self._responses = {}
+        offset = 0
+        for key, response in responses:
+            self._responses[key] = self.image[offset:offset + len(response)]
+            offset += len(response)
+
+    def __len__(self):
+        return len(self._responses)
+
+    def __contains__(self, key):
+        return key in self._responses
+
+    def keys(self):
+        return self._responses.keys()
+
+    def items(self):
+        return self._responses.items()
+
+    def get_descriptor(self, bDescriptorType, index=0, wIndex=0, wLength=0xFFFF):
+        """Returns a `memoryview` of the response truncated to ``wLength`` or None when
+           the device would stall the request."""
+        response = self._responses.get((bDescriptorType, index, wIndex))
+        if response is None:
+            if bDescriptorType != standard.StringDescriptor.bDescriptorType:
+                return None
+            # Fall back to the default language, and LANGID list ignores wIndex.
+            langid = self.default_langid if index else 0
+            response = self._responses.get((bDescriptorType, index, langid))
+            if response is None:
+                return None
+        return response[:wLength]
+
+    def get_descriptor_request(self, wValue, wIndex, wLength):
+        """Answers a GET_DESCRIPTOR request with its raw setup fields."""
+        return self.get_descriptor(wValue >> 8, wValue & 0xFF, wIndex, wLength)
+
+    def control_packets(self, bDescriptorType, index=0, wIndex=0, wLength=0xFFFF,
+                        bMaxPacketSize=None):
+        """Returns how many data stage packets the response takes, including the
+           zero length packet that ends a short response that fills its last packet.
+           Returns 0 when the request stalls."""
+        if bMaxPacketSize is None:
+            bMaxPacketSize = self.device.bMaxPacketSize
+        response = self.get_descriptor(bDescriptorType, index, wIndex, wLength)
+        if response is None:
+            return 0
+        length = len(response)
+        packets = -(-length // bMaxPacketSize)
+        if length < wLength and length % bMaxPacketSize == 0:
+            packets += 1
+        return packets
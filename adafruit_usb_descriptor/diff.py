@@ -0,0 +1,229 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+
+from . import parse
+from . import standard
+from . import util
+
+"""
+Structural diff
+===============
+
+Compares two descriptor trees field by field instead of byte by byte, so one
+inserted endpoint shows up as one addition rather than a shift of everything
+after it.
+
+Interfaces are aligned by number and alternate setting, interface associations by
+their first interface, endpoints by address and MIDI jacks by ID. Other descriptors
+are aligned by class and subtype in order of appearance. Subtrees that serialize
+to the same bytes are skipped without comparing their fields. A `Differ` remembers
+those bytes for every descriptor it has seen, so comparing one base against many
+variants serializes the base and any shared templates once.
+"""
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# ``path`` is a tuple of alignment keys from the root to the descriptor. For added
+# and removed descriptors, ``field`` is None and ``old`` or ``new`` is the
+# descriptor. For changed fields, ``old`` and ``new`` are the field's values.
+Change = collections.namedtuple("Change", ("kind", "path", "field", "old", "new"))
+
+
+def _subtype(descriptor):
+    for name in ("bDescriptorSubtype", "bDevCapabilityType"):
+        value = getattr(descriptor, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def _key(descriptor):
+    """Returns the alignment key of ``descriptor`` before numbering duplicates."""
+    if isinstance(descriptor, standard.InterfaceDescriptor):
+        return ("interface", descriptor.bInterfaceNumber, descriptor.bAlternateSetting)
+    if isinstance(descriptor, standard.InterfaceAssociationDescriptor):
+        return ("association", descriptor.bFirstInterface)
+    if isinstance(descriptor, standard.EndpointDescriptor):
+        return ("endpoint", descriptor.bEndpointAddress)
+    if isinstance(descriptor, standard.ConfigurationDescriptor):
+        return ("configuration",)
+    jack_id = getattr(descriptor, "id", None)
+    if isinstance(jack_id, int) and jack_id:
+        return ("jack", jack_id)
+    return (type(descriptor).__name__, getattr(descriptor, "bDescriptorType", None),
+            _subtype(descriptor))
+
+
+def _keyed(descriptors):
+    """Returns ``(key, descriptor)`` pairs with duplicate keys numbered in order."""
+    seen = {}
+    keyed = []
+    for descriptor in descriptors:
+        key = _key(descriptor)
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        keyed.append((key + (count,) if count else key, descriptor))
+    return keyed
+
+
+def _comparable(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_comparable(item) for item in value)
+    if hasattr(value, "__dict__"):
+        # References to other descriptors, such as MIDI jacks, compare by ID.
+        jack_id = getattr(value, "id", None)
+        return jack_id if jack_id is not None else bytes(value)
+    return value
+
+
+def fields(descriptor):
+    """Returns the fields of ``descriptor`` alone from `util.field_items` by name,
+       with references to other descriptors replaced by their IDs."""
+    return {name: _comparable(value) for name, value, _ in util.field_items(descriptor)}
+
+
+def _children(descriptor):
+    return [child for _, child in util.children(descriptor)]
+
+
+class Differ:
+    """Compares descriptor trees, remembering the serialized bytes of every
+       descriptor it sees. Use a new one after changing a tree in place."""
+
+    def __init__(self):
+        # (descriptor, bytes) by id. The descriptor is kept so its id isn't reused.
+        self._serialized = {}
+
+    def _bytes(self, descriptor):
+        entry = self._serialized.get(id(descriptor))
+        if entry is None:
+            entry = self._serialized[id(descriptor)] = (descriptor, bytes(descriptor))
+        return entry[1]
+
+    def _same(self, old, new):
+        if old is new:
+            return True
+        if type(old) is not type(new):
+            return False
+        return self._bytes(old) == self._bytes(new)
+
+    def _sequence(self, old, new, path, changes):
+        old_keyed = _keyed(old)
+        new_keyed = dict(_keyed(new))
+        for key, descriptor in old_keyed:
+            if key not in new_keyed:
+                changes.append(Change(REMOVED, path + (key,), None, descriptor, None))
+        old_keys = {key for key, _ in old_keyed}
+        for key, descriptor in _keyed(new):
+            if key not in old_keys:
+                changes.append(Change(ADDED, path + (key,), None, None, descriptor))
+        for key, descriptor in old_keyed:
+            if key in new_keyed:
+                self._descriptor(descriptor, new_keyed[key], path + (key,), changes)
+
+    def _descriptor(self, old, new, path, changes):
+        if self._same(old, new):
+            return
+        if type(old) is not type(new):
+            changes.append(Change(CHANGED, path, "class", type(old).__name__,
+                                  type(new).__name__))
+        else:
+            old_fields = fields(old)
+            new_fields = fields(new)
+            for name, value in old_fields.items():
+                if new_fields.get(name) != value:
+                    changes.append(Change(CHANGED, path, name, value, new_fields.get(name)))
+            for name, value in new_fields.items():
+                if name not in old_fields:
+                    changes.append(Change(CHANGED, path, name, None, value))
+        self._sequence(_children(old), _children(new), path, changes)
+
+    def diff(self, old, new):
+        """Returns the `Change` s from ``old`` to ``new``.
+
+           Each is a configuration sequence such as ``[ConfigurationDescriptor,
+           interfaces...]``, a single descriptor, or the bytes of a configuration,
+           which is parsed with `parse.parse_configuration`."""
+        old = _tree(old)
+        new = _tree(new)
+        # Serializing first fills in derived fields, such as bNumEndpoints.
+        for descriptor in old + new:
+            self._bytes(descriptor)
+        changes = []
+        self._sequence(old, new, (), changes)
+        return changes
+
+    def diff_variants(self, base, variants):
+        """Returns the `Change` s from ``base`` to each of ``variants``, a dict of
+           trees by name, as a dict by the same names."""
+        return {name: self.diff(base, variant) for name, variant in variants.items()}
+
+
+def _tree(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return parse.parse_configuration(value)
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+
+def diff(old, new):
+    """Returns the `Change` s from ``old`` to ``new``. See `Differ.diff`."""
+    return Differ().diff(old, new)
+
+
+def _format_key(key):
+    name = key[0]
+    rest = key[1:]
+    if name == "interface":
+        text = "interface {}.{}".format(rest[0], rest[1])
+        rest = rest[2:]
+    elif name == "endpoint":
+        text = "endpoint 0x{:02x}".format(rest[0])
+        rest = rest[1:]
+    elif name in ("association", "jack"):
+        text = "{} {}".format(name, rest[0])
+        rest = rest[1:]
+    elif name == "configuration":
+        text = name
+    else:
+        # Class name, bDescriptorType and subtype.
+        text = name
+        rest = rest[2:]
+    if rest:
+        text += " #{}".format(rest[0] + 1)
+    return text
+
+
+def format_change(change):
+    """Returns a line describing ``change``."""
+    where = " / ".join(_format_key(key) for key in change.path)
+    if change.kind == CHANGED:
+        return "{}: {} {!r} -> {!r}".format(where, change.field, change.old, change.new)
+    descriptor = change.old if change.kind == REMOVED else change.new
+    return "{}: {} {}".format(where, change.kind, type(descriptor).__name__)
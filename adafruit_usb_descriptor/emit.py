@@ -0,0 +1,222 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import hashlib
+import os
+import re
+import stat
+
+from . import hid
+from . import standard
+from . import util
+
+"""
+C source emitter
+================
+
+Streams a `descriptor_set.DescriptorSet` out as C arrays for TinyUSB, with
+``#define`` s for the interface numbers, endpoint addresses and HID report IDs.
+Each descriptor is annotated with its fields by `util.describe`.
+"""
+
+BYTES_PER_LINE = 12
+
+
+def _annotations(descriptor):
+    for line in util.describe(descriptor):
+        yield "    // {}\n".format(line)
+
+
+def _byte_lines(data):
+    for start in range(0, len(data), BYTES_PER_LINE):
+        chunk = data[start:start + BYTES_PER_LINE]
+        yield "    {},\n".format(", ".join("0x{:02x}".format(b) for b in chunk))
+
+
+def _serialized_length(descriptor):
+    length = len(bytes(descriptor))
+    # The interface serializes an endpoint's companion right after it.
+    companion = getattr(descriptor, "companion", None)
+    if companion is not None:
+        length += len(bytes(companion))
+    return length
+
+
+def _descriptor_lines(tree):
+    """Yields the annotated bytes of every descriptor in ``tree``, each nested one
+       with its own annotation."""
+    for _, _, descriptor in util.walk(tree):
+        data = bytes(descriptor)
+        # Nested descriptors follow their parent, so leave them for their own turn.
+        nested = sum(_serialized_length(child) for path, child in util.children(descriptor)
+                     if path[0] != "companion")
+        yield from _annotations(descriptor)
+        yield from _byte_lines(data[:len(data) - nested])
+
+
+def _identifier(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(text)).strip("_").upper() or "UNNAMED"
+
+
+def _defines(prefix, kind, items):
+    seen = set()
+    for name, value in items:
+        name = "{}_{}_{}".format(prefix, kind, _identifier(name))
+        unique = name
+        suffix = 1
+        while unique in seen:
+            suffix += 1
+            unique = "{}_{}".format(name, suffix)
+        seen.add(unique)
+        yield "#define {} {}\n".format(unique, value)
+
+
+def iter_c_source(descriptors, *, prefix="usb", report_ids=None):
+    """Yields the lines of a C source file for ``descriptors``.
+
+       ``report_ids`` maps HID report names to IDs. It defaults to
+       `hid.ReportDescriptor.REPORT_IDS` when there are HID reports.
+    """
+    macro = prefix.upper()
+    yield "// Generated by adafruit_usb_descriptor. Do not edit.\n\n"
+    yield "#include <stdint.h>\n\n"
+
+    interfaces = []
+    endpoints = []
+    for configuration in descriptors.configurations:
+        for descriptor in configuration[1:]:
+            if not isinstance(descriptor, standard.InterfaceDescriptor):
+                continue
+            if descriptor.bAlternateSetting == 0:
+                interfaces.append((descriptor.description, descriptor.bInterfaceNumber))
+            for subdescriptor in descriptor.subdescriptors:
+                if isinstance(subdescriptor, standard.EndpointDescriptor):
+                    endpoints.append((subdescriptor.description,
+                                      "0x{:02x}".format(subdescriptor.bEndpointAddress)))
+    yield from _defines(macro, "INTERFACE", interfaces)
+    yield "#define {}_INTERFACE_COUNT {}\n".format(macro, len(interfaces))
+    yield from _defines(macro, "ENDPOINT", endpoints)
+    if descriptors.hid_reports:
+        if report_ids is None:
+            report_ids = hid.ReportDescriptor.REPORT_IDS
+        yield from _defines(macro, "HID_REPORT_ID", sorted(report_ids.items(), key=lambda i: i[1]))
+    yield "\n"
+
+    yield "const uint8_t {}_device_descriptor[] = {{\n".format(prefix)
+    yield from _descriptor_lines(descriptors.device)
+    yield "};\n\n"
+
+    for index, configuration in enumerate(descriptors.configurations):
+        yield "const uint8_t {}_configuration_descriptor_{}[] = {{\n".format(prefix, index)
+        for descriptor in configuration:
+            yield from _descriptor_lines(descriptor)
+        yield "};\n\n"
+
+    if descriptors.bos is not None:
+        yield "const uint8_t {}_bos_descriptor[] = {{\n".format(prefix)
+        yield from _descriptor_lines(descriptors.bos)
+        yield "};\n\n"
+
+    for interface, report in sorted(descriptors.hid_reports.items()):
+        yield "const uint8_t {}_hid_report_descriptor_{}[] = {{\n".format(prefix, interface)
+        if hasattr(report, "notes"):
+            yield from _descriptor_lines(report)
+        else:
+            yield from _byte_lines(bytes(report))
+        yield "};\n\n"
+
+    strings = descriptors.strings
+    if isinstance(strings, standard.StringTable):
+        strings = strings.string_descriptors()
+    if strings:
+        # All strings in one array, found through the offset table.
+        offsets = []
+        offset = 0
+        yield "const uint8_t {}_string_descriptors[] = {{\n".format(prefix)
+        for index, string in enumerate(strings):
+            data = bytes(string)
+            if index:
+                yield "    // {}: {}\n".format(index, " ".join(string.bString.splitlines()))
+            else:
+                yield "    // 0: LANGIDs\n"
+            yield from _byte_lines(data)
+            offsets.append(offset)
+            offset += len(data)
+        yield "};\n\n"
+        yield "#define {}_STRING_COUNT {}\n".format(macro, len(offsets))
+        yield "const uint16_t {}_string_descriptor_offsets[] = {{\n".format(prefix)
+        yield "    {},\n".format(", ".join(str(o) for o in offsets))
+        yield "};\n"
+
+
+def _create_temporary(directory):
+    # Unlike mkstemp's 0600, 0666 lets the kernel apply the umask as open() would.
+    while True:
+        path = os.path.join(directory, "tmp{}.tmp".format(os.urandom(8).hex()))
+        try:
+            return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), path
+        except FileExistsError:
+            continue
+
+
+def write_if_changed(path, chunks):
+    """Writes the text ``chunks`` to ``path`` unless it already holds exactly that.
+
+       The chunks stream to a temporary file while they are hashed, and it only
+       replaces ``path`` when the hash differs, so ``make`` sees an unchanged
+       timestamp otherwise. A replaced file keeps its permissions and a new one gets
+       the usual ones for the umask. Returns True when ``path`` was written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    new_digest = hashlib.sha256()
+    fd, temporary = _create_temporary(directory)
+    try:
+        with os.fdopen(fd, "w", newline="\n") as f:
+            for chunk in chunks:
+                new_digest.update(chunk.encode())
+                f.write(chunk)
+        old_digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(65536), b""):
+                    old_digest.update(block)
+        except FileNotFoundError:
+            old_digest = None
+        if old_digest is not None and old_digest.digest() == new_digest.digest():
+            os.unlink(temporary)
+            return False
+        try:
+            os.chmod(temporary, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temporary, path)
+        return True
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+
+def emit(descriptors, path, **kwargs):
+    """Writes the C source for ``descriptors`` to ``path`` if it changed. Returns True
+       when it was written."""
+    return write_if_changed(path, iter_c_source(descriptors, **kwargs))
@@ -0,0 +1,266 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+import struct
+
+from . import standard
+from .descriptor_set import DESCRIPTOR_TYPE_HID_REPORT
+
+"""
+Enumeration cost estimates
+==========================
+
+Replays a typical host enumeration against a `descriptor_set.DescriptorSet` and
+counts the control transfer packets and bus time it takes.
+
+The bus time model counts every packet of every transaction: token, data and
+handshake, with worst case bit stuffing, SYNC, EOP and bus turnaround. It doesn't
+include the delays hosts insert between requests or resets.
+"""
+
+# bDescriptorType is None for requests without a data stage.
+Request = collections.namedtuple("Request", ("name", "bDescriptorType", "index", "wIndex", "wLength"))
+
+Transfer = collections.namedtuple("Transfer", ("request", "length", "setup_packets",
+                                               "data_packets", "status_packets", "seconds"))
+
+# Bit rate, SYNC + EOP bits per packet and bus turnaround bits per transaction.
+# SuperSpeed has no tokens or handshakes, so it isn't modelled.
+BUS_PARAMETERS = {
+    standard.SPEED_LOW: (1.5e6, 8 + 3, 2 * 8),
+    standard.SPEED_FULL: (12e6, 8 + 3, 2 * 8),
+    standard.SPEED_HIGH: (480e6, 32 + 8, 2 * 88),
+}
+
+TOKEN_BYTES = 3      # PID, address and endpoint, CRC5
+DATA_OVERHEAD = 3    # PID and CRC16
+HANDSHAKE_BYTES = 1  # PID
+SETUP_BYTES = 8
+
+_no_data = (None, 0, 0, 0)
+
+
+def _get_descriptor(bDescriptorType, index=0, wIndex=0, wLength=0xFF):
+    return Request("GET_DESCRIPTOR", bDescriptorType, index, wIndex, wLength)
+
+
+def _config_total(descriptors, index):
+    configuration = descriptors.get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, index)
+    return struct.unpack_from("<H", configuration, 2)[0]
+
+
+def _hid_report_requests(descriptors):
+    for bDescriptorType, index, interface in sorted(descriptors.keys()):
+        if bDescriptorType == DESCRIPTOR_TYPE_HID_REPORT:
+            length = len(descriptors.get_descriptor(bDescriptorType, index, interface))
+            # Hosts ask for a little more than the length in the HID descriptor.
+            yield _get_descriptor(bDescriptorType, index, interface, length + 0x40)
+
+
+def _bos_requests(descriptors):
+    if descriptors.device.bcdUSB >= 0x201:
+        yield _get_descriptor(standard.DESCRIPTOR_TYPE_BOS, wLength=5)
+        bos = descriptors.get_descriptor(standard.DESCRIPTOR_TYPE_BOS)
+        if bos is not None:
+            yield _get_descriptor(standard.DESCRIPTOR_TYPE_BOS, wLength=struct.unpack_from("<H", bos, 2)[0])
+
+
+def linux_requests(descriptors):
+    """Yields the requests Linux makes to enumerate and configure ``descriptors``."""
+    device = descriptors.device
+    yield _get_descriptor(device.bDescriptorType, wLength=64)
+    yield Request("SET_ADDRESS", *_no_data)
+    yield _get_descriptor(device.bDescriptorType, wLength=device.bLength)
+    yield from _bos_requests(descriptors)
+    for index in range(device.bNumConfigurations):
+        yield _get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, index,
+                              wLength=standard.ConfigurationDescriptor.bLength)
+        yield _get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, index,
+                              wLength=_config_total(descriptors, index))
+    langids = descriptors.get_descriptor(standard.StringDescriptor.bDescriptorType, 0)
+    if langids is not None:
+        yield _get_descriptor(standard.StringDescriptor.bDescriptorType, 0)
+        langid = struct.unpack_from("<H", langids, 2)[0]
+        for index in (device.iProduct, device.iManufacturer, device.iSerialNumber):
+            if index:
+                yield _get_descriptor(standard.StringDescriptor.bDescriptorType, index, langid)
+    yield Request("SET_CONFIGURATION", *_no_data)
+    yield from _hid_report_requests(descriptors)
+
+
+def windows_requests(descriptors):
+    """Yields the requests Windows makes to enumerate and configure ``descriptors``."""
+    device = descriptors.device
+    # Windows resets the device after the first packet of the first request.
+    yield _get_descriptor(device.bDescriptorType, wLength=min(64, device.bMaxPacketSize))
+    yield Request("SET_ADDRESS", *_no_data)
+    yield _get_descriptor(device.bDescriptorType, wLength=device.bLength)
+    total = _config_total(descriptors, 0)
+    yield _get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, wLength=0xFF)
+    if total > 0xFF:
+        yield _get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, wLength=total)
+    langid = standard.LANGID_ENGLISH_US
+    if device.iSerialNumber:
+        yield _get_descriptor(standard.StringDescriptor.bDescriptorType, 0)
+        yield _get_descriptor(standard.StringDescriptor.bDescriptorType, device.iSerialNumber, langid)
+    # Microsoft OS string descriptor probe.
+    yield _get_descriptor(standard.StringDescriptor.bDescriptorType, 0xEE, 0, 0x12)
+    yield from _bos_requests(descriptors)
+    if device.iProduct:
+        yield _get_descriptor(standard.StringDescriptor.bDescriptorType, 0)
+        yield _get_descriptor(standard.StringDescriptor.bDescriptorType, device.iProduct, langid)
+    yield _get_descriptor(device.bDescriptorType, wLength=device.bLength)
+    yield _get_descriptor(standard.ConfigurationDescriptor.bDescriptorType,
+                          wLength=standard.ConfigurationDescriptor.bLength)
+    yield _get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, wLength=total)
+    yield Request("SET_CONFIGURATION", *_no_data)
+    yield from _hid_report_requests(descriptors)
+
+
+LINUX = linux_requests
+WINDOWS = windows_requests
+
+
+class Enumeration:
+    """Packet counts and bus time of every request of one enumeration."""
+
+    def __init__(self, descriptors, *,
+                 host=LINUX,
+                 speed=standard.SPEED_FULL,
+                 bMaxPacketSize=None):
+        self.descriptors = descriptors
+        self.speed = speed
+        if bMaxPacketSize is None:
+            bMaxPacketSize = descriptors.device.bMaxPacketSize
+        self.bMaxPacketSize = bMaxPacketSize
+        try:
+            self.bit_rate, self._packet_bits, self._turnaround_bits = BUS_PARAMETERS[speed]
+        except KeyError:
+            raise ValueError("No bus model for speed {}".format(speed)) from None
+        self.transfers = [self._transfer(request) for request in host(descriptors)]
+
+    def _packet_seconds(self, content_bytes):
+        return (content_bytes * 8 * 7 / 6 + self._packet_bits) / self.bit_rate
+
+    def _transaction_seconds(self, payload, handshake=True):
+        bits_time = (self._packet_seconds(TOKEN_BYTES) +
+                     self._packet_seconds(DATA_OVERHEAD + payload) +
+                     self._turnaround_bits / self.bit_rate)
+        if handshake:
+            bits_time += self._packet_seconds(HANDSHAKE_BYTES)
+        return bits_time
+
+    def _transfer(self, request):
+        seconds = self._transaction_seconds(SETUP_BYTES)
+        if request.bDescriptorType is None:
+            return Transfer(request, 0, 1, 0, 1, seconds + self._transaction_seconds(0))
+        response = self.descriptors.get_descriptor(request.bDescriptorType, request.index,
+                                                   request.wIndex, request.wLength)
+        if response is None:
+            # The device answers the first IN token with a STALL handshake.
+            seconds += (self._packet_seconds(TOKEN_BYTES) + self._packet_seconds(HANDSHAKE_BYTES) +
+                        self._turnaround_bits / self.bit_rate)
+            return Transfer(request, 0, 1, 1, 0, seconds)
+        length = len(response)
+        packets = self.descriptors.control_packets(request.bDescriptorType, request.index,
+                                                   request.wIndex, request.wLength,
+                                                   self.bMaxPacketSize)
+        full, last = divmod(length, self.bMaxPacketSize)
+        seconds += full * self._transaction_seconds(self.bMaxPacketSize)
+        if packets > full:
+            seconds += self._transaction_seconds(last)
+        seconds += self._transaction_seconds(0)
+        return Transfer(request, length, 1, packets, 1, seconds)
+
+    @property
+    def setup_packets(self):
+        return sum(t.setup_packets for t in self.transfers)
+
+    @property
+    def data_packets(self):
+        return sum(t.data_packets for t in self.transfers)
+
+    @property
+    def status_packets(self):
+        return sum(t.status_packets for t in self.transfers)
+
+    @property
+    def bus_time(self):
+        """Total bus time in seconds."""
+        return sum(t.seconds for t in self.transfers)
+
+    def ranking(self):
+        """Returns ``[(label, bytes, seconds)]`` sorted by bus time, most first.
+
+           Configurations are broken down into their top level descriptors, such as
+           each interface with its subdescriptors, which share the configuration's data
+           stage time by size. Everything else is ranked per descriptor.
+        """
+        data_seconds = collections.Counter()
+        data_bytes = collections.Counter()
+        for transfer in self.transfers:
+            request = transfer.request
+            if request.bDescriptorType is None:
+                continue
+            key = (request.bDescriptorType, request.index, request.wIndex)
+            data_seconds[key] += transfer.seconds
+            data_bytes[key] += transfer.length
+
+        ranking = []
+        for key, seconds in data_seconds.items():
+            bDescriptorType, index, wIndex = key
+            if bDescriptorType == standard.ConfigurationDescriptor.bDescriptorType:
+                configuration = self.descriptors.configurations[index]
+                sizes = [(d, len(bytes(d))) for d in configuration]
+                total = sum(size for _, size in sizes)
+                for descriptor, size in sizes:
+                    share = size / total
+                    ranking.append(("configuration {}: {}".format(index, descriptor.description),
+                                    int(data_bytes[key] * share), seconds * share))
+            else:
+                ranking.append((self._label(key), data_bytes[key], seconds))
+        ranking.sort(key=lambda entry: entry[2], reverse=True)
+        return ranking
+
+    def _label(self, key):
+        bDescriptorType, index, wIndex = key
+        if bDescriptorType == standard.StringDescriptor.bDescriptorType:
+            if index == 0:
+                return "string 0 (LANGIDs)"
+            response = self.descriptors.get_descriptor(bDescriptorType, index, wIndex)
+            if response is None:
+                return "string {} (stalled)".format(index)
+            return "string {} {!r}".format(index, str(response[2:], "utf-16-le"))
+        if bDescriptorType == DESCRIPTOR_TYPE_HID_REPORT:
+            return "HID report for interface {}".format(wIndex)
+        if bDescriptorType == standard.DeviceDescriptor.bDescriptorType:
+            return "device"
+        if bDescriptorType == standard.DESCRIPTOR_TYPE_BOS:
+            return "BOS"
+        return "descriptor 0x{:02x} {}".format(bDescriptorType, index)
+
+
+def simulate(descriptors, *, host=LINUX, speed=standard.SPEED_FULL, bMaxPacketSize=None):
+    """Returns the `Enumeration` of ``descriptors`` by ``host``. Raises ValueError for
+       a ``speed`` without `BUS_PARAMETERS`, such as `standard.SPEED_SUPER`."""
+    return Enumeration(descriptors, host=host, speed=speed, bMaxPacketSize=bMaxPacketSize)
@@ -0,0 +1,174 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import copy
+
+"""
+Frozen descriptors
+==================
+
+`freeze` turns a descriptor tree into immutable, hashable copies that compare by
+structure. A frozen template, such as a CDC or HID function, can be joined into
+any number of configurations without copying it first: `util.join_interfaces`
+returns new descriptors for the ones it renumbers and shares everything else.
+
+Frozen descriptors are instances of a subclass of their original class, so they
+serialize, walk and ``isinstance`` check the same way. Only their
+``derived_fields``, which serialization fills in, can still be set.
+"""
+
+_frozen_classes = {}
+
+
+class FrozenDescriptor:
+    """Base of the frozen subclasses that `freeze` creates."""
+    __slots__ = ("_frozen_hash",)
+
+    def __setattr__(self, name, value):
+        if name not in getattr(type(self), "derived_fields", ()):
+            raise AttributeError("Can't set {} of frozen {}".format(name, type(self).__name__))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError("Can't delete {} of frozen {}".format(name, type(self).__name__))
+
+    def _structure(self):
+        derived = getattr(type(self), "derived_fields", ())
+        return tuple((name, _hashable(value)) for name, value in sorted(vars(self).items())
+                     if name not in derived)
+
+    def __hash__(self):
+        try:
+            return self._frozen_hash
+        except AttributeError:
+            value = hash((type(self), self._structure()))
+            object.__setattr__(self, "_frozen_hash", value)
+            return value
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(self) is not type(other) or hash(self) != hash(other):
+            return False
+        return self._structure() == other._structure()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # The class is found by name when unpickling, which is the mutable original.
+        return (_restore, (type(self).__bases__[1], dict(vars(self))))
+
+    def __copy__(self):
+        # Frozen descriptors never change, so copies can be the same object.
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    return value
+
+
+def frozen_class(cls):
+    """Returns the frozen subclass of descriptor class ``cls``."""
+    if issubclass(cls, FrozenDescriptor):
+        return cls
+    try:
+        return _frozen_classes[cls]
+    except KeyError:
+        frozen = type(cls.__name__, (FrozenDescriptor, cls), {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+        })
+        _frozen_classes[cls] = frozen
+        return frozen
+
+
+def is_frozen(value):
+    return isinstance(value, FrozenDescriptor)
+
+
+def _new(cls, attributes):
+    descriptor = object.__new__(cls)
+    descriptor.__dict__.update(attributes)
+    return descriptor
+
+
+def _restore(cls, attributes):
+    return _new(frozen_class(cls), attributes)
+
+
+def _freeze(value, memo):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item, memo) for item in value)
+    if isinstance(value, dict):
+        return {k: _freeze(v, memo) for k, v in value.items()}
+    if isinstance(value, (bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, FrozenDescriptor) or not hasattr(value, "__dict__"):
+        return value
+    # Descriptors referenced from several places, such as MIDI jacks in input pins,
+    # stay one object.
+    frozen = memo.get(id(value))
+    if frozen is None:
+        frozen = memo[id(value)] = _new(frozen_class(type(value)), {})
+        frozen.__dict__.update({name: _freeze(v, memo) for name, v in vars(value).items()})
+    return frozen
+
+
+def freeze(tree):
+    """Returns a frozen copy of ``tree``, a descriptor or nested lists of them. Lists
+       become tuples. Parts that are already frozen are shared, not copied."""
+    return _freeze(tree, {})
+
+
+def replace(descriptor, **changes):
+    """Returns a copy of ``descriptor`` with ``changes`` to its attributes. The copy
+       is frozen when ``descriptor`` is and shares everything that didn't change."""
+    if is_frozen(descriptor):
+        attributes = dict(vars(descriptor))
+        for name, value in changes.items():
+            attributes[name] = value if type(value) is int else _freeze(value, {})
+        return _new(type(descriptor), attributes)
+    result = copy.copy(descriptor)
+    for name, value in changes.items():
+        setattr(result, name, value)
+    return result
+
+
+def update(descriptor, **changes):
+    """Sets ``changes`` on a mutable ``descriptor`` and returns it, or returns a
+       `replace` d copy of a frozen one. Code that works with either kind uses the
+       result."""
+    if is_frozen(descriptor):
+        attributes = vars(descriptor)
+        for name, value in changes.items():
+            if attributes.get(name) != value:
+                return replace(descriptor, **changes)
+        return descriptor
+    for name, value in changes.items():
+        setattr(descriptor, name, value)
+    return descriptor
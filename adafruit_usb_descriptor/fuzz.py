@@ -0,0 +1,428 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+import json
+import random
+import time
+import tracemalloc
+
+from . import cdc
+from . import hid
+from . import midi
+from . import parse
+from . import standard
+from . import util
+
+"""
+Fuzzing
+=======
+
+Builds random but valid device trees from `standard`, `cdc`, `hid` and `midi`
+descriptors, serializes them and checks that `parse` gives the same bytes back
+and serializes the same way again. Each tree is then mutated into malformed
+blobs, which must either be rejected with ValueError or parse to something that
+serializes back to the blob. Anything else, or a parse that takes too long or
+allocates too much for its input, is a `Failure`.
+
+Every tree comes from its own seed, so a failure can be rebuilt with `tree`. The
+`Results` count trees and mutants per second too, so a slower parser shows up
+with the same run that checks it.
+"""
+
+# Mutations `mutate` chooses from.
+MUTATIONS = ("byte", "bit", "length", "total_length", "type", "truncate", "extend",
+             "duplicate", "remove")
+
+# Failure kinds.
+UNSTABLE = "unstable"
+UNPARSED = "unparsed"
+CRASH = "crash"
+SLOW = "slow"
+ALLOCATION = "allocation"
+
+# Something `run` found wrong. ``tree_seed`` rebuilds the tree with `tree`, and
+# ``data`` is the blob that failed, mutated by ``mutation`` when it isn't None.
+Failure = collections.namedtuple("Failure", ("kind", "tree_seed", "mutation", "message",
+                                             "data"))
+
+_SPEEDS = (standard.SPEED_FULL, standard.SPEED_HIGH, standard.SPEED_SUPER)
+_TRANSFER_TYPES = (standard.EndpointDescriptor.TYPE_ISOCHRONOUS,
+                   standard.EndpointDescriptor.TYPE_BULK,
+                   standard.EndpointDescriptor.TYPE_INTERRUPT)
+_REPORTS = ("GENERIC_MOUSE_REPORT", "GENERIC_KEYBOARD_REPORT",
+            "MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT")
+
+
+def _acm_functions(rng, speed):
+    return cdc.acm_functions(rng.randint(1, 3),
+                             speed=speed,
+                             bInterval=rng.randint(1, 255),
+                             bmCapabilities=rng.randrange(16),
+                             iInterface=rng.randrange(8),
+                             iFunction=rng.randrange(8))
+
+
+def _network_functions(rng, speed):
+    return [cdc.network_interfaces(iMACAddress=rng.randrange(1, 8),
+                                   subclass=rng.choice((cdc.CDC_SUBCLASS_NCM,
+                                                        cdc.CDC_SUBCLASS_ETH)),
+                                   speed=speed,
+                                   wMaxSegmentSize=rng.randint(64, 9014),
+                                   bInterval=rng.randint(1, 255))]
+
+
+def _hid_functions(rng, speed):
+    report = getattr(hid.ReportDescriptor, rng.choice(_REPORTS))
+    endpoints = [standard.EndpointDescriptor(
+        description="HID in",
+        bEndpointAddress=standard.EndpointDescriptor.DIRECTION_IN,
+        bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+        wMaxPacketSize=rng.randint(1, 64),
+        bInterval=rng.randint(1, 255))]
+    if rng.random() < 0.5:
+        endpoints.append(standard.EndpointDescriptor(
+            description="HID out",
+            bEndpointAddress=standard.EndpointDescriptor.DIRECTION_OUT,
+            bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+            wMaxPacketSize=rng.randint(1, 64),
+            bInterval=rng.randint(1, 255)))
+    return [[standard.InterfaceDescriptor(
+        description="HID",
+        bInterfaceClass=hid.HID_CLASS,
+        bInterfaceSubClass=rng.choice((hid.HID_SUBCLASS_NOBOOT, hid.HID_SUBCLASS_BOOT)),
+        bInterfaceProtocol=rng.choice((hid.HID_PROTOCOL_NONE, hid.HID_PROTOCOL_KEYBOARD,
+                                       hid.HID_PROTOCOL_MOUSE)),
+        subdescriptors=[hid.HIDDescriptor(description="HID",
+                                          bCountryCode=rng.randrange(36),
+                                          wDescriptorLength=len(bytes(report)))] + endpoints)]]
+
+
+def _midi_functions(rng, speed):
+    jacks = []
+    for i in range(rng.randint(1, 16)):
+        jack_type = rng.choice((midi.JACK_TYPE_EMBEDDED, midi.JACK_TYPE_EXTERNAL))
+        if jacks and rng.random() < 0.5:
+            pins = [(rng.choice(jacks), rng.randint(1, 4)) for _ in range(rng.randint(1, 3))]
+            jacks.append(midi.OutJackDescriptor(description="out {}".format(i),
+                                                bJackType=jack_type,
+                                                input_pins=pins,
+                                                iJack=rng.randrange(8)))
+        else:
+            jacks.append(midi.InJackDescriptor(description="in {}".format(i),
+                                               bJackType=jack_type,
+                                               iJack=rng.randrange(8)))
+    wMaxPacketSize = standard.EndpointDescriptor.max_packet_size(
+        standard.EndpointDescriptor.TYPE_BULK, speed)
+    subdescriptors = [midi.Header(jacks_and_elements=jacks)]
+    for direction in (standard.EndpointDescriptor.DIRECTION_OUT,
+                      standard.EndpointDescriptor.DIRECTION_IN):
+        subdescriptors.append(standard.EndpointDescriptor(
+            description="MIDI",
+            bEndpointAddress=direction,
+            bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+            wMaxPacketSize=wMaxPacketSize))
+        subdescriptors.append(midi.DataEndpointDescriptor(
+            baAssocJack=rng.sample(jacks, rng.randint(1, len(jacks)))))
+    return [[standard.InterfaceDescriptor(description="MIDI",
+                                          bInterfaceClass=0x01,
+                                          bInterfaceSubClass=0x03,
+                                          subdescriptors=subdescriptors)]]
+
+
+def _vendor_functions(rng, speed):
+    interfaces = []
+    for alternate in range(rng.randint(1, 3)):
+        endpoints = []
+        for number in range(rng.randint(0, 4)):
+            transfer_type = rng.choice(_TRANSFER_TYPES)
+            try:
+                largest = standard.EndpointDescriptor.max_packet_size(transfer_type, speed)
+            except ValueError:
+                continue
+            endpoint = standard.EndpointDescriptor(
+                description="vendor",
+                bEndpointAddress=number | rng.choice(
+                    (standard.EndpointDescriptor.DIRECTION_IN,
+                     standard.EndpointDescriptor.DIRECTION_OUT)),
+                bmAttributes=transfer_type,
+                wMaxPacketSize=rng.randint(1, largest),
+                bInterval=rng.randint(1, 16))
+            if speed == standard.SPEED_SUPER:
+                endpoint.companion = standard.SuperSpeedEndpointCompanionDescriptor(
+                    description="vendor", bMaxBurst=rng.randrange(16))
+            endpoints.append(endpoint)
+        interfaces.append(standard.InterfaceDescriptor(description="vendor",
+                                                       bAlternateSetting=alternate,
+                                                       bInterfaceClass=0xFF,
+                                                       bInterfaceSubClass=rng.randrange(256),
+                                                       bInterfaceProtocol=rng.randrange(256),
+                                                       iInterface=rng.randrange(8),
+                                                       subdescriptors=endpoints))
+    return [interfaces]
+
+
+_FUNCTIONS = (_acm_functions, _network_functions, _hid_functions, _midi_functions,
+              _vendor_functions)
+
+
+def tree(seed):
+    """Returns ``(device, configurations)``, a random valid device built from
+       ``seed``, a str or int. Each configuration is a configuration sequence as
+       `util.join_interfaces` returns them, with its ``wTotalLength`` and
+       ``bNumInterfaces`` filled in."""
+    rng = random.Random(seed)
+    speed = rng.choice(_SPEEDS)
+    configurations = []
+    for index in range(rng.randint(1, 2)):
+        functions = []
+        for _ in range(rng.randint(1, 4)):
+            functions.extend(rng.choice(_FUNCTIONS)(rng, speed))
+        interfaces = util.join_interfaces(functions)
+        body = b"".join(bytes(descriptor) for descriptor in interfaces)
+        configuration = standard.ConfigurationDescriptor(
+            description="fuzz",
+            wTotalLength=standard.ConfigurationDescriptor.bLength + len(body),
+            bNumInterfaces=sum(1 for d in interfaces
+                               if isinstance(d, standard.InterfaceDescriptor)
+                               and d.bAlternateSetting == 0),
+            bConfigurationValue=index + 1,
+            iConfiguration=rng.randrange(8),
+            bmAttributes=0x80 | rng.choice((0x00, 0x20, 0x40, 0x60)),
+            bMaxPower=rng.randrange(256))
+        configurations.append([configuration] + interfaces)
+    device = standard.DeviceDescriptor(
+        description="fuzz",
+        bcdUSB=0x0320 if speed == standard.SPEED_SUPER else rng.choice((0x0200, 0x0210)),
+        bDeviceClass=rng.choice((0x00, 0xEF)),
+        bDeviceSubClass=rng.choice((0x00, 0x02)),
+        bDeviceProtocol=rng.choice((0x00, 0x01)),
+        bMaxPacketSize=9 if speed == standard.SPEED_SUPER else rng.choice((8, 16, 32, 64)),
+        idVendor=rng.randrange(0x10000),
+        idProduct=rng.randrange(0x10000),
+        bcdDevice=rng.randrange(0x10000),
+        iManufacturer=rng.randrange(8),
+        iProduct=rng.randrange(8),
+        iSerialNumber=rng.randrange(8),
+        bNumConfigurations=len(configurations))
+    return device, configurations
+
+
+def serialize(device, configurations):
+    """Returns the bytes of ``device`` followed by each configuration, laid out like
+       `parse.parse_device_file` reads them."""
+    return bytes(device) + b"".join(bytes(descriptor)
+                                    for configuration in configurations
+                                    for descriptor in configuration)
+
+
+def _offsets(data):
+    """Returns the offset of every descriptor in valid ``data``."""
+    return [offset for offset, _ in parse.iter_descriptors(data)]
+
+
+def mutate(data, rng, mutation=None):
+    """Returns a copy of ``data``, a valid serialized device from `serialize`,
+       changed by ``mutation`` or one chosen from `MUTATIONS` with ``rng``."""
+    if mutation is None:
+        mutation = rng.choice(MUTATIONS)
+    result = bytearray(data)
+    offsets = _offsets(data)
+    offset = rng.choice(offsets)
+    end = offset + data[offset]
+    if mutation == "byte":
+        result[rng.randrange(len(result))] = rng.randrange(256)
+    elif mutation == "bit":
+        result[rng.randrange(len(result))] ^= 1 << rng.randrange(8)
+    elif mutation == "length":
+        result[offset] = rng.choice((0, 1, 2, data[offset] - 1, data[offset] + 1, 255)) & 0xFF
+    elif mutation == "total_length":
+        configurations = [o for o in offsets
+                          if data[o + 1] == standard.ConfigurationDescriptor.bDescriptorType]
+        position = rng.choice(configurations) + 2
+        result[position:position + 2] = rng.randrange(0x10000).to_bytes(2, "little")
+    elif mutation == "type":
+        result[offset + 1] = rng.choice((0x02, 0x04, 0x05, 0x0B, 0x21, 0x24, 0x25, 0x30,
+                                         rng.randrange(256)))
+        if end - offset > 2 and rng.random() < 0.5:
+            result[offset + 2] = rng.randrange(16)
+    elif mutation == "truncate":
+        del result[rng.randrange(len(result)):]
+    elif mutation == "extend":
+        result += bytes(rng.randrange(256) for _ in range(rng.randint(1, 32)))
+    elif mutation == "duplicate":
+        result[end:end] = data[offset:end]
+    elif mutation == "remove":
+        del result[offset:end]
+    else:
+        raise ValueError("Unknown mutation {!r}".format(mutation))
+    return bytes(result)
+
+
+def _serialize_parsed(parsed):
+    device, configurations = parsed
+    return serialize(device, configurations)
+
+
+def _has_raw(configurations):
+    for configuration in configurations:
+        for _, _, descriptor in util.walk(configuration):
+            if isinstance(descriptor, standard.RawDescriptor):
+                return True
+    return False
+
+
+class Results:
+    """What `run` counted and the `Failure` s it found."""
+
+    def __init__(self):
+        self.trees = 0
+        self.mutants = 0
+        self.rejected = 0
+        self.accepted = 0
+        self.bytes = 0
+        self.tree_seconds = 0.0
+        self.mutant_seconds = 0.0
+        self.peak_bytes = 0
+        self.failures = []
+
+    @property
+    def trees_per_second(self):
+        """Trees generated, serialized and round tripped per second."""
+        return self.trees / self.tree_seconds if self.tree_seconds else 0.0
+
+    @property
+    def mutants_per_second(self):
+        return self.mutants / self.mutant_seconds if self.mutant_seconds else 0.0
+
+    def as_dict(self):
+        return {"trees": self.trees, "mutants": self.mutants, "rejected": self.rejected,
+                "accepted": self.accepted, "bytes": self.bytes,
+                "trees_per_second": self.trees_per_second,
+                "mutants_per_second": self.mutants_per_second,
+                "peak_bytes": self.peak_bytes,
+                "failures": [failure._replace(data=failure.data.hex())._asdict()
+                             for failure in self.failures]}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), sort_keys=True, **kwargs)
+
+
+class Fuzzer:
+    """Checks trees from `tree` and their mutants, collecting `Results`.
+
+       A parse that takes more than ``time_limit`` seconds is `SLOW`. With
+       ``trace_memory``, each mutant is parsed under `tracemalloc` and one that
+       allocates more than ``memory_factor`` times its size plus 64 KiB at peak is
+       `ALLOCATION`. Tracing slows parsing down a lot, so it's off by default.
+    """
+
+    def __init__(self, *, mutants=4, time_limit=0.1, trace_memory=False, memory_factor=64):
+        self.mutants = mutants
+        self.time_limit = time_limit
+        self.trace_memory = trace_memory
+        self.memory_factor = memory_factor
+        self.results = Results()
+
+    def _fail(self, kind, tree_seed, mutation, message, data):
+        self.results.failures.append(Failure(kind, tree_seed, mutation, message, data))
+
+    def check_tree(self, tree_seed):
+        """Round trips the tree from ``tree_seed`` and returns its bytes, or None
+           when it failed."""
+        results = self.results
+        start = time.perf_counter()
+        data = serialize(*tree(tree_seed))
+        try:
+            parsed = parse.parse_device_file(data)
+            again = _serialize_parsed(parsed)
+            stable = again == data and _serialize_parsed(parse.parse_device_file(again)) == data
+        except Exception as error:
+            results.tree_seconds += time.perf_counter() - start
+            self._fail(CRASH, tree_seed, None, repr(error), data)
+            return None
+        results.tree_seconds += time.perf_counter() - start
+        results.trees += 1
+        results.bytes += len(data)
+        if not stable:
+            self._fail(UNSTABLE, tree_seed, None, "Serialized differently after parsing", data)
+            return None
+        if _has_raw(parsed[1]):
+            # Every class the generator uses should have a decoder.
+            self._fail(UNPARSED, tree_seed, None, "Parsed as RawDescriptor", data)
+        return data
+
+    def check_mutant(self, tree_seed, mutation, data):
+        """Parses malformed ``data``, which must be rejected with ValueError or
+           serialize back to ``data``."""
+        results = self.results
+        results.mutants += 1
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            parsed = parse.parse_device_file(data)
+            again = _serialize_parsed(parsed)
+        except ValueError:
+            parsed = None
+        except Exception as error:
+            self._fail(CRASH, tree_seed, mutation, repr(error), data)
+            return
+        finally:
+            seconds = time.perf_counter() - start
+            results.mutant_seconds += seconds
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results.peak_bytes = max(results.peak_bytes, peak)
+                if peak > self.memory_factor * len(data) + 0x10000:
+                    self._fail(ALLOCATION, tree_seed, mutation,
+                               "Allocated {} bytes".format(peak), data)
+        if seconds > self.time_limit:
+            self._fail(SLOW, tree_seed, mutation, "Took {:.3f} s".format(seconds), data)
+        if parsed is None:
+            results.rejected += 1
+        elif again != data:
+            self._fail(UNSTABLE, tree_seed, mutation, "Accepted but serialized differently",
+                       data)
+        else:
+            results.accepted += 1
+
+    def run(self, count, *, seed=0):
+        """Checks ``count`` trees, from tree seed ``"<seed>:0"`` on, and
+           ``mutants`` mutants of each. Returns the `Results`."""
+        for i in range(count):
+            tree_seed = "{}:{}".format(seed, i)
+            data = self.check_tree(tree_seed)
+            if data is None:
+                continue
+            rng = random.Random(tree_seed + ":mutants")
+            for _ in range(self.mutants):
+                mutation = rng.choice(MUTATIONS)
+                self.check_mutant(tree_seed, mutation, mutate(data, rng, mutation))
+        return self.results
+
+
+def run(count=1000, *, seed=0, **kwargs):
+    """Fuzzes ``count`` trees with a new `Fuzzer` made with ``kwargs`` and returns
+       its `Results`."""
+    return Fuzzer(**kwargs).run(count, seed=seed)
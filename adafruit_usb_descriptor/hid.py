@@ -20,8 +20,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import collections
 import struct
 
+from . import util
+
 """
 HID specific descriptors
 ========================
@@ -44,6 +47,8 @@ class HIDDescriptor:
     """Lists upcoming HID report descriptors."""
     bDescriptorType = 0x21
     fmt = "<BB" + "HBBBH"
+    fields = ("bLength", "bDescriptorType", "bcdHID", "bCountryCode",
+              "bNumDescriptors", "bDescriptorType_Class", "wDescriptorLength")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -61,7 +66,7 @@ class HIDDescriptor:
         self.wDescriptorLength = wDescriptorLength
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -84,77 +89,103 @@ class ReportDescriptor:
         self.report_descriptor = report_descriptor
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return self.report_descriptor
 
-ReportDescriptor.GENERIC_MOUSE_REPORT = ReportDescriptor(
-    description="GENERIC_MOUSE_REPORT",
-    report_descriptor=bytes([
-        0x05, 0x01,     # Usage Page (Generic Desktop),
-        0x09, 0x02,     # Usage (Mouse),
-        0xA1, 0x01,     #  Collection (Application),
-        0x09, 0x01,     #   Usage (Pointer),
-        0xA1, 0x00,     #  Collection (Physical),
-        0x05, 0x09,     #     Usage Page (Buttons),
-        0x19, 0x01,     #     Usage Minimum (01),
-        0x29, 0x03,     #     Usage Maximum (03),
-        0x15, 0x00,     #     Logical Minimum (0),
-        0x25, 0x01,     #     Logical Maximum (1),
-        0x75, 0x01,     #     Report Size (1),
-        0x95, 0x03,     #     Report Count (3),
-        0x81, 0x02,     #     Input (Data, Variable, Absolute)
-        0x75, 0x05,     #     Report Size (5),
-        0x95, 0x01,     #     Report Count (1),
-        0x81, 0x01,     #     Input (Constant),
-        0x05, 0x01,     #     Usage Page (Generic Desktop),
-        0x09, 0x30,     #     Usage (X),
-        0x09, 0x31,     #     Usage (Y),
-        0x09, 0x38,     #     Usage (Scroll),
-        0x15, 0x81,     #     Logical Minimum (-127),
-        0x25, 0x7F,     #     Logical Maximum (127),
-        0x75, 0x08,     #     Report Size (8),
-        0x95, 0x03,     #     Report Count (3),
-        0x81, 0x06,     #     Input (Data, Variable, Relative)
-        0xC0,           #  End Collection,
-        0xC0,           # End Collection
-    ]))
-
-ReportDescriptor.GENERIC_KEYBOARD_REPORT = ReportDescriptor(
-    description="GENERIC_KEYBOARD_REPORT",
-    report_descriptor=bytes([
-        0x05, 0x01,     # Usage Page (Generic Desktop)
-        0x09, 0x06,     # Usage (Keyboard)
-        0xA1, 0x01,     # Collection (Application)
-        0x05, 0x07,     # Usage Page (Keyboard)
-        0x19, 224,      # Usage Minimum (224)
-        0x29, 231,      # Usage Maximum (231)
-        0x15, 0x00,     # Logical Minimum (0)
-        0x25, 0x01,     # Logical Maximum (1)
-        0x75, 0x01,     # Report Size (1)
-        0x95, 0x08,     # Report Count (8)
-        0x81, 0x02,     # Input (Data, Variable, Absolute)
-        0x81, 0x01,     # Input (Constant)
-        0x19, 0x00,     # Usage Minimum (0)
-        0x29, 101,      # Usage Maximum (101)
-        0x15, 0x00,     # Logical Minimum (0)
-        0x25, 101,      # Logical Maximum (101)
-        0x75, 0x08,     # Report Size (8)
-        0x95, 0x06,     # Report Count (6)
-        0x81, 0x00,     # Input (Data, Array)
-        0x05, 0x08,     # Usage Page (LED)
-        0x19, 0x01,     # Usage Minimum (1)
-        0x29, 0x05,     # Usage Maximum (5)
-        0x15, 0x00,     # Logical Minimum (0)
-        0x25, 0x01,     # Logical Maximum (1)
-        0x75, 0x01,     # Report Size (1)
-        0x95, 0x05,     # Report Count (5)
-        0x91, 0x02,     # Output (Data, Variable, Absolute)
-        0x95, 0x03,     # Report Count (3)
-        0x91, 0x01,     # Output (Constant)
-        0xC0,           # End Collection
-    ]))
+
+class _BuiltInReport:
+    """Class attribute of `ReportDescriptor` that builds one of the built-in reports
+    the first time it's read and then replaces itself with it, so importing `hid`
+    doesn't build reports that aren't used."""
+
+    def __init__(self, build):
+        self.build = build
+        self.owner = None
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, owner):
+        report = self.build()
+        # Cache on the defining class, not a subclass it was read through, so every
+        # access path returns the same report.
+        setattr(self.owner, self.name, report)
+        return report
+
+
+def _generic_mouse_report():
+    return ReportDescriptor(
+        description="GENERIC_MOUSE_REPORT",
+        report_descriptor=bytes([
+            0x05, 0x01,     # Usage Page (Generic Desktop),
+            0x09, 0x02,     # Usage (Mouse),
+            0xA1, 0x01,     #  Collection (Application),
+            0x09, 0x01,     #   Usage (Pointer),
+            0xA1, 0x00,     #  Collection (Physical),
+            0x05, 0x09,     #     Usage Page (Buttons),
+            0x19, 0x01,     #     Usage Minimum (01),
+            0x29, 0x03,     #     Usage Maximum (03),
+            0x15, 0x00,     #     Logical Minimum (0),
+            0x25, 0x01,     #     Logical Maximum (1),
+            0x75, 0x01,     #     Report Size (1),
+            0x95, 0x03,     #     Report Count (3),
+            0x81, 0x02,     #     Input (Data, Variable, Absolute)
+            0x75, 0x05,     #     Report Size (5),
+            0x95, 0x01,     #     Report Count (1),
+            0x81, 0x01,     #     Input (Constant),
+            0x05, 0x01,     #     Usage Page (Generic Desktop),
+            0x09, 0x30,     #     Usage (X),
+            0x09, 0x31,     #     Usage (Y),
+            0x09, 0x38,     #     Usage (Scroll),
+            0x15, 0x81,     #     Logical Minimum (-127),
+            0x25, 0x7F,     #     Logical Maximum (127),
+            0x75, 0x08,     #     Report Size (8),
+            0x95, 0x03,     #     Report Count (3),
+            0x81, 0x06,     #     Input (Data, Variable, Relative)
+            0xC0,           #  End Collection,
+            0xC0,           # End Collection
+        ]))
+
+
+def _generic_keyboard_report():
+    return ReportDescriptor(
+        description="GENERIC_KEYBOARD_REPORT",
+        report_descriptor=bytes([
+            0x05, 0x01,     # Usage Page (Generic Desktop)
+            0x09, 0x06,     # Usage (Keyboard)
+            0xA1, 0x01,     # Collection (Application)
+            0x05, 0x07,     # Usage Page (Keyboard)
+            0x19, 224,      # Usage Minimum (224)
+            0x29, 231,      # Usage Maximum (231)
+            0x15, 0x00,     # Logical Minimum (0)
+            0x25, 0x01,     # Logical Maximum (1)
+            0x75, 0x01,     # Report Size (1)
+            0x95, 0x08,     # Report Count (8)
+            0x81, 0x02,     # Input (Data, Variable, Absolute)
+            0x81, 0x01,     # Input (Constant)
+            0x19, 0x00,     # Usage Minimum (0)
+            0x29, 101,      # Usage Maximum (101)
+            0x15, 0x00,     # Logical Minimum (0)
+            0x25, 101,      # Logical Maximum (101)
+            0x75, 0x08,     # Report Size (8)
+            0x95, 0x06,     # Report Count (6)
+            0x81, 0x00,     # Input (Data, Array)
+            0x05, 0x08,     # Usage Page (LED)
+            0x19, 0x01,     # Usage Minimum (1)
+            0x29, 0x05,     # Usage Maximum (5)
+            0x15, 0x00,     # Logical Minimum (0)
+            0x25, 0x01,     # Logical Maximum (1)
+            0x75, 0x01,     # Report Size (1)
+            0x95, 0x05,     # Report Count (5)
+            0x91, 0x02,     # Output (Data, Variable, Absolute)
+            0x95, 0x03,     # Report Count (3)
+            0x91, 0x01,     # Output (Constant)
+            0xC0,           # End Collection
+        ]))
 
 # Use these report ids for all multi-report HID descriptors.
 
@@ -173,102 +204,272 @@ ReportDescriptor.REPORT_LENGTHS = {
     "SYS_CONTROL" : 1,
     }
 
-ReportDescriptor.MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT = ReportDescriptor(
-    description="MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT",
-    report_descriptor=bytes([
-        # Regular keyboard
-        0x05, 0x01,                 # Usage Page (Generic Desktop)
-        0x09, 0x06,                 # Usage (Keyboard)
-        0xA1, 0x01,                 # Collection (Application)
-        0x85, ReportDescriptor.REPORT_IDS["KEYBOARD"], #   Report ID (1)
-        0x05, 0x07,                 #   Usage Page (Keyboard)
-        0x19, 224,                  #   Usage Minimum (224)
-        0x29, 231,                  #   Usage Maximum (231)
-        0x15, 0x00,                 #   Logical Minimum (0)
-        0x25, 0x01,                 #   Logical Maximum (1)
-        0x75, 0x01,                 #   Report Size (1)
-        0x95, 0x08,                 #   Report Count (8)
-        0x81, 0x02,                 #   Input (Data, Variable, Absolute)
-        0x81, 0x01,                 #   Input (Constant)
-        0x19, 0x00,                 #   Usage Minimum (0)
-        0x29, 101,                  #   Usage Maximum (101)
-        0x15, 0x00,                 #   Logical Minimum (0)
-        0x25, 101,                  #   Logical Maximum (101)
-        0x75, 0x08,                 #   Report Size (8)
-        0x95, 0x06,                 #   Report Count (6)
-        0x81, 0x00,                 #   Input (Data, Array)
-        0x05, 0x08,                 #   Usage Page (LED)
-        0x19, 0x01,                 #   Usage Minimum (1)
-        0x29, 0x05,                 #   Usage Maximum (5)
-        0x15, 0x00,                 #   Logical Minimum (0)
-        0x25, 0x01,                 #   Logical Maximum (1)
-        0x75, 0x01,                 #   Report Size (1)
-        0x95, 0x05,                 #   Report Count (5)
-        0x91, 0x02,                 #   Output (Data, Variable, Absolute)
-        0x95, 0x03,                 #   Report Count (3)
-        0x91, 0x01,                 #   Output (Constant)
-        0xC0,                       # End Collection
-        # Regular mouse
-        0x05, 0x01,        # Usage Page (Generic Desktop)
-        0x09, 0x02,        # Usage (Mouse)
-        0xA1, 0x01,        # Collection (Application)
-        0x09, 0x01,        #   Usage (Pointer)
-        0xA1, 0x00,        #   Collection (Physical)
-        0x85, ReportDescriptor.REPORT_IDS["MOUSE"], # Report ID (n)
-        0x05, 0x09,        #     Usage Page (Button)
-        0x19, 0x01,        #     Usage Minimum (0x01)
-        0x29, 0x05,        #     Usage Maximum (0x05)
-        0x15, 0x00,        #     Logical Minimum (0)
-        0x25, 0x01,        #     Logical Maximum (1)
-        0x95, 0x05,        #     Report Count (5)
-        0x75, 0x01,        #     Report Size (1)
-        0x81, 0x02,        #     Input (Data,Var,Abs,No Wrap,Linear,Preferred State,No Null Position)
-        0x95, 0x01,        #     Report Count (1)
-        0x75, 0x03,        #     Report Size (3)
-        0x81, 0x01,        #     Input (Const,Array,Abs,No Wrap,Linear,Preferred State,No Null Position)
-        0x05, 0x01,        #     Usage Page (Generic Desktop Ctrls)
-        0x09, 0x30,        #     Usage (X)
-        0x09, 0x31,        #     Usage (Y)
-        0x15, 0x81,        #     Logical Minimum (-127)
-        0x25, 0x7F,        #     Logical Maximum (127)
-        0x75, 0x08,        #     Report Size (8)
-        0x95, 0x02,        #     Report Count (2)
-        0x81, 0x06,        #     Input (Data,Var,Rel,No Wrap,Linear,Preferred State,No Null Position)
-        0x09, 0x38,        #     Usage (Wheel)
-        0x15, 0x81,        #     Logical Minimum (-127)
-        0x25, 0x7F,        #     Logical Maximum (127)
-        0x75, 0x08,        #     Report Size (8)
-        0x95, 0x01,        #     Report Count (1)
-        0x81, 0x06,        #     Input (Data,Var,Rel,No Wrap,Linear,Preferred State,No Null Position)
-        0xC0,              #   End Collection
-        0xC0,              # End Collection
-        # Consumer ("multimedia") keys
-        0x05, 0x0C,        # Usage Page (Consumer)
-        0x09, 0x01,        # Usage (Consumer Control)
-        0xA1, 0x01,        # Collection (Application)
-        0x85, ReportDescriptor.REPORT_IDS["CONSUMER"], # Report ID (n)
-        0x75, 0x10,        #   Report Size (16)
-        0x95, 0x01,        #   Report Count (1)
-        0x15, 0x01,        #   Logical Minimum (1)
-        0x26, 0x8C, 0x02,  #   Logical Maximum (652)
-        0x19, 0x01,        #   Usage Minimum (Consumer Control)
-        0x2A, 0x8C, 0x02,  #   Usage Maximum (AC Send)
-        0x81, 0x00,        #   Input (Data,Array,Abs,No Wrap,Linear,Preferred State,No Null Position)
-        0xC0,              # End Collection
-        # Power controls
-        0x05, 0x01,        # Usage Page (Generic Desktop Ctrls)
-        0x09, 0x80,        # Usage (Sys Control)
-        0xA1, 0x01,        # Collection (Application)
-        0x85, ReportDescriptor.REPORT_IDS["SYS_CONTROL"], # Report ID (n)
-        0x75, 0x02,        #   Report Size (2)
-        0x95, 0x01,        #   Report Count (1)
-        0x15, 0x01,        #   Logical Minimum (1)
-        0x25, 0x03,        #   Logical Maximum (3)
-        0x09, 0x82,        #   Usage (Sys Sleep)
-        0x09, 0x81,        #   Usage (Sys Power Down)
-        0x09, 0x83,        #   Usage (Sys Wake Up)
-        0x81, 0x60,        #   Input (Data,Array,Abs,No Wrap,Linear,No Preferred State,Null State)
-        0x75, 0x06,        #   Report Size (6)
-        0x81, 0x03,        #   Input (Const,Var,Abs,No Wrap,Linear,Preferred State,No Null Position)
-        0xC0,              # End Collection
-    ]))
+
+def _mouse_keyboard_consumer_sys_control_report():
+    return ReportDescriptor(
+        description="MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT",
+        report_descriptor=bytes([
+            # Regular keyboard
+            0x05, 0x01,                 # Usage Page (Generic Desktop)
+            0x09, 0x06,                 # Usage (Keyboard)
+            0xA1, 0x01,                 # Collection (Application)
+            0x85, ReportDescriptor.REPORT_IDS["KEYBOARD"], #   Report ID (1)
+            0x05, 0x07,                 #   Usage Page (Keyboard)
+            0x19, 224,                  #   Usage Minimum (224)
+            0x29, 231,                  #   Usage Maximum (231)
+            0x15, 0x00,                 #   Logical Minimum (0)
+            0x25, 0x01,                 #   Logical Maximum (1)
+            0x75, 0x01,                 #   Report Size (1)
+            0x95, 0x08,                 #   Report Count (8)
+            0x81, 0x02,                 #   Input (Data, Variable, Absolute)
+            0x81, 0x01,                 #   Input (Constant)
+            0x19, 0x00,                 #   Usage Minimum (0)
+            0x29, 101,                  #   Usage Maximum (101)
+            0x15, 0x00,                 #   Logical Minimum (0)
+            0x25, 101,                  #   Logical Maximum (101)
+            0x75, 0x08,                 #   Report Size (8)
+            0x95, 0x06,                 #   Report Count (6)
+            0x81, 0x00,                 #   Input (Data, Array)
+            0x05, 0x08,                 #   Usage Page (LED)
+            0x19, 0x01,                 #   Usage Minimum (1)
+            0x29, 0x05,                 #   Usage Maximum (5)
+            0x15, 0x00,                 #   Logical Minimum (0)
+            0x25, 0x01,                 #   Logical Maximum (1)
+            0x75, 0x01,                 #   Report Size (1)
+            0x95, 0x05,                 #   Report Count (5)
+            0x91, 0x02,                 #   Output (Data, Variable, Absolute)
+            0x95, 0x03,                 #   Report Count (3)
+            0x91, 0x01,                 #   Output (Constant)
+            0xC0,                       # End Collection
+            # Regular mouse
+            0x05, 0x01,        # Usage Page (Generic Desktop)
+            0x09, 0x02,        # Usage (Mouse)
+            0xA1, 0x01,        # Collection (Application)
+            0x09, 0x01,        #   Usage (Pointer)
+            0xA1, 0x00,        #   Collection (Physical)
+            0x85, ReportDescriptor.REPORT_IDS["MOUSE"], # Report ID (n)
+            0x05, 0x09,        #     Usage Page (Button)
+            0x19, 0x01,        #     Usage Minimum (0x01)
+            0x29, 0x05,        #     Usage Maximum (0x05)
+            0x15, 0x00,        #     Logical Minimum (0)
+            0x25, 0x01,        #     Logical Maximum (1)
+            0x95, 0x05,        #     Report Count (5)
+            0x75, 0x01,        #     Report Size (1)
+            0x81, 0x02,        #     Input (Data,Var,Abs,No Wrap,Linear,Preferred State,No Null Position)
+            0x95, 0x01,        #     Report Count (1)
+            0x75, 0x03,        #     Report Size (3)
+            0x81, 0x01,        #     Input (Const,Array,Abs,No Wrap,Linear,Preferred State,No Null Position)
+            0x05, 0x01,        #     Usage Page (Generic Desktop Ctrls)
+            0x09, 0x30,        #     Usage (X)
+            0x09, 0x31,        #     Usage (Y)
+            0x15, 0x81,        #     Logical Minimum (-127)
+            0x25, 0x7F,        #     Logical Maximum (127)
+            0x75, 0x08,        #     Report Size (8)
+            0x95, 0x02,        #     Report Count (2)
+            0x81, 0x06,        #     Input (Data,Var,Rel,No Wrap,Linear,Preferred State,No Null Position)
+            0x09, 0x38,        #     Usage (Wheel)
+            0x15, 0x81,        #     Logical Minimum (-127)
+            0x25, 0x7F,        #     Logical Maximum (127)
+            0x75, 0x08,        #     Report Size (8)
+            0x95, 0x01,        #     Report Count (1)
+            0x81, 0x06,        #     Input (Data,Var,Rel,No Wrap,Linear,Preferred State,No Null Position)
+            0xC0,              #   End Collection
+            0xC0,              # End Collection
+            # Consumer ("multimedia") keys
+            0x05, 0x0C,        # Usage Page (Consumer)
+            0x09, 0x01,        # Usage (Consumer Control)
+            0xA1, 0x01,        # Collection (Application)
+            0x85, ReportDescriptor.REPORT_IDS["CONSUMER"], # Report ID (n)
+            0x75, 0x10,        #   Report Size (16)
+            0x95, 0x01,        #   Report Count (1)
+            0x15, 0x01,        #   Logical Minimum (1)
+            0x26, 0x8C, 0x02,  #   Logical Maximum (652)
+            0x19, 0x01,        #   Usage Minimum (Consumer Control)
+            0x2A, 0x8C, 0x02,  #   Usage Maximum (AC Send)
+            0x81, 0x00,        #   Input (Data,Array,Abs,No Wrap,Linear,Preferred State,No Null Position)
+            0xC0,              # End Collection
+            # Power controls
+            0x05, 0x01,        # Usage Page (Generic Desktop Ctrls)
+            0x09, 0x80,        # Usage (Sys Control)
+            0xA1, 0x01,        # Collection (Application)
+            0x85, ReportDescriptor.REPORT_IDS["SYS_CONTROL"], # Report ID (n)
+            0x75, 0x02,        #   Report Size (2)
+            0x95, 0x01,        #   Report Count (1)
+            0x15, 0x01,        #   Logical Minimum (1)
+            0x25, 0x03,        #   Logical Maximum (3)
+            0x09, 0x82,        #   Usage (Sys Sleep)
+            0x09, 0x81,        #   Usage (Sys Power Down)
+            0x09, 0x83,        #   Usage (Sys Wake Up)
+            0x81, 0x60,        #   Input (Data,Array,Abs,No Wrap,Linear,No Preferred State,Null State)
+            0x75, 0x06,        #   Report Size (6)
+            0x81, 0x03,        #   Input (Const,Var,Abs,No Wrap,Linear,Preferred State,No Null Position)
+            0xC0,              # End Collection
+        ]))
+
+
+for _name, _build in (("GENERIC_MOUSE_REPORT", _generic_mouse_report),
+                      ("GENERIC_KEYBOARD_REPORT", _generic_keyboard_report),
+                      ("MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT",
+                       _mouse_keyboard_consumer_sys_control_report)):
+    _report = _BuiltInReport(_build)
+    # Assigned after the class body, so Python doesn't call __set_name__ itself.
+    setattr(ReportDescriptor, _name, _report)
+    _report.__set_name__(ReportDescriptor, _name)
+del _name, _build, _report
+
+# Main item kinds.
+INPUT = 0x80
+OUTPUT = 0x90
+FEATURE = 0xB0
+
+# Input, Output and Feature item flags.
+FLAG_CONSTANT = 0x01
+FLAG_VARIABLE = 0x02
+
+# One Input, Output or Feature item. Fields start ``bit_offset`` bits into the
+# report after its report ID byte, if any. ``usages`` are ``(usage_page, usage)``.
+ReportField = collections.namedtuple("ReportField", (
+    "report_id", "kind", "flags", "bit_offset", "report_size", "report_count",
+    "logical_minimum", "logical_maximum", "usages"))
+
+_item_sizes = (0, 1, 2, 4)
+
+def _items(report_descriptor):
+    """Yields ``(tag, size, value)`` for the short items in ``report_descriptor``. The
+       tag includes the item type. Long items are skipped."""
+    offset = 0
+    end = len(report_descriptor)
+    while offset < end:
+        prefix = report_descriptor[offset]
+        if prefix == 0xFE:
+            if offset + 2 >= end:
+                raise ValueError("Truncated long item at offset {}".format(offset))
+            offset += 3 + report_descriptor[offset + 1]
+            continue
+        size = _item_sizes[prefix & 0x03]
+        if offset + 1 + size > end:
+            raise ValueError("Truncated item at offset {}".format(offset))
+        value = int.from_bytes(report_descriptor[offset + 1:offset + 1 + size], "little")
+        yield prefix & 0xFC, size, value
+        offset += 1 + size
+
+def _signed(value, bits):
+    if bits and value & (1 << (bits - 1)):
+        return value - (1 << bits)
+    return value
+
+def report_fields(report_descriptor):
+    """Returns the `ReportField` s of every Input, Output and Feature item in
+       ``report_descriptor``, in order. Raises ValueError when it is truncated."""
+    fields = []
+    # ``(size, value)`` of each global item by tag.
+    state = {}
+    stack = []
+    usages = []
+    usage_minimum = None
+    bit_offsets = {}
+    for tag, size, value in _items(report_descriptor):
+        if tag in (INPUT, OUTPUT, FEATURE):
+            report_id = state.get(0x84, (0, 0))[1]
+            report_size = state.get(0x74, (0, 0))[1]
+            report_count = state.get(0x94, (0, 0))[1]
+            minimum_size, minimum = state.get(0x14, (0, 0))
+            maximum_size, maximum = state.get(0x24, (0, 0))
+            minimum = _signed(minimum, 8 * minimum_size)
+            # Unsigned maximums, such as 255 in one byte, are common.
+            if _signed(maximum, 8 * maximum_size) >= minimum:
+                maximum = _signed(maximum, 8 * maximum_size)
+            offset = bit_offsets.get((report_id, tag), 0)
+            fields.append(ReportField(report_id, tag, value, offset, report_size, report_count,
+                                      minimum, maximum, tuple(usages)))
+            bit_offsets[(report_id, tag)] = offset + report_size * report_count
+            usages = []
+        elif tag in (0xA0, 0xC0):
+            # Collections use up the local items.
+            usages = []
+        elif tag == 0xA4:
+            stack.append(dict(state))
+        elif tag == 0xB4:
+            if not stack:
+                raise ValueError("Pop without Push")
+            state = stack.pop()
+        elif tag & 0x0C == 0x04:
+            state[tag] = (size, value)
+        elif tag in (0x08, 0x18, 0x28):
+            # Four byte usages include their page.
+            if size == 4:
+                page, usage = value >> 16, value & 0xFFFF
+            else:
+                page, usage = state.get(0x04, (0, 0))[1], value
+            if tag == 0x08:
+                usages.append((page, usage))
+            elif tag == 0x18:
+                usage_minimum = usage
+            elif usage_minimum is not None:
+                usages.extend((page, u) for u in range(usage_minimum, usage + 1))
+                usage_minimum = None
+    return fields
+
+class ReportDecoder:
+    """Decodes the ``kind`` reports, such as `INPUT`, described by
+       ``report_descriptor`` into the values of their usages."""
+
+    def __init__(self, report_descriptor, kind=INPUT):
+        self.fields = {}
+        self.lengths = {}
+        # ``(shift, mask, sign_bit, usage, field)`` of each value by report ID.
+        # ``usage`` is None for array fields, whose value selects a usage.
+        self._slots = {}
+        for field in report_fields(bytes(report_descriptor)):
+            if field.kind != kind:
+                continue
+            self.fields.setdefault(field.report_id, []).append(field)
+            slots = self._slots.setdefault(field.report_id, [])
+            end = field.bit_offset + field.report_size * field.report_count
+            self.lengths[field.report_id] = max(self.lengths.get(field.report_id, 0),
+                                                (end + 7) // 8)
+            if field.flags & FLAG_CONSTANT or not field.report_size:
+                continue
+            variable = field.flags & FLAG_VARIABLE
+            if variable and not field.usages:
+                continue
+            mask = (1 << field.report_size) - 1
+            sign_bit = 1 << (field.report_size - 1) if field.logical_minimum < 0 else 0
+            for i in range(field.report_count):
+                usage = field.usages[min(i, len(field.usages) - 1)] if variable else None
+                slots.append((field.bit_offset + i * field.report_size, mask, sign_bit, usage,
+                              field))
+        self.numbered = any(self.fields)
+
+    def decode(self, report):
+        """Returns ``(report_id, values)`` for ``report``, where ``values`` maps each
+           ``(usage_page, usage)`` to its value. Array fields map the usages that are
+           present to 1. Raises ValueError for unknown IDs and short reports."""
+        report = bytes(report)
+        report_id = 0
+        if self.numbered:
+            if not report:
+                raise ValueError("Empty report")
+            report_id = report[0]
+            report = report[1:]
+        slots = self._slots.get(report_id)
+        if slots is None:
+            raise ValueError("Unknown report ID {}".format(report_id))
+        if len(report) < self.lengths[report_id]:
+            raise ValueError("Report {} is {} bytes, not {}".format(
+                report_id, len(report), self.lengths[report_id]))
+        bits = int.from_bytes(report, "little")
+        values = {}
+        for shift, mask, sign_bit, usage, field in slots:
+            value = (bits >> shift) & mask
+            if value & sign_bit:
+                value -= mask + 1
+            if usage is not None:
+                values[usage] = value
+                continue
+            # Values outside the logical range and usage 0 mean no usage.
+            index = value - field.logical_minimum
+            if (0 <= index < len(field.usages) and value <= field.logical_maximum
+                    and field.usages[index][1]):
+                values[field.usages[index]] = 1
+        return report_id, values
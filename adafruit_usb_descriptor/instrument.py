@@ -0,0 +1,232 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import contextlib
+import importlib
+import json
+import time
+
+from . import util
+
+"""
+Instrumentation
+===============
+
+Counts calls, bytes produced and time spent in every descriptor class's
+``__bytes__``, in `util.join_interfaces` and in builder stages marked with
+`stage`.
+
+Nothing is patched until `enable` is called, so there's no cost while it's off,
+and `disable` puts the original functions back. `measure` scopes the counts to a
+block, such as the build of one variant. `Counters` convert to a dict or JSON and
+merge, so counts from process pool workers can be added up. Recording isn't
+thread safe.
+"""
+
+# Modules whose descriptor classes are instrumented.
+MODULES = ("standard", "cdc", "hid", "midi", "audio", "audio10", "msc", "msos")
+
+_originals = {}
+# Counters being recorded into, innermost last.
+_active = []
+# Time spent in instrumented calls nested in each call in progress.
+_nested_seconds = []
+_null_stage = contextlib.nullcontext()
+
+
+class Counters:
+    """Calls, bytes, inclusive seconds and self seconds by name.
+
+       Names are ``"<module>.<class>.__bytes__"``, ``"util.join_interfaces"`` and
+       ``"stage:<name>"``. Self seconds exclude the instrumented calls made inside.
+    """
+
+    def __init__(self):
+        self.counts = {}
+
+    def record(self, name, *, calls=1, nbytes=0, seconds=0.0, self_seconds=0.0):
+        entry = self.counts.get(name)
+        if entry is None:
+            entry = self.counts[name] = [0, 0, 0.0, 0.0]
+        entry[0] += calls
+        entry[1] += nbytes
+        entry[2] += seconds
+        entry[3] += self_seconds
+
+    def as_dict(self):
+        return {name: {"calls": calls, "bytes": nbytes, "seconds": seconds,
+                       "self_seconds": self_seconds}
+                for name, (calls, nbytes, seconds, self_seconds) in self.counts.items()}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), sort_keys=True, **kwargs)
+
+    @classmethod
+    def from_dict(cls, counts):
+        counters = cls()
+        counters.merge(counts)
+        return counters
+
+    def merge(self, other):
+        """Adds ``other``, `Counters` or the dict from `as_dict`, into these. Returns
+           self."""
+        if isinstance(other, Counters):
+            other = other.as_dict()
+        for name, entry in other.items():
+            self.record(name, calls=entry["calls"], nbytes=entry["bytes"],
+                        seconds=entry["seconds"], self_seconds=entry["self_seconds"])
+        return self
+
+    def reset(self):
+        self.counts.clear()
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, name):
+        return name in self.counts
+
+    def __getitem__(self, name):
+        return self.as_dict()[name]
+
+
+counters = Counters()
+"""Where counts go outside of `measure`."""
+
+
+def _timed(name, function, *args, **kwargs):
+    _nested_seconds.append(0.0)
+    start = time.perf_counter()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        nested = _nested_seconds.pop()
+        if _nested_seconds:
+            _nested_seconds[-1] += seconds
+    nbytes = len(result) if isinstance(result, (bytes, bytearray)) else 0
+    target = _active[-1] if _active else counters
+    target.record(name, nbytes=nbytes, seconds=seconds, self_seconds=seconds - nested)
+    return result
+
+
+def _instrument_bytes(cls, name):
+    original = cls.__dict__["__bytes__"]
+
+    def __bytes__(self):
+        return _timed(name, original, self)
+    return original, __bytes__
+
+
+def _instrument_join(original):
+    def join_interfaces(*args, **kwargs):
+        return _timed("util.join_interfaces", original, *args, **kwargs)
+    join_interfaces.__doc__ = original.__doc__
+    return join_interfaces
+
+
+def enabled():
+    return bool(_originals)
+
+
+def enable():
+    """Starts counting. Does nothing if it's already on."""
+    if _originals:
+        return
+    for module_name in MODULES:
+        module = importlib.import_module("." + module_name, __package__)
+        for value in vars(module).values():
+            if (isinstance(value, type) and value.__module__ == module.__name__
+                    and "__bytes__" in value.__dict__):
+                name = "{}.{}.__bytes__".format(module_name, value.__qualname__)
+                original, wrapper = _instrument_bytes(value, name)
+                _originals[(value, "__bytes__")] = original
+                setattr(value, "__bytes__", wrapper)
+    _originals[(util, "join_interfaces")] = util.join_interfaces
+    util.join_interfaces = _instrument_join(util.join_interfaces)
+
+
+def disable():
+    """Stops counting and restores the original functions."""
+    while _originals:
+        (owner, name), original = _originals.popitem()
+        setattr(owner, name, original)
+
+
+class _Stage:
+    def __init__(self, name):
+        self.name = "stage:" + name
+
+    def __enter__(self):
+        _nested_seconds.append(0.0)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        nested = _nested_seconds.pop()
+        if _nested_seconds:
+            _nested_seconds[-1] += seconds
+        target = _active[-1] if _active else counters
+        target.record(self.name, seconds=seconds, self_seconds=seconds - nested)
+        return False
+
+
+def stage(name):
+    """Returns a context manager that times a builder stage, such as ``"hid"`` or
+       ``"emit"``, while counting is on. When it's off, it returns a shared context
+       manager that does nothing."""
+    if not _originals:
+        return _null_stage
+    return _Stage(name)
+
+
+@contextlib.contextmanager
+def measure():
+    """Counts what happens inside the ``with`` block into new `Counters` and yields
+       them. Counting is turned on for the block if it's off. When the block ends, its
+       counts are added to the enclosing `measure` or the module's `counters`."""
+    was_enabled = enabled()
+    enable()
+    scoped = Counters()
+    _active.append(scoped)
+    try:
+        yield scoped
+    finally:
+        _active.pop()
+        (_active[-1] if _active else counters).merge(scoped)
+        if not was_enabled:
+            disable()
+
+
+class Instrumented:
+    """Wraps a `batch` builder so it returns ``(value, counts)``, where ``counts`` is
+       the `Counters.as_dict` of its build. It pickles when the builder does, so
+       process pool workers can send their counts back to be merged."""
+
+    def __init__(self, builder):
+        self.builder = builder
+
+    def __call__(self, variant):
+        with measure() as scoped:
+            value = self.builder(variant)
+        return value, scoped.as_dict()
@@ -23,6 +23,7 @@
 import struct
 
 from . import standard
+from . import util
 
 """
 Audio specific descriptors
@@ -44,14 +45,11 @@ class Header:
     fmt = "<BBB" + "HH"
     bLength = struct.calcsize(fmt)
 
-    def __init__(self, *, jacks_and_elements=[]):
-        self.jacks_and_elements = jacks_and_elements
+    def __init__(self, *, jacks_and_elements=None):
+        self.jacks_and_elements = jacks_and_elements if jacks_and_elements is not None else []
 
     def notes(self):
-        notes = [str(self)]
-        for jack in self.jacks_and_elements:
-            notes.extend(jack.notes())
-        return notes
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         for i, element in enumerate(self.jacks_and_elements):
@@ -69,7 +67,11 @@ class Header:
 class InJackDescriptor:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
     bDescriptorSubtype = 0x02
+    # Assigned by the parent midi.Header during serialization.
+    derived_fields = ("id",)
     fmt = "<BBB" + "BBB"
+    fields = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bJackType", "id",
+              "iJack")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -82,7 +84,7 @@ class InJackDescriptor:
         self.iJack = iJack
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -96,26 +98,28 @@ class InJackDescriptor:
 class OutJackDescriptor:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE
     bDescriptorSubtype = 0x03
+    # Assigned by the parent midi.Header during serialization.
+    derived_fields = ("id",)
     fixed_fmt = "<BBB" + "BBB"     # not including pin list
     fixed_bLength = struct.calcsize(fixed_fmt)
 
     def __init__(self, *,
                  description,
                  bJackType,
-                 input_pins=[],
+                 input_pins=None,
                  iJack=0):
         self.description = description
         self.id = 0 # auto assigned by the parent midi.Header
         self.bJackType = bJackType
         self.iJack = iJack
-        self.input_pins = input_pins
+        self.input_pins = input_pins if input_pins is not None else []
 
     @property
     def bLength(self):
         return self.fixed_bLength + len(self.input_pins) * 2 + 1
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         input_pins = bytearray(len(self.input_pins) * 2)
@@ -136,7 +140,7 @@ class ElementDescriptor:
     bDescriptorSubtype = 0x04
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
 class DataEndpointDescriptor:
     bDescriptorType = standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_ENDPOINT
@@ -145,15 +149,15 @@ class DataEndpointDescriptor:
     fixed_bLength = struct.calcsize(fixed_fmt)
 
     def __init__(self, *,
-                 baAssocJack=[]):
-        self.baAssocJack = baAssocJack
+                 baAssocJack=None):
+        self.baAssocJack = baAssocJack if baAssocJack is not None else []
 
     @property
     def bLength(self):
         return self.fixed_bLength + len(self.baAssocJack)
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         baAssocJack = bytes([x.id for x in self.baAssocJack])
@@ -162,3 +166,75 @@ class DataEndpointDescriptor:
                            self.bDescriptorType,
                            self.bDescriptorSubtype,
                            len(self.baAssocJack)) + baAssocJack
+
+# Number of MIDI bytes in a USB-MIDI event packet with each Code Index Number.
+# 0x0 and 0x1 are reserved. All zero packets are padding.
+CODE_INDEX_LENGTHS = (0, 0, 2, 3, 3, 1, 2, 3, 3, 3, 3, 3, 2, 2, 3, 1)
+CODE_INDEX_SYSEX = 0x4
+CODE_INDEX_SINGLE_BYTE = 0xF
+
+# Code Index Number of each system message that isn't SysEx.
+_system_code_indexes = {0xF1: 0x2, 0xF2: 0x3, 0xF3: 0x2, 0xF6: 0x5}
+
+def _event_packets(message):
+    """Returns the ``(code_index, midi_bytes)`` event packets that carry ``message``."""
+    status = message[0]
+    if status == 0xF0:
+        # An unterminated SysEx would end in a short packet that claims to continue.
+        if message[-1] != 0xF7 or max(message[1:-1], default=0) >= 0x80:
+            raise ValueError("SysEx {} isn't terminated by 0xF7".format(bytes(message).hex()))
+        packets = []
+        for start in range(0, len(message), 3):
+            chunk = message[start:start + 3]
+            if chunk[-1] == 0xF7:
+                packets.append((0x4 + len(chunk), chunk))
+            else:
+                packets.append((CODE_INDEX_SYSEX, chunk))
+        return packets
+    if status < 0xF0:
+        code_index = status >> 4
+    else:
+        code_index = _system_code_indexes.get(status, CODE_INDEX_SINGLE_BYTE)
+    if status < 0x80 or len(message) != CODE_INDEX_LENGTHS[code_index]:
+        raise ValueError("Malformed MIDI message {}".format(bytes(message).hex()))
+    return [(code_index, message)]
+
+def pack_event_packets(buffer, messages, *, cable_number=0):
+    """Packs as many leading MIDI ``messages`` (complete messages as bytes-like
+       objects, SysEx included) as fit into ``buffer`` as USB-MIDI event packets.
+
+       Returns ``(length, count)``, where ``count`` is the number of leading
+       ``messages`` packed. Raises ValueError for a malformed message, including a
+       SysEx that doesn't end with 0xF7.
+    """
+    buffer = memoryview(buffer)
+    offset = 0
+    count = 0
+    for message in messages:
+        packets = _event_packets(message)
+        if offset + 4 * len(packets) > len(buffer):
+            break
+        for code_index, chunk in packets:
+            buffer[offset] = (cable_number << 4) | code_index
+            buffer[offset + 1:offset + 1 + len(chunk)] = chunk
+            buffer[offset + 1 + len(chunk):offset + 4] = bytes(3 - len(chunk))
+            offset += 4
+        count += 1
+    return offset, count
+
+def unpack_event_packets(buffer):
+    """Yields ``(cable_number, code_index, midi_bytes)`` for every USB-MIDI event
+       packet in ``buffer``, with ``midi_bytes`` a `memoryview` of the MIDI bytes it
+       carries. Padding and reserved packets are skipped.
+
+       Raises ValueError when ``buffer`` isn't a whole number of packets.
+    """
+    buffer = memoryview(buffer)
+    if len(buffer) % 4:
+        raise ValueError("USB-MIDI data of {} bytes isn't whole packets".format(len(buffer)))
+    lengths = CODE_INDEX_LENGTHS
+    for offset in range(0, len(buffer), 4):
+        header = buffer[offset]
+        length = lengths[header & 0x0F]
+        if length:
+            yield header >> 4, header & 0x0F, buffer[offset + 1:offset + 1 + length]
@@ -22,10 +22,15 @@
 
 import struct
 
+from . import standard
+
 """
 MSC specific descriptors
 ========================
 
+The Bulk-Only Transport (BOT) wrappers are described in:
+    https://www.usb.org/sites/default/files/usbmassbulk_10.pdf
+
 * Author(s): Dan Halbert
 """
 
@@ -35,3 +40,272 @@ MSC_SUBCLASS_TRANSPARENT = 0x06
 # Many other subclasses omitted.
 
 MSC_PROTOCOL_BULK = 0x50
+
+CBW_SIGNATURE = 0x43425355
+CSW_SIGNATURE = 0x53425355
+
+CSW_STATUS_PASSED = 0x00
+CSW_STATUS_FAILED = 0x01
+CSW_STATUS_PHASE_ERROR = 0x02
+
+SCSI_TEST_UNIT_READY = 0x00
+SCSI_REQUEST_SENSE = 0x03
+SCSI_INQUIRY = 0x12
+SCSI_READ_CAPACITY_10 = 0x25
+SCSI_READ_10 = 0x28
+SCSI_WRITE_10 = 0x2A
+# Many other commands omitted.
+
+INQUIRY_LENGTH = 36
+READ_CAPACITY_10_LENGTH = 8
+
+
+def mass_storage_interfaces(*,
+                            description="MSC",
+                            speed=standard.SPEED_FULL,
+                            iInterface=0,
+                            max_burst=0):
+    """Returns a list with a single Bulk-Only Transport interface for `util.join_interfaces`.
+
+       The bulk endpoints use the largest packet size allowed at bus ``speed``. At
+       SuperSpeed they also get a companion descriptor with ``max_burst``.
+    """
+    wMaxPacketSize = standard.EndpointDescriptor.max_packet_size(
+        standard.EndpointDescriptor.TYPE_BULK, speed)
+    endpoints = []
+    for direction, name in ((standard.EndpointDescriptor.DIRECTION_IN, "in"),
+                            (standard.EndpointDescriptor.DIRECTION_OUT, "out")):
+        endpoint = standard.EndpointDescriptor(
+            description="{} {}".format(description, name),
+            bEndpointAddress=0x0 | direction,
+            bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+            wMaxPacketSize=wMaxPacketSize,
+            bInterval=0)
+        if speed == standard.SPEED_SUPER:
+            endpoint.companion = standard.SuperSpeedEndpointCompanionDescriptor(
+                description="{} {} companion".format(description, name),
+                bMaxBurst=max_burst)
+        endpoints.append(endpoint)
+    return [
+        standard.InterfaceDescriptor(
+            description=description,
+            bInterfaceClass=MSC_CLASS,
+            bInterfaceSubClass=MSC_SUBCLASS_TRANSPARENT,
+            bInterfaceProtocol=MSC_PROTOCOL_BULK,
+            iInterface=iInterface,
+            subdescriptors=endpoints)
+    ]
+
+
+class CommandBlockWrapper:
+    """Command Block Wrapper (CBW) held in place in ``buffer``.
+
+       Fields are read and written straight from the buffer so one wrapper can be
+       reused for every command without allocating new buffers. ``CBWCB`` is a
+       `memoryview` of the 16 byte command block.
+    """
+    fmt = "<IIIBBB16s"
+    size = struct.calcsize(fmt)
+
+    DIRECTION_IN = 0x80
+    DIRECTION_OUT = 0x00
+
+    _header = struct.Struct("<IIIBBB")
+    _u32 = struct.Struct("<I")
+    _rw10 = struct.Struct(">BBIBHB6x")
+    _rw10_fields = struct.Struct(">2xI1xH")
+    _inquiry = struct.Struct(">BBBHB10x")
+    _short = struct.Struct(">B15x")
+
+    def __init__(self, buffer=None):
+        if buffer is None:
+            buffer = bytearray(self.size)
+        self.buffer = memoryview(buffer)
+        if len(self.buffer) < self.size:
+            raise ValueError("CBW buffer must be at least {} bytes".format(self.size))
+        self.CBWCB = self.buffer[15:31]
+
+    @property
+    def dCBWSignature(self):
+        return self._u32.unpack_from(self.buffer, 0)[0]
+
+    @property
+    def dCBWTag(self):
+        return self._u32.unpack_from(self.buffer, 4)[0]
+
+    @property
+    def dCBWDataTransferLength(self):
+        return self._u32.unpack_from(self.buffer, 8)[0]
+
+    @property
+    def bmCBWFlags(self):
+        return self.buffer[12]
+
+    @property
+    def bCBWLUN(self):
+        return self.buffer[13] & 0x0F
+
+    @property
+    def bCBWCBLength(self):
+        return self.buffer[14] & 0x1F
+
+    @property
+    def operation_code(self):
+        return self.CBWCB[0]
+
+    def validate(self, length=size):
+        """Raises ValueError unless ``length`` bytes received into the buffer are a
+           valid and meaningful CBW."""
+        if length != self.size:
+            raise ValueError("CBW must be {} bytes, not {}".format(self.size, length))
+        if self.dCBWSignature != CBW_SIGNATURE:
+            raise ValueError("Bad CBW signature 0x{:08x}".format(self.dCBWSignature))
+        if not 1 <= self.bCBWCBLength <= 16:
+            raise ValueError("Bad CBW command block length {}".format(self.bCBWCBLength))
+
+    def pack(self, *,
+             dCBWTag,
+             dCBWDataTransferLength=0,
+             bmCBWFlags=DIRECTION_OUT,
+             bCBWLUN=0,
+             bCBWCBLength):
+        """Writes the header fields. The command block itself is written to ``CBWCB``."""
+        self._header.pack_into(self.buffer, 0,
+                               CBW_SIGNATURE,
+                               dCBWTag,
+                               dCBWDataTransferLength,
+                               bmCBWFlags,
+                               bCBWLUN,
+                               bCBWCBLength)
+
+    def pack_read10(self, *, dCBWTag, lba, blocks, block_size=512, bCBWLUN=0):
+        self.pack(dCBWTag=dCBWTag,
+                  dCBWDataTransferLength=blocks * block_size,
+                  bmCBWFlags=self.DIRECTION_IN,
+                  bCBWLUN=bCBWLUN,
+                  bCBWCBLength=10)
+        self._rw10.pack_into(self.buffer, 15, SCSI_READ_10, 0, lba, 0, blocks, 0)
+
+    def pack_write10(self, *, dCBWTag, lba, blocks, block_size=512, bCBWLUN=0):
+        self.pack(dCBWTag=dCBWTag,
+                  dCBWDataTransferLength=blocks * block_size,
+                  bmCBWFlags=self.DIRECTION_OUT,
+                  bCBWLUN=bCBWLUN,
+                  bCBWCBLength=10)
+        self._rw10.pack_into(self.buffer, 15, SCSI_WRITE_10, 0, lba, 0, blocks, 0)
+
+    def pack_inquiry(self, *, dCBWTag, allocation_length=36, bCBWLUN=0):
+        self.pack(dCBWTag=dCBWTag,
+                  dCBWDataTransferLength=allocation_length,
+                  bmCBWFlags=self.DIRECTION_IN,
+                  bCBWLUN=bCBWLUN,
+                  bCBWCBLength=6)
+        self._inquiry.pack_into(self.buffer, 15, SCSI_INQUIRY, 0, 0, allocation_length, 0)
+
+    def pack_read_capacity10(self, *, dCBWTag, bCBWLUN=0):
+        self.pack(dCBWTag=dCBWTag,
+                  dCBWDataTransferLength=READ_CAPACITY_10_LENGTH,
+                  bmCBWFlags=self.DIRECTION_IN,
+                  bCBWLUN=bCBWLUN,
+                  bCBWCBLength=10)
+        self._short.pack_into(self.buffer, 15, SCSI_READ_CAPACITY_10)
+
+    def pack_test_unit_ready(self, *, dCBWTag, bCBWLUN=0):
+        self.pack(dCBWTag=dCBWTag, bCBWLUN=bCBWLUN, bCBWCBLength=6)
+        self._short.pack_into(self.buffer, 15, SCSI_TEST_UNIT_READY)
+
+    def read_write10(self):
+        """Returns ``(lba, blocks)`` of a READ(10) or WRITE(10) command block."""
+        return self._rw10_fields.unpack_from(self.buffer, 15)
+
+    def inquiry_allocation_length(self):
+        return struct.unpack_from(">H", self.buffer, 18)[0]
+
+
+class CommandStatusWrapper:
+    """Command Status Wrapper (CSW) held in place in ``buffer``."""
+    fmt = "<IIIB"
+    size = struct.calcsize(fmt)
+
+    _struct = struct.Struct(fmt)
+
+    def __init__(self, buffer=None):
+        if buffer is None:
+            buffer = bytearray(self.size)
+        self.buffer = memoryview(buffer)
+        if len(self.buffer) < self.size:
+            raise ValueError("CSW buffer must be at least {} bytes".format(self.size))
+
+    @property
+    def dCSWSignature(self):
+        return self._struct.unpack_from(self.buffer)[0]
+
+    @property
+    def dCSWTag(self):
+        return self._struct.unpack_from(self.buffer)[1]
+
+    @property
+    def dCSWDataResidue(self):
+        return self._struct.unpack_from(self.buffer)[2]
+
+    @property
+    def bCSWStatus(self):
+        return self.buffer[12]
+
+    def validate(self, length=size, *, dCBWTag=None):
+        """Raises ValueError unless the CSW is valid and, when given, answers ``dCBWTag``."""
+        if length != self.size:
+            raise ValueError("CSW must be {} bytes, not {}".format(self.size, length))
+        signature, tag, _, status = self._struct.unpack_from(self.buffer)
+        if signature != CSW_SIGNATURE:
+            raise ValueError("Bad CSW signature 0x{:08x}".format(signature))
+        if dCBWTag is not None and tag != dCBWTag:
+            raise ValueError("CSW tag 0x{:08x} doesn't match CBW tag 0x{:08x}".format(tag, dCBWTag))
+        if status > CSW_STATUS_PHASE_ERROR:
+            raise ValueError("Bad CSW status {}".format(status))
+
+    def pack(self, *, dCSWTag, dCSWDataResidue=0, bCSWStatus=CSW_STATUS_PASSED):
+        self._struct.pack_into(self.buffer, 0, CSW_SIGNATURE, dCSWTag, dCSWDataResidue, bCSWStatus)
+
+    def pack_reply(self, cbw, *, transferred, bCSWStatus=CSW_STATUS_PASSED):
+        """Answers ``cbw`` after ``transferred`` bytes of its data stage were moved.
+
+           Moving more than the host asked for (cases 7 and 13 of the Bulk-Only
+           Transport spec) is reported as a phase error with no residue.
+        """
+        residue = cbw.dCBWDataTransferLength - transferred
+        if residue < 0:
+            residue = 0
+            bCSWStatus = CSW_STATUS_PHASE_ERROR
+        self.pack(dCSWTag=cbw.dCBWTag,
+                  dCSWDataResidue=residue,
+                  bCSWStatus=bCSWStatus)
+
+
+_inquiry_response = struct.Struct(">BBBBB3x8s16s4s")
+_read_capacity_10_response = struct.Struct(">II")
+
+
+def pack_inquiry_response(buffer, *, vendor, product, revision, removable=True, offset=0):
+    """Writes standard INQUIRY data for a direct access block device into ``buffer``.
+
+       ``vendor``, ``product`` and ``revision`` are space padded ASCII bytes.
+    """
+    _inquiry_response.pack_into(buffer, offset,
+                                0x00,
+                                0x80 if removable else 0x00,
+                                0x02,  # Version: SCSI-2, as most USB devices report
+                                0x02,  # Response data format
+                                INQUIRY_LENGTH - 5,
+                                vendor.ljust(8),
+                                product.ljust(16),
+                                revision.ljust(4))
+
+
+def pack_read_capacity10_response(buffer, *, last_lba, block_size=512, offset=0):
+    _read_capacity_10_response.pack_into(buffer, offset, last_lba, block_size)
+
+
+def unpack_read_capacity10_response(buffer, offset=0):
+    """Returns ``(last_lba, block_size)``."""
+    return _read_capacity_10_response.unpack_from(buffer, offset)
@@ -0,0 +1,333 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import struct
+import uuid
+
+from . import standard
+from . import util
+
+"""
+Microsoft OS 2.0 descriptors
+============================
+
+The descriptor set Windows 8.1 and later request to load drivers, such as WinUSB
+for a vendor specific interface, without an INF file. Its location is advertised
+by a `PlatformCapability` in the BOS descriptor, and the host reads it with a
+vendor request using that capability's ``bMS_VendorCode`` and a ``wIndex`` of
+`MS_OS_20_DESCRIPTOR_INDEX`.
+
+Lengths are filled in during serialization. A `FunctionSubset` refers to the
+first `standard.InterfaceDescriptor` of its function, so its ``bFirstInterface``
+is whatever that interface is numbered by `util.join_interfaces`.
+
+Microsoft's "Microsoft OS 2.0 Descriptors Specification" is the reference.
+"""
+
+MS_OS_20_SET_HEADER_DESCRIPTOR = 0x00
+MS_OS_20_SUBSET_HEADER_CONFIGURATION = 0x01
+MS_OS_20_SUBSET_HEADER_FUNCTION = 0x02
+MS_OS_20_FEATURE_COMPATIBLE_ID = 0x03
+MS_OS_20_FEATURE_REG_PROPERTY = 0x04
+
+# wIndex of the vendor request for the descriptor set.
+MS_OS_20_DESCRIPTOR_INDEX = 0x07
+
+WINDOWS_VERSION_8_1 = 0x06030000
+
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD_LITTLE_ENDIAN = 4
+REG_DWORD_BIG_ENDIAN = 5
+REG_LINK = 6
+REG_MULTI_SZ = 7
+
+
+def _utf16(value):
+    return (value + "\0").encode("utf-16-le")
+
+
+class DescriptorSetHeader:
+    """Start of the descriptor set. ``subdescriptors`` are features that apply to
+       the whole device followed by `ConfigurationSubset` s."""
+    wDescriptorType = MS_OS_20_SET_HEADER_DESCRIPTOR
+    fmt = "<HH" + "IH"
+    fields = ("wLength", "wDescriptorType", "dwWindowsVersion", "wTotalLength")
+    wLength = struct.calcsize(fmt)
+    # Computed during serialization.
+    derived_fields = ("wTotalLength",)
+
+    def __init__(self, *,
+                 description="MS OS 2.0",
+                 dwWindowsVersion=WINDOWS_VERSION_8_1,
+                 subdescriptors=None):
+        self.description = description
+        self.dwWindowsVersion = dwWindowsVersion
+        self.subdescriptors = subdescriptors if subdescriptors is not None else []
+        self.wTotalLength = self.wLength
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        subdescriptor_bytes = b''.join(map(bytes, self.subdescriptors))
+        self.wTotalLength = self.wLength + len(subdescriptor_bytes)
+        return struct.pack(self.fmt,
+                           self.wLength,
+                           self.wDescriptorType,
+                           self.dwWindowsVersion,
+                           self.wTotalLength) + subdescriptor_bytes
+
+
+class ConfigurationSubset:
+    """Features of one configuration, followed by `FunctionSubset` s.
+
+       Despite its name, Windows matches ``bConfigurationValue`` against the
+       configuration's index, so the first configuration is 0.
+    """
+    wDescriptorType = MS_OS_20_SUBSET_HEADER_CONFIGURATION
+    fmt = "<HH" + "BBH"
+    fields = ("wLength", "wDescriptorType", "bConfigurationValue", "bReserved",
+              "wTotalLength")
+    wLength = struct.calcsize(fmt)
+    bReserved = 0
+    # Computed during serialization.
+    derived_fields = ("wTotalLength",)
+
+    def __init__(self, *,
+                 description="MS OS 2.0 configuration",
+                 bConfigurationValue=0,
+                 subdescriptors=None):
+        self.description = description
+        self.bConfigurationValue = bConfigurationValue
+        self.subdescriptors = subdescriptors if subdescriptors is not None else []
+        self.wTotalLength = self.wLength
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        subdescriptor_bytes = b''.join(map(bytes, self.subdescriptors))
+        self.wTotalLength = self.wLength + len(subdescriptor_bytes)
+        return struct.pack(self.fmt,
+                           self.wLength,
+                           self.wDescriptorType,
+                           self.bConfigurationValue,
+                           self.bReserved,
+                           self.wTotalLength) + subdescriptor_bytes
+
+
+class FunctionSubset:
+    """Features of the function starting at ``interface``.
+
+       ``interface`` is the function's first `standard.InterfaceDescriptor`, as
+       numbered by `util.join_interfaces`, or an interface number. Joining frozen
+       interfaces returns renumbered copies, so refer to the ones in its result.
+    """
+    wDescriptorType = MS_OS_20_SUBSET_HEADER_FUNCTION
+    fmt = "<HH" + "BBH"
+    fields = ("wLength", "wDescriptorType", "bFirstInterface", "bReserved",
+              "wSubsetLength")
+    wLength = struct.calcsize(fmt)
+    bReserved = 0
+    # Computed during serialization.
+    derived_fields = ("bFirstInterface", "wSubsetLength")
+
+    def __init__(self, *,
+                 description="MS OS 2.0 function",
+                 interface,
+                 subdescriptors=None):
+        self.description = description
+        self.interface = interface
+        self.subdescriptors = subdescriptors if subdescriptors is not None else []
+        self.bFirstInterface = 0
+        self.wSubsetLength = self.wLength
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        subdescriptor_bytes = b''.join(map(bytes, self.subdescriptors))
+        self.bFirstInterface = (self.interface if isinstance(self.interface, int)
+                                else self.interface.bInterfaceNumber)
+        self.wSubsetLength = self.wLength + len(subdescriptor_bytes)
+        return struct.pack(self.fmt,
+                           self.wLength,
+                           self.wDescriptorType,
+                           self.bFirstInterface,
+                           self.bReserved,
+                           self.wSubsetLength) + subdescriptor_bytes
+
+
+class CompatibleId:
+    """Compatible ID of the device or function, such as ``"WINUSB"``. Each ID is at
+       most 8 ASCII characters."""
+    wDescriptorType = MS_OS_20_FEATURE_COMPATIBLE_ID
+    # No fields: the IDs are str, which are encoded when serialized.
+    fmt = "<HH" + "8s8s"
+    wLength = struct.calcsize(fmt)
+
+    def __init__(self, *,
+                 description="Compatible ID",
+                 CompatibleID="WINUSB",
+                 SubCompatibleID=""):
+        for value in (CompatibleID, SubCompatibleID):
+            if len(value.encode("ascii")) > 8:
+                raise ValueError("Compatible ID {!r} is longer than 8 characters".format(value))
+        self.description = description
+        self.CompatibleID = CompatibleID
+        self.SubCompatibleID = SubCompatibleID
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.wLength,
+                           self.wDescriptorType,
+                           self.CompatibleID.encode("ascii"),
+                           self.SubCompatibleID.encode("ascii"))
+
+
+class RegistryProperty:
+    """Registry value ``name`` set to ``data`` for the device or function.
+
+       ``wPropertyDataType`` defaults from ``data``: `REG_SZ` for a str,
+       `REG_MULTI_SZ` for a list or tuple of str, `REG_DWORD_LITTLE_ENDIAN` for an
+       int and `REG_BINARY` for bytes.
+    """
+    wDescriptorType = MS_OS_20_FEATURE_REG_PROPERTY
+    fixed_fmt = "<HH" + "HH"     # not including the name and data
+    fixed_wLength = struct.calcsize(fixed_fmt)
+
+    def __init__(self, *,
+                 description="Registry property",
+                 name,
+                 data,
+                 wPropertyDataType=None):
+        if wPropertyDataType is None:
+            if isinstance(data, str):
+                wPropertyDataType = REG_SZ
+            elif isinstance(data, (list, tuple)):
+                wPropertyDataType = REG_MULTI_SZ
+            elif isinstance(data, int):
+                wPropertyDataType = REG_DWORD_LITTLE_ENDIAN
+            else:
+                wPropertyDataType = REG_BINARY
+        self.description = description
+        self.name = name
+        self.data = data
+        self.wPropertyDataType = wPropertyDataType
+
+    @property
+    def wLength(self):
+        return self.fixed_wLength + len(_utf16(self.name)) + 2 + len(self.property_data())
+
+    def property_data(self):
+        """Returns ``data`` encoded for ``wPropertyDataType``."""
+        data_type = self.wPropertyDataType
+        if data_type in (REG_SZ, REG_EXPAND_SZ, REG_LINK):
+            return _utf16(self.data)
+        if data_type == REG_MULTI_SZ:
+            return b''.join(_utf16(value) for value in self.data) + _utf16("")
+        if data_type == REG_DWORD_LITTLE_ENDIAN:
+            return struct.pack("<I", self.data)
+        if data_type == REG_DWORD_BIG_ENDIAN:
+            return struct.pack(">I", self.data)
+        return bytes(self.data)
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        name = _utf16(self.name)
+        data = self.property_data()
+        return (struct.pack(self.fixed_fmt,
+                            self.fixed_wLength + len(name) + 2 + len(data),
+                            self.wDescriptorType,
+                            self.wPropertyDataType,
+                            len(name)) +
+                name + struct.pack("<H", len(data)) + data)
+
+
+class PlatformCapability:
+    """BOS device capability that points the host to ``descriptor_set``, a
+       `DescriptorSetHeader`. The host requests the set with ``bMS_VendorCode``."""
+    bDescriptorType = standard.DESCRIPTOR_TYPE_DEVICE_CAPABILITY
+    bDevCapabilityType = 0x05
+    PlatformCapabilityUUID = uuid.UUID("D8DD60DF-4589-4CC7-9CD2-659D9E648A9F").bytes_le
+    fmt = "<BBB" + "B16s" + "IHBB"
+    fields = ("bLength", "bDescriptorType", "bDevCapabilityType", "bReserved",
+              "PlatformCapabilityUUID", "dwWindowsVersion",
+              "wMSOSDescriptorSetTotalLength", "bMS_VendorCode", "bAltEnumCode")
+    bLength = struct.calcsize(fmt)
+    bReserved = 0
+    # Computed during serialization.
+    derived_fields = ("wMSOSDescriptorSetTotalLength",)
+
+    def __init__(self, *,
+                 description="MS OS 2.0 platform",
+                 descriptor_set,
+                 bMS_VendorCode,
+                 bAltEnumCode=0):
+        self.description = description
+        self.descriptor_set = descriptor_set
+        self.bMS_VendorCode = bMS_VendorCode
+        self.bAltEnumCode = bAltEnumCode
+        self.wMSOSDescriptorSetTotalLength = 0
+
+    @property
+    def dwWindowsVersion(self):
+        return self.descriptor_set.dwWindowsVersion
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        self.wMSOSDescriptorSetTotalLength = len(bytes(self.descriptor_set))
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.bDevCapabilityType,
+                           self.bReserved,
+                           self.PlatformCapabilityUUID,
+                           self.dwWindowsVersion,
+                           self.wMSOSDescriptorSetTotalLength,
+                           self.bMS_VendorCode,
+                           self.bAltEnumCode)
+
+
+def winusb_function(interface, *, device_interface_guid, description="WinUSB"):
+    """Returns a `FunctionSubset` that binds WinUSB to the function starting at
+       ``interface`` and registers it under ``device_interface_guid``, a str or
+       `uuid.UUID`, for applications to find."""
+    guid = "{{{}}}".format(str(uuid.UUID(str(device_interface_guid))).upper())
+    return FunctionSubset(
+        description=description,
+        interface=interface,
+        subdescriptors=[
+            CompatibleId(description="{} compatible ID".format(description)),
+            RegistryProperty(description="{} device interface GUIDs".format(description),
+                             name="DeviceInterfaceGUIDs",
+                             data=[guid]),
+        ])
@@ -0,0 +1,412 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import inspect
+import struct
+
+from . import audio
+from . import cdc
+from . import hid
+from . import midi
+from . import standard
+
+"""
+Descriptor parsing
+==================
+
+Decodes serialized descriptors back into the library's classes, so descriptors
+read from a device, a capture or a file can be described, compared and serialized
+again to the same bytes.
+
+Descriptors with ``fields`` are unpacked with their ``fmt``. Variable length ones,
+such as `cdc.Union` and the MIDI jacks, have their own decoders. Anything that no
+decoder handles, or that wouldn't serialize back to the same bytes, is kept as a
+`standard.RawDescriptor`.
+
+Configurations are nested the way `util.join_interfaces` returns them: class
+specific descriptors and endpoints go in their interface's ``subdescriptors``,
+SuperSpeed companions in their endpoint's ``companion`` and MIDI jacks in their
+`midi.Header`.
+"""
+
+# Description given to parsed descriptors.
+DESCRIPTION = "parsed"
+
+# Decoders by (bDescriptorType, bInterfaceClass, bInterfaceSubClass, subtype).
+# The subtype is the third byte, such as bDescriptorSubtype or bDevCapabilityType.
+_decoders = {}
+# Decoder found for each full key, or None.
+_resolved = {}
+# Unpacking details of each class with ``fields``.
+_layouts = {}
+
+_u16 = struct.Struct("<H")
+
+
+def register(bDescriptorType, decoder, *, bInterfaceClass=None, bInterfaceSubClass=None,
+             subtype=None):
+    """Decodes descriptors of ``bDescriptorType`` with ``decoder(data, context)``.
+
+       ``bInterfaceClass`` and ``bInterfaceSubClass`` limit it to descriptors in
+       interfaces of that class and ``subtype`` to those with that third byte. None
+       matches anything. The most specific decoder is used. ``decoder`` returns a
+       descriptor, or None to keep the data as a `standard.RawDescriptor`."""
+    _decoders[(bDescriptorType, bInterfaceClass, bInterfaceSubClass, subtype)] = decoder
+    _resolved.clear()
+
+
+def _resolve(key):
+    bDescriptorType, interface_class, interface_subclass, subtype = key
+    for candidate in ((bDescriptorType, interface_class, interface_subclass, subtype),
+                      (bDescriptorType, interface_class, None, subtype),
+                      (bDescriptorType, None, None, subtype),
+                      (bDescriptorType, interface_class, interface_subclass, None),
+                      (bDescriptorType, interface_class, None, None),
+                      (bDescriptorType, None, None, None)):
+        decoder = _decoders.get(candidate)
+        if decoder is not None:
+            break
+    _resolved[key] = decoder
+    return decoder
+
+
+class Context:
+    """Where a descriptor was found: the interface it follows, if any, and the MIDI
+       jacks seen so far in that interface by ``id``."""
+
+    def __init__(self, interface=None):
+        self.interface = interface
+        self.jacks = {}
+
+
+def _layout(cls):
+    try:
+        return _layouts[cls]
+    except KeyError:
+        pass
+    parameters = inspect.signature(cls.__init__).parameters
+    arguments = []
+    attributes = []
+    constants = []
+    for index, name in enumerate(cls.fields):
+        if name in parameters:
+            arguments.append((index, name))
+        elif name in getattr(cls, "derived_fields", ()) or not hasattr(cls, name):
+            attributes.append((index, name))
+        else:
+            constants.append((index, getattr(cls, name)))
+    layout = _layouts[cls] = (struct.Struct(cls.fmt), "description" in parameters,
+                              arguments, attributes, constants)
+    return layout
+
+
+def fixed(cls):
+    """Returns a decoder for descriptor class ``cls``, which has ``fields``."""
+    def decode(data, context):
+        packer, described, arguments, attributes, constants = _layout(cls)
+        if len(data) != packer.size:
+            return None
+        values = packer.unpack(data)
+        for index, value in constants:
+            if values[index] != value:
+                return None
+        kwargs = {name: values[index] for index, name in arguments}
+        if described:
+            kwargs["description"] = DESCRIPTION
+        descriptor = cls(**kwargs)
+        for index, name in attributes:
+            setattr(descriptor, name, values[index])
+        return descriptor
+    return decode
+
+
+def _union(data, context):
+    if len(data) < cdc.Union.fixed_bLength + 1:
+        return None
+    return cdc.Union(description=DESCRIPTION,
+                     bMasterInterface=data[3],
+                     bSlaveInterface_list=list(data[4:]))
+
+
+_fixed_in_jack = fixed(midi.InJackDescriptor)
+
+
+def _in_jack(data, context):
+    jack = _fixed_in_jack(data, context)
+    if jack is not None:
+        context.jacks[jack.id] = jack
+    return jack
+
+
+def _out_jack(data, context):
+    count = data[5] if len(data) > 5 else -1
+    if count < 0 or len(data) != midi.OutJackDescriptor.fixed_bLength + 2 * count + 1:
+        return None
+    input_pins = []
+    for i in range(count):
+        source = context.jacks.get(data[6 + 2 * i])
+        if source is None:
+            return None
+        input_pins.append((source, data[7 + 2 * i]))
+    jack = midi.OutJackDescriptor(description=DESCRIPTION,
+                                  bJackType=data[3],
+                                  input_pins=input_pins,
+                                  iJack=data[-1])
+    jack.id = data[4]
+    context.jacks[jack.id] = jack
+    return jack
+
+
+def _midi_data_endpoint(data, context):
+    count = data[3] if len(data) > 3 else -1
+    if count < 0 or len(data) != midi.DataEndpointDescriptor.fixed_bLength + count:
+        return None
+    jacks = [context.jacks.get(jack_id) for jack_id in data[4:]]
+    if None in jacks:
+        return None
+    return midi.DataEndpointDescriptor(baAssocJack=jacks)
+
+
+def _midi_header(data, context):
+    # Only version 1.0 round trips, and the jacks are added by `parse_configuration`.
+    if len(data) != midi.Header.bLength or _u16.unpack_from(data, 3)[0] != 0x0100:
+        return None
+    return midi.Header()
+
+
+for _cls in (standard.DeviceDescriptor, standard.ConfigurationDescriptor,
+             standard.InterfaceAssociationDescriptor, standard.InterfaceDescriptor,
+             standard.EndpointDescriptor, standard.SuperSpeedEndpointCompanionDescriptor):
+    register(_cls.bDescriptorType, fixed(_cls))
+for _cls in (standard.USB20ExtensionDescriptor, standard.SuperSpeedDeviceCapabilityDescriptor):
+    register(_cls.bDescriptorType, fixed(_cls), subtype=_cls.bDevCapabilityType)
+for _cls in (cdc.Header, cdc.CallManagement, cdc.AbstractControlManagement,
+             cdc.DirectLineManagement, cdc.EthernetNetworking, cdc.NetworkControlModel):
+    register(_cls.bDescriptorType, fixed(_cls), bInterfaceClass=cdc.CDC_CLASS_COMM,
+             subtype=_cls.bDescriptorSubtype)
+register(cdc.Union.bDescriptorType, _union, bInterfaceClass=cdc.CDC_CLASS_COMM,
+         subtype=cdc.Union.bDescriptorSubtype)
+register(hid.HIDDescriptor.bDescriptorType, fixed(hid.HIDDescriptor),
+         bInterfaceClass=hid.HID_CLASS)
+_midi_streaming = {"bInterfaceClass": audio.AUDIO_CLASS_DEVICE,
+                   "bInterfaceSubClass": audio.AUDIO_SUBCLASS_MIDI_STREAMING}
+for _subtype, _decoder in ((midi.Header.bDescriptorSubtype, _midi_header),
+                           (midi.InJackDescriptor.bDescriptorSubtype, _in_jack),
+                           (midi.OutJackDescriptor.bDescriptorSubtype, _out_jack)):
+    register(standard.DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE, _decoder, subtype=_subtype,
+             **_midi_streaming)
+register(midi.DataEndpointDescriptor.bDescriptorType, _midi_data_endpoint,
+         subtype=midi.DataEndpointDescriptor.bDescriptorSubtype, **_midi_streaming)
+
+
+def iter_descriptors(data, offset=0, end=None):
+    """Yields ``(offset, view)`` for each descriptor in ``data`` from ``offset`` to
+       ``end``, with ``view`` a memoryview of its bytes. Raises ValueError when a
+       bLength is less than 2 or runs past ``end``."""
+    view = memoryview(data)
+    if end is None:
+        end = len(view)
+    while offset < end:
+        length = view[offset]
+        if length < 2 or offset + length > end:
+            raise ValueError("Malformed descriptor at offset {}".format(offset))
+        yield offset, view[offset:offset + length]
+        offset += length
+
+
+def decode(data, context=None):
+    """Returns the descriptor class instance for one serialized descriptor, or a
+       `standard.RawDescriptor` when no decoder handles it."""
+    if len(data) < 2 or data[0] != len(data):
+        raise ValueError("bLength doesn't match the length of data")
+    if context is None:
+        context = Context()
+    interface = context.interface
+    if interface is not None:
+        key = (data[1], interface.bInterfaceClass, interface.bInterfaceSubClass,
+               data[2] if len(data) > 2 else None)
+    else:
+        key = (data[1], None, None, data[2] if len(data) > 2 else None)
+    try:
+        decoder = _resolved[key]
+    except KeyError:
+        decoder = _resolve(key)
+    if decoder is not None:
+        descriptor = decoder(data, context)
+        if descriptor is not None:
+            return descriptor
+    return standard.RawDescriptor(description=DESCRIPTION, data=data)
+
+
+def parse_device(data):
+    """Returns the `standard.DeviceDescriptor` serialized in ``data``."""
+    descriptor = decode(data)
+    if not isinstance(descriptor, standard.DeviceDescriptor):
+        raise ValueError("Not a device descriptor")
+    return descriptor
+
+
+def parse_string(data):
+    """Returns the `standard.StringDescriptor` serialized in ``data``."""
+    if len(data) < 2 or data[0] != len(data):
+        raise ValueError("bLength doesn't match the length of data")
+    return standard.StringDescriptor(bytes(data))
+
+
+def parse_bos(data):
+    """Returns the `standard.BOSDescriptor` serialized in ``data`` with its
+       capabilities."""
+    if len(data) < standard.BOSDescriptor.bLength or data[1] != standard.DESCRIPTOR_TYPE_BOS:
+        raise ValueError("Not a BOS descriptor")
+    wTotalLength = _u16.unpack_from(data, 2)[0]
+    if not standard.BOSDescriptor.bLength <= wTotalLength <= len(data):
+        raise ValueError("Malformed BOS wTotalLength {}".format(wTotalLength))
+    descriptors = iter_descriptors(data, 0, wTotalLength)
+    _, header = next(descriptors)
+    if len(header) != standard.BOSDescriptor.bLength:
+        raise ValueError("Malformed BOS descriptor")
+    capabilities = [decode(view) for _, view in descriptors]
+    return standard.BOSDescriptor(description=DESCRIPTION, capabilities=capabilities)
+
+
+def _close_midi_header(header, header_data, parent, jacks):
+    # `midi.Header` numbers its jacks by position and totals their lengths when
+    # serialized, so it can only hold them if they already match. Otherwise the
+    # jacks follow it on their own.
+    total_length = header.bLength + sum(jack.bLength for jack in jacks)
+    if (_u16.unpack_from(header_data, 5)[0] == total_length and
+            all(getattr(jack, "id", None) == i + 1 for i, jack in enumerate(jacks))):
+        header.jacks_and_elements = jacks
+        parent.append(header)
+    else:
+        parent.append(standard.RawDescriptor(description=DESCRIPTION, data=header_data))
+        parent.extend(jacks)
+
+
+def _close_interface(result, index, interface_data):
+    # `standard.InterfaceDescriptor` counts its endpoints when serialized, so it can
+    # only hold its subdescriptors if bNumEndpoints already is that count. Otherwise
+    # they follow it on their own, with each companion after its endpoint.
+    interface = result[index]
+    endpoint_count = sum(1 for d in interface.subdescriptors
+                         if d.bDescriptorType == standard.EndpointDescriptor.bDescriptorType)
+    if endpoint_count == interface.bNumEndpoints:
+        return
+    flattened = [standard.RawDescriptor(description=DESCRIPTION, data=interface_data)]
+    for descriptor in interface.subdescriptors:
+        flattened.append(descriptor)
+        companion = getattr(descriptor, "companion", None)
+        if companion is not None:
+            descriptor.companion = None
+            flattened.append(companion)
+    result[index:index + 1] = flattened
+
+
+def parse_configuration(data):
+    """Returns the configuration sequence serialized in ``data``: the
+       `standard.ConfigurationDescriptor` followed by its interface association and
+       interface descriptors, with everything else nested in them.
+
+       Serializing each item of the result gives ``data`` back."""
+    if (len(data) < standard.ConfigurationDescriptor.bLength or
+            data[1] != standard.ConfigurationDescriptor.bDescriptorType):
+        raise ValueError("Not a configuration descriptor")
+    wTotalLength = _u16.unpack_from(data, 2)[0]
+    if not standard.ConfigurationDescriptor.bLength <= wTotalLength <= len(data):
+        raise ValueError("Malformed wTotalLength {}".format(wTotalLength))
+    descriptors = iter_descriptors(data, 0, wTotalLength)
+    _, header = next(descriptors)
+    configuration = decode(header)
+    if not isinstance(configuration, standard.ConfigurationDescriptor):
+        raise ValueError("Malformed configuration descriptor")
+
+    result = [configuration]
+    context = Context()
+    # Where descriptors go: the configuration sequence until the first interface.
+    parent = result
+    endpoint = None
+    # Index of the interface holding descriptors in result, and its bytes.
+    interface_index = None
+    # MIDI header collecting its jacks, the raw header and where its jacks end.
+    midi_header = None
+    for offset, view in descriptors:
+        if midi_header is not None:
+            if offset < midi_end and view[1] == midi.Header.bDescriptorType:
+                midi_jacks.append(decode(view, context))
+                continue
+            _close_midi_header(midi_header, midi_header_data, parent, midi_jacks)
+            midi_header = None
+
+        descriptor = decode(view, context)
+        if isinstance(descriptor, (standard.InterfaceDescriptor,
+                                   standard.InterfaceAssociationDescriptor)):
+            if interface_index is not None:
+                _close_interface(result, interface_index, interface_data)
+                interface_index = None
+            result.append(descriptor)
+            parent = result
+            endpoint = None
+            if isinstance(descriptor, standard.InterfaceDescriptor):
+                context = Context(descriptor)
+                parent = descriptor.subdescriptors
+                interface_index = len(result) - 1
+                interface_data = bytes(view)
+        elif (isinstance(descriptor, standard.SuperSpeedEndpointCompanionDescriptor) and
+              endpoint is not None and endpoint.companion is None and parent is not result):
+            # Only interfaces serialize companions after their endpoints.
+            endpoint.companion = descriptor
+        elif isinstance(descriptor, midi.Header):
+            endpoint = None
+            midi_header = descriptor
+            midi_header_data = bytes(view)
+            midi_end = offset + _u16.unpack_from(view, 5)[0]
+            midi_jacks = []
+        else:
+            # A companion belongs to the endpoint right before it.
+            endpoint = descriptor if isinstance(descriptor, standard.EndpointDescriptor) else None
+            parent.append(descriptor)
+    if midi_header is not None:
+        _close_midi_header(midi_header, midi_header_data, parent, midi_jacks)
+    if interface_index is not None:
+        _close_interface(result, interface_index, interface_data)
+    return result
+
+
+def parse_device_file(data):
+    """Returns ``(device, configurations)`` from ``data`` laid out like the Linux
+       usbfs and sysfs ``descriptors`` files: the device descriptor followed by each
+       complete configuration. ``configurations`` holds `parse_configuration`
+       results."""
+    view = memoryview(data)
+    device_length = standard.DeviceDescriptor.bLength
+    device = parse_device(view[:device_length])
+    configurations = []
+    offset = device_length
+    while offset + 4 <= len(view):
+        wTotalLength = _u16.unpack_from(view, offset + 2)[0]
+        if wTotalLength < standard.ConfigurationDescriptor.bLength:
+            raise ValueError("Malformed configuration at offset {}".format(offset))
+        configurations.append(parse_configuration(view[offset:offset + wTotalLength]))
+        offset += wTotalLength
+    if offset != len(view):
+        raise ValueError("Trailing bytes at offset {}".format(offset))
+    return device, configurations
@@ -0,0 +1,227 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+
+from . import frozen
+from . import standard
+from . import util
+
+"""
+Composite function planner
+==========================
+
+Picks the set of USB functions with the highest total priority that fits a
+microcontroller's endpoints, interfaces and periodic bandwidth, then joins them
+with `util.join_interfaces` and serializes the configuration.
+
+Each candidate's factory is called once. Its interface sequence is frozen and
+measured by joining it alone, so the search only adds up resource counts. The
+search is a depth first branch and bound over the candidates, most important
+first. It prunes branches that can't beat the best set found so far and states
+that an earlier branch reached with at least as many resources left and at
+least as much priority.
+"""
+
+# ``group`` names a set of mutually exclusive candidates, such as HID variants.
+# None means it doesn't exclude anything.
+Candidate = collections.namedtuple("Candidate", ("name", "factory", "priority", "group"))
+Candidate.__new__.__defaults__ = (None,)
+
+# ``functions`` are the chosen candidate names in the order given. ``resources``
+# maps each resource name to the amount used.
+Plan = collections.namedtuple("Plan", ("functions", "priority", "resources",
+                                       "interfaces", "configuration"))
+
+RESOURCES = ("interfaces", "endpoints", "in_endpoints", "out_endpoints",
+             "periodic_bytes", "configuration_length")
+
+# Payload bytes per frame (full speed) or microframe (high speed) that periodic
+# endpoints may reserve: 90% and 80% of the bus time.
+PERIODIC_BYTES = {
+    standard.SPEED_LOW: 187 * 9 // 10,
+    standard.SPEED_FULL: 1500 * 9 // 10,
+    standard.SPEED_HIGH: 7500 * 8 // 10,
+}
+
+
+class HardwareProfile:
+    """Limits of one microcontroller's USB peripheral.
+
+       ``endpoints`` is the number of endpoint numbers besides 0. Some peripherals
+       have fewer IN or OUT endpoints than numbers, which ``in_endpoints`` and
+       ``out_endpoints`` limit. ``periodic_bytes`` is the interrupt and isochronous
+       payload per (micro)frame and defaults to `PERIODIC_BYTES` for ``speed``.
+    """
+
+    def __init__(self, *,
+                 description,
+                 endpoints,
+                 in_endpoints=None,
+                 out_endpoints=None,
+                 interfaces=0xFF,
+                 speed=standard.SPEED_FULL,
+                 periodic_bytes=None,
+                 max_configuration_length=0xFFFF):
+        self.description = description
+        self.endpoints = endpoints
+        self.in_endpoints = in_endpoints if in_endpoints is not None else endpoints
+        self.out_endpoints = out_endpoints if out_endpoints is not None else endpoints
+        self.interfaces = interfaces
+        self.speed = speed
+        self.periodic_bytes = (periodic_bytes if periodic_bytes is not None
+                               else PERIODIC_BYTES[speed])
+        self.max_configuration_length = max_configuration_length
+
+    def limits(self):
+        """Returns the limit of each of `RESOURCES`."""
+        return (self.interfaces, self.endpoints, self.in_endpoints, self.out_endpoints,
+                self.periodic_bytes,
+                self.max_configuration_length - standard.ConfigurationDescriptor.bLength)
+
+
+def _periodic_bytes(endpoint, speed):
+    transfer_type = endpoint.bmAttributes & 0x03
+    if transfer_type not in (standard.EndpointDescriptor.TYPE_INTERRUPT,
+                             standard.EndpointDescriptor.TYPE_ISOCHRONOUS):
+        return 0
+    size = endpoint.wMaxPacketSize & 0x7FF
+    transactions = ((endpoint.wMaxPacketSize >> 11) & 0x3) + 1
+    if speed == standard.SPEED_HIGH or transfer_type == standard.EndpointDescriptor.TYPE_ISOCHRONOUS:
+        period = 1 << (max(endpoint.bInterval, 1) - 1)
+    else:
+        period = max(endpoint.bInterval, 1)
+    return size * transactions / period
+
+
+def measure(interfaces, speed=standard.SPEED_FULL):
+    """Returns the amount of each of `RESOURCES` that the interface sequence
+       ``interfaces`` uses once joined.
+
+       Alternate settings share their interface's number and endpoint numbers, and
+       only the most demanding one counts towards periodic bandwidth."""
+    joined = util.join_interfaces([frozen.freeze(interfaces)])
+    interface_count = 0
+    addresses = set()
+    periodic = {}
+    for descriptor in joined:
+        if descriptor.bDescriptorType != standard.InterfaceDescriptor.bDescriptorType:
+            continue
+        if descriptor.bAlternateSetting == 0:
+            interface_count += 1
+        load = 0
+        for subdescriptor in descriptor.subdescriptors:
+            if subdescriptor.bDescriptorType == standard.EndpointDescriptor.bDescriptorType:
+                addresses.add(subdescriptor.bEndpointAddress)
+                load += _periodic_bytes(subdescriptor, speed)
+        number = descriptor.bInterfaceNumber
+        periodic[number] = max(periodic.get(number, 0), load)
+    numbers = {address & 0x0F for address in addresses}
+    return (interface_count,
+            max(numbers, default=0),
+            sum(1 for address in addresses if address & 0x80),
+            sum(1 for address in addresses if not address & 0x80),
+            sum(periodic.values()),
+            sum(len(bytes(descriptor)) for descriptor in joined))
+
+
+def _fits(used, limits):
+    return all(u <= l for u, l in zip(used, limits))
+
+
+def _search(items, limits):
+    """Returns the indices into ``items``, ``(priority, group, cost)`` sorted by
+       priority, of the best set within ``limits``."""
+    count = len(items)
+    # Optimistic priority still available from each position on.
+    bound = [0] * (count + 1)
+    for i in range(count - 1, -1, -1):
+        bound[i] = bound[i + 1] + items[i][0]
+
+    best_priority = -1
+    best_chosen = ()
+    # Partial results by position and groups used: (left, priority) pairs.
+    seen = {}
+    stack = [(0, tuple(limits), 0, frozenset(), ())]
+    while stack:
+        i, left, priority, groups, chosen = stack.pop()
+        if priority > best_priority:
+            best_priority = priority
+            best_chosen = chosen
+        if i == count or priority + bound[i] <= best_priority:
+            continue
+        key = (i, groups)
+        states = seen.setdefault(key, [])
+        if any(p >= priority and all(a >= b for a, b in zip(l, left)) for l, p in states):
+            continue
+        states.append((left, priority))
+
+        # Pushed last so that taking the candidate is explored first.
+        stack.append((i + 1, left, priority, groups, chosen))
+        item_priority, group, cost = items[i]
+        if group is not None and group in groups:
+            continue
+        remaining = tuple(l - c for l, c in zip(left, cost))
+        if min(remaining) < 0:
+            continue
+        if group is not None:
+            groups = groups | {group}
+        stack.append((i + 1, remaining, priority + item_priority, groups, chosen + (i,)))
+    return best_chosen
+
+
+def plan(candidates, profile, *, configuration=None):
+    """Returns the `Plan` with the highest total priority of ``candidates`` that fits
+       ``profile``, a `HardwareProfile`.
+
+       ``candidates`` are `Candidate` s whose ``factory()`` returns an interface
+       sequence for `util.join_interfaces`. ``configuration`` is the
+       `standard.ConfigurationDescriptor` to serialize the chosen set under. Its
+       ``wTotalLength`` and ``bNumInterfaces`` are filled in.
+    """
+    candidates = list(candidates)
+    templates = [frozen.freeze(candidate.factory()) for candidate in candidates]
+    costs = [measure(template, profile.speed) for template in templates]
+    limits = profile.limits()
+
+    order = sorted((i for i, candidate in enumerate(candidates)
+                    if candidate.priority > 0 and _fits(costs[i], limits)),
+                   key=lambda i: -candidates[i].priority)
+    items = [(candidates[i].priority, candidates[i].group, costs[i]) for i in order]
+    chosen = sorted(order[i] for i in _search(items, limits))
+
+    interfaces = util.join_interfaces([templates[i] for i in chosen])
+    used = [sum(costs[i][r] for i in chosen) for r in range(len(RESOURCES))]
+    if configuration is None:
+        configuration = standard.ConfigurationDescriptor(description="planned",
+                                                         wTotalLength=0,
+                                                         bNumInterfaces=0)
+    body = b"".join(bytes(descriptor) for descriptor in interfaces)
+    configuration = frozen.update(configuration,
+                                  wTotalLength=configuration.bLength + len(body),
+                                  bNumInterfaces=used[0])
+    used[-1] += configuration.bLength
+    return Plan(tuple(candidates[i].name for i in chosen),
+                sum(candidates[i].priority for i in chosen),
+                dict(zip(RESOURCES, used)),
+                interfaces,
+                bytes(configuration) + body)
@@ -0,0 +1,399 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import importlib
+import json
+import marshal
+
+from . import frozen
+
+"""
+Descriptor specs
+================
+
+Saves complete descriptor trees of `standard`, `cdc`, `hid`, `midi`, `audio10`
+and `msos` objects, and `descriptor_set.DescriptorSet` s, then loads them back
+without running any constructors or serializing anything again. Pickle isn't
+used: only classes from those modules can be named and nothing else is called
+while loading.
+
+Both forms hold the same versioned document. Objects referenced from several
+places, such as MIDI jacks and shared frozen templates, are stored once. The JSON
+form lists each object with its named attributes, for people and review. The
+binary form groups objects into tables of one class and attribute names, with a
+row of values each, and is the document in `marshal` format 4 after a header.
+Every Python 3.4 or later reads it with a single C call. Like marshal, it's meant
+for files this library wrote, not untrusted input.
+"""
+
+FORMAT = "adafruit_usb_descriptor.spec"
+VERSION = 1
+# Modules whose classes specs can hold.
+MODULES = ("standard", "cdc", "hid", "midi", "audio10", "msos", "descriptor_set")
+
+_MAGIC = b"USBSPEC\0"
+_MARSHAL_VERSION = 4
+
+# Tags of values that can't be stored as themselves: references to objects and
+# containers with references inside.
+_REFERENCE = "r"
+_REFERENCE_LIST = "R"
+_REFERENCE_TUPLE = "T"
+_LIST = "l"
+_TUPLE = "t"
+_DICT = "d"
+_BYTEARRAY = "a"
+_MEMORYVIEW = "m"
+_PLAIN = "p"
+
+# Classes by the names specs give them.
+_resolved = {}
+
+_plain_types = (type(None), bool, int, float, str, bytes)
+
+
+def _is_plain(value):
+    if isinstance(value, _plain_types):
+        return True
+    if type(value) in (list, tuple):
+        return all(_is_plain(item) for item in value)
+    if type(value) is dict:
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+def _is_object(value):
+    return hasattr(value, "__dict__") and not isinstance(value, type)
+
+
+class _Encoder:
+    def __init__(self):
+        self._classes = {}
+        # Objects in the order they're found, by id, holding them so ids aren't reused.
+        self._found = {}
+        self._indices = {}
+
+    def _class_name(self, cls):
+        name = self._classes.get(cls)
+        if name is None:
+            base = cls.__bases__[1] if issubclass(cls, frozen.FrozenDescriptor) else cls
+            module = base.__module__.rpartition(".")[2]
+            if (base.__module__ != __package__ + "." + module or module not in MODULES or
+                    getattr(importlib.import_module(base.__module__), base.__qualname__, None)
+                    is not base):
+                raise TypeError("Can't save {}".format(cls.__qualname__))
+            name = self._classes[cls] = "{}.{}".format(module, base.__qualname__)
+        return name
+
+    def _find(self, value):
+        """Adds every object reachable from ``value`` to ``_found``."""
+        if type(value) in (list, tuple):
+            for item in value:
+                self._find(item)
+        elif type(value) is dict:
+            for item in value.items():
+                self._find(item)
+        elif _is_object(value) and id(value) not in self._found:
+            self._class_name(type(value))
+            self._found[id(value)] = value
+            for attribute in vars(value).values():
+                self._find(attribute)
+
+    def _attributes(self, value):
+        derived = getattr(type(value), "derived_fields", ())
+        for name, attribute in vars(value).items():
+            if name in derived and isinstance(attribute, memoryview):
+                # Caches of views are rebuilt on use.
+                attribute = None
+            yield name, attribute
+
+    def value(self, value):
+        """Returns the tagged form of ``value``."""
+        if _is_plain(value):
+            return [_PLAIN, value]
+        if type(value) in (list, tuple) and all(_is_object(item) for item in value):
+            return [_REFERENCE_LIST if type(value) is list else _REFERENCE_TUPLE,
+                    [self._indices[id(item)] for item in value]]
+        if type(value) is list:
+            return [_LIST, [self.value(item) for item in value]]
+        if type(value) is tuple:
+            return [_TUPLE, [self.value(item) for item in value]]
+        if type(value) is dict:
+            return [_DICT, [[self.value(k), self.value(v)] for k, v in value.items()]]
+        if type(value) is bytearray:
+            return [_BYTEARRAY, bytes(value)]
+        if type(value) is memoryview:
+            return [_MEMORYVIEW, value.tobytes()]
+        if _is_object(value):
+            return [_REFERENCE, self._indices[id(value)]]
+        raise TypeError("Can't save {!r}".format(value))
+
+    def document(self, tree):
+        self._find(tree)
+        class_names = []
+        class_indices = {}
+        # Objects of one class, frozen or not, with the same attribute names share a
+        # table. Their indices run through the tables in order.
+        tables = {}
+        for value in self._found.values():
+            name = self._class_name(type(value))
+            if name not in class_indices:
+                class_indices[name] = len(class_names)
+                class_names.append(name)
+            key = (class_indices[name], frozen.is_frozen(value), tuple(vars(value)))
+            tables.setdefault(key, []).append(value)
+        for value in (value for values in tables.values() for value in values):
+            self._indices[id(value)] = len(self._indices)
+
+        rows_by_table = []
+        references = []
+        for (class_index, is_frozen, names), values in tables.items():
+            rows = []
+            for value in values:
+                row = []
+                for name, attribute in self._attributes(value):
+                    if _is_plain(attribute):
+                        row.append(attribute)
+                    else:
+                        row.append(None)
+                        references.append([self._indices[id(value)], name,
+                                           self.value(attribute)])
+                rows.append(tuple(row))
+            rows_by_table.append([class_index, is_frozen, names, rows])
+        return {"format": FORMAT, "version": VERSION, "classes": class_names,
+                "tables": rows_by_table, "references": references,
+                "root": self.value(tree)}
+
+
+def to_document(tree):
+    """Returns the document of ``tree``, a descriptor or nested lists and tuples of
+       them, as plain dicts, lists, tuples and values."""
+    return _Encoder().document(tree)
+
+
+def _resolve_class(name):
+    cls = _resolved.get(name)
+    if cls is not None:
+        return cls
+    module_name, _, qualname = name.partition(".")
+    if module_name not in MODULES:
+        raise ValueError("Unknown module in {}".format(name))
+    module = importlib.import_module("." + module_name, __package__)
+    cls = getattr(module, qualname, None)
+    if not isinstance(cls, type) or cls.__module__ != module.__name__:
+        raise ValueError("Unknown class {}".format(name))
+    _resolved[name] = cls
+    return cls
+
+
+def _decode(tagged, objects):
+    tag, value = tagged
+    if tag == _PLAIN:
+        return value
+    if tag == _REFERENCE:
+        return objects[value]
+    if tag == _REFERENCE_LIST:
+        return [objects[index] for index in value]
+    if tag == _REFERENCE_TUPLE:
+        return tuple(objects[index] for index in value)
+    if tag == _LIST:
+        return [_decode(item, objects) for item in value]
+    if tag == _TUPLE:
+        return tuple(_decode(item, objects) for item in value)
+    if tag == _DICT:
+        return {_decode(k, objects): _decode(v, objects) for k, v in value}
+    if tag == _BYTEARRAY:
+        return bytearray(value)
+    if tag == _MEMORYVIEW:
+        return memoryview(value)
+    raise ValueError("Unknown tag {!r}".format(tag))
+
+
+def from_document(document):
+    """Returns the tree saved in ``document``, as returned by `to_document`."""
+    if document.get("format") != FORMAT:
+        raise ValueError("Not a descriptor spec")
+    if document.get("version") != VERSION:
+        raise ValueError("Unsupported spec version {}".format(document.get("version")))
+    classes = [_resolve_class(name) for name in document["classes"]]
+    new = object.__new__
+    objects = []
+    append = objects.append
+    for class_index, is_frozen, names, rows in document["tables"]:
+        cls = classes[class_index]
+        if is_frozen:
+            cls = frozen.frozen_class(cls)
+        for row in rows:
+            descriptor = new(cls)
+            descriptor.__dict__.update(zip(names, row))
+            append(descriptor)
+    # Every object exists before any attribute refers to one.
+    for index, name, tagged in document["references"]:
+        objects[index].__dict__[name] = _decode(tagged, objects)
+    return _decode(document["root"], objects)
+
+
+def dumps(tree):
+    """Returns the binary form of ``tree``."""
+    return _MAGIC + marshal.dumps(to_document(tree), _MARSHAL_VERSION)
+
+
+def loads(data):
+    """Returns the tree saved by `dumps`."""
+    if bytes(data[:len(_MAGIC)]) != _MAGIC:
+        raise ValueError("Not a binary descriptor spec")
+    document = marshal.loads(memoryview(data)[len(_MAGIC):])
+    if not isinstance(document, dict):
+        raise ValueError("Malformed descriptor spec")
+    return from_document(document)
+
+
+def _to_json(value):
+    if isinstance(value, bytes):
+        return {"bytes": value.hex()}
+    if isinstance(value, tuple):
+        return {"tuple": [_to_json(item) for item in value]}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        return {"dict": [[_to_json(k), _to_json(v)] for k, v in value.items()]}
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    if isinstance(value, dict):
+        (tag, content), = value.items()
+        if tag == "bytes":
+            return bytes.fromhex(content)
+        if tag == "tuple":
+            return tuple(_from_json(item) for item in content)
+        if tag == "dict":
+            return {_from_json(k): _from_json(v) for k, v in content}
+        raise ValueError("Unknown JSON tag {!r}".format(tag))
+    return value
+
+
+def _tagged_to_json(tagged):
+    tag, value = tagged
+    if tag == _PLAIN:
+        return _to_json(value)
+    if tag == _REFERENCE:
+        return {"ref": value}
+    if tag == _REFERENCE_LIST:
+        return [{"ref": index} for index in value]
+    if tag == _REFERENCE_TUPLE:
+        return {"tuple": [{"ref": index} for index in value]}
+    if tag == _LIST:
+        return [_tagged_to_json(item) for item in value]
+    if tag == _TUPLE:
+        return {"tuple": [_tagged_to_json(item) for item in value]}
+    if tag == _DICT:
+        return {"dict": [[_tagged_to_json(k), _tagged_to_json(v)] for k, v in value]}
+    if tag == _BYTEARRAY:
+        return {"bytearray": value.hex()}
+    return {"memoryview": value.hex()}
+
+
+def _json_to_tagged(value):
+    if isinstance(value, list):
+        return [_LIST, [_json_to_tagged(item) for item in value]]
+    if isinstance(value, dict):
+        (tag, content), = value.items()
+        if tag == "ref":
+            return [_REFERENCE, content]
+        if tag == "tuple":
+            return [_TUPLE, [_json_to_tagged(item) for item in content]]
+        if tag == "dict":
+            return [_DICT, [[_json_to_tagged(k), _json_to_tagged(v)] for k, v in content]]
+        if tag == "bytes":
+            return [_PLAIN, bytes.fromhex(content)]
+        if tag == "bytearray":
+            return [_BYTEARRAY, bytes.fromhex(content)]
+        if tag == "memoryview":
+            return [_MEMORYVIEW, bytes.fromhex(content)]
+        raise ValueError("Unknown JSON tag {!r}".format(tag))
+    return [_PLAIN, value]
+
+
+def dumps_json(tree, **kwargs):
+    """Returns the JSON form of ``tree``, with an entry of named attributes for each
+       object and ``{"ref": index}`` where one refers to another. ``kwargs`` go to
+       `json.dumps`, such as ``indent``."""
+    document = to_document(tree)
+    objects = []
+    for class_index, is_frozen, names, rows in document["tables"]:
+        for row in rows:
+            objects.append({"class": document["classes"][class_index], "frozen": is_frozen,
+                            "attributes": {name: _to_json(value)
+                                           for name, value in zip(names, row)}})
+    for index, name, tagged in document["references"]:
+        objects[index]["attributes"][name] = _tagged_to_json(tagged)
+    return json.dumps({"format": document["format"], "version": document["version"],
+                       "objects": objects, "root": _tagged_to_json(document["root"])},
+                      **kwargs)
+
+
+def loads_json(text):
+    """Returns the tree saved by `dumps_json`."""
+    saved = json.loads(text)
+    if not isinstance(saved, dict) or not isinstance(saved.get("objects"), list):
+        raise ValueError("Malformed descriptor spec")
+    classes = []
+    tables = []
+    references = []
+    for index, entry in enumerate(saved["objects"]):
+        if entry["class"] not in classes:
+            classes.append(entry["class"])
+        row = []
+        for name, value in entry["attributes"].items():
+            tagged = _json_to_tagged(value)
+            if tagged[0] == _PLAIN:
+                row.append(tagged[1])
+            else:
+                row.append(None)
+                references.append([index, name, tagged])
+        tables.append([classes.index(entry["class"]), bool(entry["frozen"]),
+                       tuple(entry["attributes"]), [tuple(row)]])
+    return from_document({"format": saved.get("format"), "version": saved.get("version"),
+                          "classes": classes, "tables": tables, "references": references,
+                          "root": _json_to_tagged(saved["root"])})
+
+
+def save(tree, path):
+    """Saves ``tree`` to ``path``, as JSON when it ends with ``.json``."""
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            f.write(dumps_json(tree, indent=1))
+    else:
+        with open(path, "wb") as f:
+            f.write(dumps(tree))
+
+
+def load(path):
+    """Loads the tree saved at ``path`` by `save`."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            return loads_json(f.read())
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -20,18 +20,33 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import math
 import struct
 
+from . import util
+
+DESCRIPTOR_TYPE_BOS = 0x0F
+DESCRIPTOR_TYPE_DEVICE_CAPABILITY = 0x10
+DESCRIPTOR_TYPE_SUPERSPEED_ENDPOINT_COMPANION = 0x30
+
 DESCRIPTOR_TYPE_CLASS_SPECIFIC_DEVICE = 0x21
 DESCRIPTOR_TYPE_CLASS_SPECIFIC_CONFIGURATION = 0x22
 DESCRIPTOR_TYPE_CLASS_SPECIFIC_STRING = 0x23
 DESCRIPTOR_TYPE_CLASS_SPECIFIC_INTERFACE = 0x24
 DESCRIPTOR_TYPE_CLASS_SPECIFIC_ENDPOINT = 0x25
 
+# Bus speeds used to size endpoints.
+SPEED_LOW = 0
+SPEED_FULL = 1
+SPEED_HIGH = 2
+SPEED_SUPER = 3
+
 class EndpointDescriptor:
     """Single endpoint configuration"""
     bDescriptorType = 0x5
     fmt = "<BB" + "BBHB"
+    fields = ("bLength", "bDescriptorType", "bEndpointAddress", "bmAttributes",
+              "wMaxPacketSize", "bInterval")
     bLength = struct.calcsize(fmt)
 
     TYPE_CONTROL = 0b00
@@ -44,20 +59,40 @@ class EndpointDescriptor:
     DIRECTION_MASK = DIRECTION_IN | DIRECTION_OUT
     NUMBER_MASK = ~DIRECTION_MASK
 
+    # Largest wMaxPacketSize allowed for each transfer type, indexed by bus speed.
+    MAX_PACKET_SIZES = {
+        TYPE_CONTROL: (8, 64, 64, 512),
+        TYPE_ISOCHRONOUS: (0, 1023, 1024, 1024),
+        TYPE_BULK: (0, 64, 512, 1024),
+        TYPE_INTERRUPT: (8, 64, 1024, 1024),
+    }
+
+    @classmethod
+    def max_packet_size(cls, transfer_type, speed):
+        """Returns the largest ``wMaxPacketSize`` for ``transfer_type`` at bus ``speed``."""
+        size = cls.MAX_PACKET_SIZES[transfer_type][speed]
+        if size == 0:
+            raise ValueError("Transfer type {} not allowed at speed {}".format(transfer_type, speed))
+        return size
+
     def __init__(self, *,
                  description,
                  bEndpointAddress,
                  bmAttributes,
                  wMaxPacketSize=0x40,
-                 bInterval=0x10):
+                 bInterval=0x10,
+                 companion=None):
         self.description = description
         self.bEndpointAddress = bEndpointAddress
         self.bmAttributes = bmAttributes
         self.wMaxPacketSize = wMaxPacketSize
         self.bInterval = bInterval
+        # SuperSpeed endpoints need a `SuperSpeedEndpointCompanionDescriptor`. It is
+        # serialized by the `InterfaceDescriptor` directly after this endpoint.
+        self.companion = companion
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -69,6 +104,95 @@ class EndpointDescriptor:
                            self.bInterval)
 
 
+class SuperSpeedEndpointCompanionDescriptor:
+    """Burst and stream configuration of a SuperSpeed endpoint.
+
+       Attach it to an `EndpointDescriptor` with ``companion`` rather than listing it
+       in ``subdescriptors`` so that it always follows its endpoint.
+    """
+    bDescriptorType = DESCRIPTOR_TYPE_SUPERSPEED_ENDPOINT_COMPANION
+    fmt = "<BB" + "BBH"
+    fields = ("bLength", "bDescriptorType", "bMaxBurst", "bmAttributes",
+              "wBytesPerInterval")
+    bLength = struct.calcsize(fmt)
+
+    MAX_BURST = 15
+    MAX_MULT = 2
+    # Bulk endpoints support 2 ** MaxStreams streams.
+    MAX_STREAMS = 16
+
+    def __init__(self, *,
+                 description,
+                 bMaxBurst=0,
+                 # MaxStreams (bits 0-4) for bulk, Mult (bits 0-1) for isochronous
+                 bmAttributes=0,
+                 wBytesPerInterval=0):
+        self.description = description
+        self.bMaxBurst = bMaxBurst
+        self.bmAttributes = bmAttributes
+        self.wBytesPerInterval = wBytesPerInterval
+
+    @classmethod
+    def for_throughput(cls, throughput, *, endpoint, description=None, max_streams=0):
+        """Returns a companion for ``endpoint`` that can move ``throughput`` bytes per
+           second.
+
+           The smallest burst that covers the bytes needed per service interval is
+           used. Bulk endpoints are serviced every 125us bus interval and their burst
+           is capped at 16 packets. Periodic endpoints use ``endpoint.bInterval``, and
+           isochronous ones spill into Mult when 16 packets isn't enough.
+           ``max_streams`` is the MaxStreams exponent of a bulk endpoint. Raises
+           ValueError when ``endpoint`` has no ``wMaxPacketSize`` or ``max_streams``
+           is out of range or given for an endpoint that isn't bulk.
+        """
+        if endpoint.wMaxPacketSize <= 0:
+            raise ValueError("{} has no wMaxPacketSize to size a burst with".format(
+                endpoint.description))
+        transfer_type = endpoint.bmAttributes & 0b11
+        if not 0 <= max_streams <= cls.MAX_STREAMS:
+            raise ValueError("MaxStreams {} not in 0 to {}".format(max_streams, cls.MAX_STREAMS))
+        if max_streams and transfer_type != EndpointDescriptor.TYPE_BULK:
+            raise ValueError("Only bulk endpoints have streams")
+        if transfer_type == EndpointDescriptor.TYPE_BULK:
+            interval = 125e-6
+        else:
+            interval = 125e-6 * (1 << (max(endpoint.bInterval, 1) - 1))
+        packets = max(1, math.ceil(throughput * interval / endpoint.wMaxPacketSize))
+        mult = 0
+        if transfer_type == EndpointDescriptor.TYPE_ISOCHRONOUS:
+            mult = (packets - 1) // (cls.MAX_BURST + 1)
+            if mult > cls.MAX_MULT:
+                raise ValueError("{} B/s exceeds isochronous endpoint bandwidth".format(throughput))
+            packets = math.ceil(packets / (mult + 1))
+        elif transfer_type == EndpointDescriptor.TYPE_INTERRUPT and packets > 3:
+            raise ValueError("{} B/s exceeds interrupt endpoint bandwidth".format(throughput))
+        burst = min(packets, cls.MAX_BURST + 1)
+
+        bytes_per_interval = 0
+        if transfer_type != EndpointDescriptor.TYPE_BULK:
+            bytes_per_interval = min(burst * (mult + 1) * endpoint.wMaxPacketSize, 0xFFFF)
+            bmAttributes = mult
+        else:
+            bmAttributes = max_streams
+        if description is None:
+            description = "{} companion".format(endpoint.description)
+        return cls(description=description,
+                   bMaxBurst=burst - 1,
+                   bmAttributes=bmAttributes,
+                   wBytesPerInterval=bytes_per_interval)
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.bMaxBurst,
+                           self.bmAttributes,
+                           self.wBytesPerInterval)
+
+
 class InterfaceDescriptor:
     """Single interface that includes ``subdescriptors`` such as endpoints.
 
@@ -78,7 +202,12 @@ class InterfaceDescriptor:
     """
     bDescriptorType = 0x4
     fmt = "<BB" + "B"*7
+    fields = ("bLength", "bDescriptorType", "bInterfaceNumber", "bAlternateSetting",
+              "bNumEndpoints", "bInterfaceClass", "bInterfaceSubClass",
+              "bInterfaceProtocol", "iInterface")
     bLength = struct.calcsize(fmt)
+    # Computed during serialization.
+    derived_fields = ("bNumEndpoints",)
 
     def __init__(self, *,
                  description,
@@ -89,7 +218,7 @@ class InterfaceDescriptor:
                  bInterfaceSubClass=0,
                  bInterfaceProtocol=0,
                  iInterface=0,
-                 subdescriptors=[]):
+                 subdescriptors=None):
         self.description = description
         self.bInterfaceNumber = bInterfaceNumber
         self.bAlternateSetting = bAlternateSetting
@@ -98,13 +227,10 @@ class InterfaceDescriptor:
         self.bInterfaceSubClass = bInterfaceSubClass
         self.bInterfaceProtocol = bInterfaceProtocol
         self.iInterface = iInterface
-        self.subdescriptors = subdescriptors
+        self.subdescriptors = subdescriptors if subdescriptors is not None else []
 
     def notes(self):
-        notes = [str(self)]
-        for s in self.subdescriptors:
-            notes.extend(s.notes())
-        return notes
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         endpoint_count = 0
@@ -113,6 +239,8 @@ class InterfaceDescriptor:
             subdescriptor_bytes.append(bytes(desc))
             if desc.bDescriptorType == EndpointDescriptor.bDescriptorType:
                 endpoint_count += 1
+                if getattr(desc, "companion", None) is not None:
+                    subdescriptor_bytes.append(bytes(desc.companion))
         self.bNumEndpoints = endpoint_count
         initial_bytes = struct.pack(self.fmt,
                                     self.bLength,
@@ -131,7 +259,11 @@ class InterfaceAssociationDescriptor:
     """Groups interfaces into a single function"""
     bDescriptorType = 0xB
     fmt = "<BB" + "B"*6
+    fields = ("bLength", "bDescriptorType", "bFirstInterface", "bInterfaceCount",
+              "bFunctionClass", "bFunctionSubClass", "bFunctionProtocol", "iFunction")
     bLength = struct.calcsize(fmt)
+    # Offset by `util.join_interfaces`.
+    interface_fields = ("bFirstInterface",)
 
     def __init__(self, *,
                  description,
@@ -150,7 +282,7 @@ class InterfaceAssociationDescriptor:
         self.iFunction = iFunction
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -168,6 +300,8 @@ class ConfigurationDescriptor:
     """High level configuration that prepends the interfaces."""
     bDescriptorType = 0x2
     fmt = "<BB" + "HBBBBB"
+    fields = ("bLength", "bDescriptorType", "wTotalLength", "bNumInterfaces",
+              "bConfigurationValue", "iConfiguration", "bmAttributes", "bMaxPower")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -190,7 +324,7 @@ class ConfigurationDescriptor:
         self.bMaxPower = bMaxPower
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -208,6 +342,10 @@ class DeviceDescriptor:
     """Holds basic device level info."""
     bDescriptorType = 0x1
     fmt = "<BB" + "HBBBBHHHBBBB"
+    fields = ("bLength", "bDescriptorType", "bcdUSB", "bDeviceClass",
+              "bDeviceSubClass", "bDeviceProtocol", "bMaxPacketSize", "idVendor",
+              "idProduct", "bcdDevice", "iManufacturer", "iProduct", "iSerialNumber",
+              "bNumConfigurations")
     bLength = struct.calcsize(fmt)
 
     def __init__(self, *,
@@ -239,7 +377,7 @@ class DeviceDescriptor:
         self.bNumConfigurations = bNumConfigurations
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
         return struct.pack(self.fmt,
@@ -259,13 +397,149 @@ class DeviceDescriptor:
                            self.bNumConfigurations)
 
 
+class BOSDescriptor:
+    """Binary Device Object Store that prepends the device ``capabilities``.
+
+       It is requested by hosts from devices with a ``bcdUSB`` of 0x201 or higher.
+    """
+    bDescriptorType = DESCRIPTOR_TYPE_BOS
+    fmt = "<BB" + "HB"
+    fields = ("bLength", "bDescriptorType", "wTotalLength", "bNumDeviceCaps")
+    bLength = struct.calcsize(fmt)
+    # Computed during serialization.
+    derived_fields = ("wTotalLength", "bNumDeviceCaps")
+
+    def __init__(self, *,
+                 description="BOS",
+                 capabilities=None):
+        self.description = description
+        self.capabilities = capabilities if capabilities is not None else []
+        self.wTotalLength = self.bLength
+        self.bNumDeviceCaps = len(self.capabilities)
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        capability_bytes = b''.join(map(bytes, self.capabilities))
+        self.wTotalLength = self.bLength + len(capability_bytes)
+        self.bNumDeviceCaps = len(self.capabilities)
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.wTotalLength,
+                           self.bNumDeviceCaps) + capability_bytes
+
+
+class USB20ExtensionDescriptor:
+    """USB 2.0 Extension device capability, which advertises Link Power Management."""
+    bDescriptorType = DESCRIPTOR_TYPE_DEVICE_CAPABILITY
+    bDevCapabilityType = 0x02
+    fmt = "<BBB" + "I"
+    fields = ("bLength", "bDescriptorType", "bDevCapabilityType", "bmAttributes")
+    bLength = struct.calcsize(fmt)
+
+    ATTRIBUTE_LPM = 0x02
+
+    def __init__(self, *,
+                 description="USB 2.0 Extension",
+                 bmAttributes=ATTRIBUTE_LPM):
+        self.description = description
+        self.bmAttributes = bmAttributes
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.bDevCapabilityType,
+                           self.bmAttributes)
+
+
+class SuperSpeedDeviceCapabilityDescriptor:
+    """SuperSpeed USB device capability with the supported speeds and U1/U2 exit latencies."""
+    bDescriptorType = DESCRIPTOR_TYPE_DEVICE_CAPABILITY
+    bDevCapabilityType = 0x03
+    fmt = "<BBB" + "BHBBH"
+    fields = ("bLength", "bDescriptorType", "bDevCapabilityType", "bmAttributes",
+              "wSpeedsSupported", "bFunctionalitySupport", "bU1DevExitLat",
+              "wU2DevExitLat")
+    bLength = struct.calcsize(fmt)
+
+    ATTRIBUTE_LTM = 0x02
+
+    SPEED_LOW = 0x1
+    SPEED_FULL = 0x2
+    SPEED_HIGH = 0x4
+    SPEED_SUPER = 0x8
+
+    def __init__(self, *,
+                 description="SuperSpeed USB",
+                 bmAttributes=0,
+                 wSpeedsSupported=SPEED_FULL | SPEED_HIGH | SPEED_SUPER,
+                 # Lowest speed at which all functionality is available.
+                 bFunctionalitySupport=1,
+                 bU1DevExitLat=0x0A,
+                 wU2DevExitLat=0x07FF):
+        self.description = description
+        self.bmAttributes = bmAttributes
+        self.wSpeedsSupported = wSpeedsSupported
+        self.bFunctionalitySupport = bFunctionalitySupport
+        self.bU1DevExitLat = bU1DevExitLat
+        self.wU2DevExitLat = wU2DevExitLat
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return struct.pack(self.fmt,
+                           self.bLength,
+                           self.bDescriptorType,
+                           self.bDevCapabilityType,
+                           self.bmAttributes,
+                           self.wSpeedsSupported,
+                           self.bFunctionalitySupport,
+                           self.bU1DevExitLat,
+                           self.wU2DevExitLat)
+
+
+class RawDescriptor:
+    """Descriptor kept as its serialized ``data``, such as a parsed descriptor that
+       no class decodes."""
+
+    def __init__(self, *,
+                 description="raw",
+                 data):
+        if len(data) < 2 or data[0] != len(data):
+            raise ValueError("bLength doesn't match the length of data")
+        self.description = description
+        self.data = bytes(data)
+
+    @property
+    def bLength(self):
+        return self.data[0]
+
+    @property
+    def bDescriptorType(self):
+        return self.data[1]
+
+    def notes(self):
+        return list(util.iter_notes(self))
+
+    def __bytes__(self):
+        return self.data
+
+
 class StringDescriptor:
     """Holds a string referenced by another descriptor by index.
 
-       It's recommended to hold these in a dict or list and look them up in subsequent
-       descriptors to link to them.
+       Use a `StringTable` to assign the indices and serve the descriptors.
     """
     bDescriptorType = 0x03
+    # Cached during serialization.
+    derived_fields = ("_bytes",)
 
     def __init__(self, value):
         self.description = '"{}"'.format(value)
@@ -276,14 +550,17 @@ class StringDescriptor:
             self._bLength = value[0]
             if value[1] != 3:
                 raise ValueError("Sequence not a StringDescriptor")
-            self._bString = value[2:2+self.bLength]
+            self._bString = bytes(value[2:self._bLength])
+        self._bytes = None
 
     def notes(self):
-        return [str(self)]
+        return list(util.iter_notes(self))
 
     def __bytes__(self):
-        return struct.pack("BB{}s".format(len(self._bString)), self.bLength,
-                           self.bDescriptorType, self._bString)
+        if self._bytes is None:
+            self._bytes = struct.pack("BB{}s".format(len(self._bString)), self.bLength,
+                                      self.bDescriptorType, self._bString)
+        return self._bytes
 
     @property
     def bString(self):
@@ -292,8 +569,122 @@ class StringDescriptor:
     @bString.setter
     def bString(self, value):
         self._bString = value.encode("utf-16-le")
-        self._bLength = len(self.encoded) + 2
+        self._bLength = len(self._bString) + 2
+        self._bytes = None
 
     @property
     def bLength(self):
         return self._bLength
+
+
+LANGID_ENGLISH_US = 0x0409
+
+class StringTable:
+    """Deduplicated string descriptors with automatically assigned indices.
+
+       Every UTF-16LE payload is encoded once, when it's added, into a single buffer.
+       `descriptor` returns a `memoryview` slice of it. Index 0 holds the list of
+       ``langids``.
+    """
+    # Fields that hold string indices. `assign` replaces str values in them.
+    index_fields = ("iManufacturer", "iProduct", "iSerialNumber", "iConfiguration",
+                    "iInterface", "iFunction", "iJack", "iMACAddress")
+    derived_fields = ("_view",)
+
+    def __init__(self, langids=(LANGID_ENGLISH_US,)):
+        if not langids:
+            raise ValueError("At least one LANGID is required")
+        self.langids = tuple(langids)
+        self._indices = {}
+        self._strings = [None]
+        self._buffer = bytearray(struct.pack("<BB" + "H" * len(self.langids),
+                                             2 + 2 * len(self.langids),
+                                             StringDescriptor.bDescriptorType,
+                                             *self.langids))
+        self._offsets = {0: (0, len(self._buffer))}
+        self._view = None
+
+    def __len__(self):
+        return len(self._strings)
+
+    def index(self, value):
+        """Returns the index of ``value``, adding it when it's new.
+
+           ``value`` is a str used for every language or a dict from LANGID to str.
+           Languages missing from the dict use the first language's string.
+        """
+        if isinstance(value, str):
+            strings = (value,) * len(self.langids)
+        else:
+            default = value.get(self.langids[0])
+            strings = tuple(value.get(langid, default) for langid in self.langids)
+            if None in strings:
+                raise ValueError("No string for LANGID 0x{:04x}".format(self.langids[0]))
+        index = self._indices.get(strings)
+        if index is not None:
+            return index
+        index = len(self._strings)
+        if index > 0xFF:
+            raise ValueError("More than 255 strings")
+        for langid, string in zip(self.langids, strings):
+            encoded = string.encode("utf-16-le")
+            if len(encoded) > 0xFD:
+                raise ValueError("String too long: {!r}".format(string))
+            start = len(self._buffer)
+            self._buffer.append(len(encoded) + 2)
+            self._buffer.append(StringDescriptor.bDescriptorType)
+            self._buffer += encoded
+            self._offsets[(index, langid)] = (start, len(self._buffer))
+        self._indices[strings] = index
+        self._strings.append(strings)
+        self._view = None
+        return index
+
+    def assign(self, *descriptors):
+        """Replaces str values of the `index_fields` in ``descriptors``, and the
+           descriptors nested inside them, with their string indices. Sequences of
+           descriptors, such as the result of `util.join_interfaces`, are walked too."""
+        for _, _, descriptor in util.walk(descriptors):
+            for name in self.index_fields:
+                value = getattr(descriptor, name, None)
+                if isinstance(value, (str, dict)):
+                    setattr(descriptor, name, self.index(value))
+
+    def descriptor(self, index, langid=None):
+        """Returns a `memoryview` of the string descriptor at ``index`` in ``langid``.
+
+           Unknown languages fall back to the first one. Raises KeyError for an unknown
+           index.
+        """
+        if self._view is None:
+            self._view = memoryview(bytes(self._buffer))
+        if index == 0:
+            start, end = self._offsets[0]
+        else:
+            offsets = self._offsets.get((index, langid))
+            if offsets is None:
+                offsets = self._offsets[(index, self.langids[0])]
+            start, end = offsets
+        return self._view[start:end]
+
+    def string(self, index, langid=None):
+        """Returns the str at ``index`` in ``langid``, falling back to the first
+           language like `descriptor`. Raises KeyError for index 0, which holds the
+           LANGIDs, and for an unknown index."""
+        if index == 0:
+            raise KeyError("Index 0 holds LANGIDs")
+        return str(self.descriptor(index, langid)[2:], "utf-16-le")
+
+    def string_descriptors(self, langid=None):
+        """Returns a `StringDescriptor` for every index in ``langid``, starting with
+           the LANGID list at index 0."""
+        descriptors = []
+        for i in range(len(self)):
+            descriptor = StringDescriptor(self.descriptor(i, langid))
+            if i == 0:
+                descriptor.description = "LANGIDs " + ", ".join(
+                    "0x{:04x}".format(langid) for langid in self.langids)
+            else:
+                descriptor.description = '"{}"'.format(self.string(i, langid))
+            descriptors.append(descriptor)
+        return descriptors
@@ -0,0 +1,159 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+
+from . import parse
+
+"""
+Linux sysfs ingest
+==================
+
+Reads the raw descriptors that Linux exposes for every attached device at
+``/sys/bus/usb/devices/*/descriptors`` and parses them with `parse` into the
+library's classes.
+
+A `Scanner` caches each device by its directory and the ``descriptors`` file's
+mtime and inode, so a rescan only stats unchanged devices and reads the ones that
+were plugged in or re-enumerated. Each file is read in one bulk read; sysfs binary
+attributes can't be memory mapped. Parsing waits until a device's descriptors are
+first used. ``root`` can point at a fixture tree with the same layout.
+"""
+
+# Where Linux lists every USB device and interface.
+DEVICES = "/sys/bus/usb/devices"
+
+# Size of the kernel's ``descriptors`` buffer: a device descriptor and a maximum
+# length configuration.
+_READ_SIZE = 18 + 0xFFFF
+
+
+def read_descriptors(path):
+    """Returns the contents of the ``descriptors`` file at ``path``. It usually
+       takes a single read, whatever size the file reports."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = max(os.fstat(fd).st_size, _READ_SIZE) + 1
+        chunks = []
+        while True:
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+class Device:
+    """Descriptors of one device, ``data`` as read from its ``descriptors`` file.
+
+       ``device`` and ``configurations`` are parsed with `parse.parse_device_file`
+       the first time either is used. ``key`` is what the file is cached by.
+    """
+
+    def __init__(self, path, data, key=None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.data = data
+        self.key = key
+        self._parsed = None
+
+    def _parse(self):
+        if self._parsed is None:
+            self._parsed = parse.parse_device_file(self.data)
+        return self._parsed
+
+    @property
+    def parsed(self):
+        """Whether the descriptors have been parsed yet."""
+        return self._parsed is not None
+
+    @property
+    def device(self):
+        return self._parse()[0]
+
+    @property
+    def configurations(self):
+        return self._parse()[1]
+
+    def __bytes__(self):
+        return bytes(self.data)
+
+    def __repr__(self):
+        return "<{} {} {} bytes>".format(type(self).__name__, self.name, len(self.data))
+
+
+def _key(stat):
+    # Re-enumeration recreates the file, so its inode changes even when the mtime
+    # resolution can't tell the two apart.
+    return (stat.st_mtime_ns, stat.st_ino)
+
+
+class Scanner:
+    """Finds the devices under ``root`` and keeps the ones that haven't changed
+       between scans.
+
+       After each `scan`, ``added``, ``changed`` and ``removed`` list the device
+       directories that appeared, were read again and went away.
+    """
+
+    def __init__(self, root=DEVICES):
+        self.root = root
+        self.devices = {}
+        self.added = []
+        self.changed = []
+        self.removed = []
+
+    def scan(self):
+        """Returns the `Device` s under ``root`` by directory path, reading only the
+           ones that are new or whose ``descriptors`` file changed."""
+        previous = self.devices
+        devices = {}
+        added = []
+        changed = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                # Interfaces, such as 1-1:1.0, don't have their own descriptors.
+                if ":" in entry.name:
+                    continue
+                path = os.path.join(entry.path, "descriptors")
+                try:
+                    key = _key(os.stat(path))
+                    cached = previous.get(entry.path)
+                    if cached is None or cached.key != key:
+                        cached = Device(entry.path, read_descriptors(path), key)
+                        (added if entry.path not in previous else changed).append(entry.path)
+                except FileNotFoundError:
+                    # Not a device, or unplugged during the scan.
+                    continue
+                devices[entry.path] = cached
+        self.removed = [path for path in previous if path not in devices]
+        self.added = added
+        self.changed = changed
+        self.devices = devices
+        return devices
+
+
+def scan(root=DEVICES):
+    """Returns the `Device` s under ``root`` by directory path, without caching."""
+    return Scanner(root).scan()
@@ -0,0 +1,511 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import struct
+import time
+
+from . import standard
+
+"""
+USB/IP device server
+====================
+
+Serves `descriptor_set.DescriptorSet` s over USB/IP so that the Linux host stack
+(``usbip attach`` with vhci-hcd) can enumerate them without hardware. `UsbipClient`
+speaks the same protocol for loopback testing where vhci-hcd isn't available.
+
+The protocol is described in the Linux kernel's
+``Documentation/usb/usbip_protocol.rst``.
+"""
+
+USBIP_VERSION = 0x0111
+USBIP_PORT = 3240
+
+OP_REQ_DEVLIST = 0x8005
+OP_REP_DEVLIST = 0x0005
+OP_REQ_IMPORT = 0x8003
+OP_REP_IMPORT = 0x0003
+
+USBIP_CMD_SUBMIT = 0x1
+USBIP_CMD_UNLINK = 0x2
+USBIP_RET_SUBMIT = 0x3
+USBIP_RET_UNLINK = 0x4
+
+USBIP_DIR_OUT = 0
+USBIP_DIR_IN = 1
+
+# Most isochronous packets in one URB, as limited by the Linux usbip drivers.
+USBIP_MAX_ISO_PACKETS = 1024
+
+# Linux enum usb_device_speed, indexed by `standard.SPEED_LOW` and friends.
+USBIP_SPEEDS = (1, 2, 3, 5)
+
+STATUS_OK = 0
+STATUS_STALL = -32          # -EPIPE
+STATUS_UNLINKED = -104      # -ECONNRESET
+
+REQUEST_GET_STATUS = 0x00
+REQUEST_CLEAR_FEATURE = 0x01
+REQUEST_SET_FEATURE = 0x03
+REQUEST_SET_ADDRESS = 0x05
+REQUEST_GET_DESCRIPTOR = 0x06
+REQUEST_GET_CONFIGURATION = 0x08
+REQUEST_SET_CONFIGURATION = 0x09
+REQUEST_GET_INTERFACE = 0x0A
+REQUEST_SET_INTERFACE = 0x0B
+
+REQUEST_TYPE_MASK = 0x60
+REQUEST_TYPE_STANDARD = 0x00
+
+_op_header = struct.Struct(">HHI")
+_devlist_count = struct.Struct(">I")
+_busid = struct.Struct(">32s")
+_udev = struct.Struct(">256s32sIIIHHHBBBBBB")
+_udev_interface = struct.Struct(">BBBx")
+_basic_header = struct.Struct(">IIIII")
+_cmd_submit = struct.Struct(">IiiiI8s")
+_ret_submit = struct.Struct(">iiiii8x")
+_cmd_unlink = struct.Struct(">I24x")
+_ret_unlink = struct.Struct(">i24x")
+_iso_packet = struct.Struct(">IIIi")
+_setup = struct.Struct("<BBHHH")
+
+
+class Metrics:
+    """Per request latency of one device, keyed by request kind."""
+
+    def __init__(self):
+        self.requests = {}
+
+    def record(self, kind, seconds):
+        entry = self.requests.get(kind)
+        if entry is None:
+            self.requests[kind] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+    def as_dict(self):
+        """Returns ``{kind: {"count", "total", "mean", "max"}}`` with times in seconds."""
+        return {kind: {"count": count, "total": total, "mean": total / count, "max": peak}
+                for kind, (count, total, peak) in self.requests.items()}
+
+
+class EmulatedDevice:
+    """A device answering USB/IP requests from a `descriptor_set.DescriptorSet`.
+
+       Standard control requests are answered from ``descriptors``. Class and vendor
+       control requests go to ``control_handler(device, setup, data)``, a coroutine
+       function that returns the IN data, ``b""`` to acknowledge an OUT request or
+       None to stall. ``endpoint_handlers`` maps endpoint addresses to coroutine
+       functions ``handler(device, endpoint, data, length)``. They return the data
+       read from an IN endpoint or the number of bytes accepted by an OUT endpoint,
+       or None to stall. IN endpoints without a handler never complete, like an idle
+       device, and OUT endpoints without one accept everything. A handler that
+       raises stalls the request.
+    """
+
+    def __init__(self, descriptors, *,
+                 busid,
+                 busnum=1,
+                 devnum=1,
+                 speed=standard.SPEED_FULL,
+                 control_handler=None,
+                 endpoint_handlers=None):
+        self.descriptors = descriptors
+        self.busid = busid
+        self.busnum = busnum
+        self.devnum = devnum
+        self.speed = speed
+        self.control_handler = control_handler
+        self.endpoint_handlers = endpoint_handlers if endpoint_handlers is not None else {}
+        self.address = 0
+        self.configuration = 0
+        self.alternate_settings = {}
+        self.metrics = Metrics()
+
+    def _interfaces(self):
+        configuration = self.descriptors.configurations[0]
+        return [d for d in configuration[1:]
+                if d.bDescriptorType == standard.InterfaceDescriptor.bDescriptorType
+                and d.bAlternateSetting == 0]
+
+    def udev(self):
+        device = self.descriptors.device
+        configuration = self.descriptors.configurations[0][0]
+        return _udev.pack(
+            "/sys/devices/usbip/{}".format(self.busid).encode(),
+            self.busid.encode(),
+            self.busnum,
+            self.devnum,
+            USBIP_SPEEDS[self.speed],
+            device.idVendor,
+            device.idProduct,
+            device.bcdDevice,
+            device.bDeviceClass,
+            device.bDeviceSubClass,
+            device.bDeviceProtocol,
+            self.configuration or configuration.bConfigurationValue,
+            device.bNumConfigurations,
+            len(self._interfaces()))
+
+    def udev_interfaces(self):
+        return b''.join(_udev_interface.pack(i.bInterfaceClass,
+                                             i.bInterfaceSubClass,
+                                             i.bInterfaceProtocol)
+                        for i in self._interfaces())
+
+    async def control(self, setup, data):
+        """Returns ``(kind, response)`` for a control transfer. ``response`` is the IN
+           data, ``b""`` for a successful OUT request or None to stall."""
+        bmRequestType, bRequest, wValue, wIndex, wLength = _setup.unpack(setup)
+        if bmRequestType & REQUEST_TYPE_MASK != REQUEST_TYPE_STANDARD:
+            if self.control_handler is None:
+                return "class", None
+            return "class", await self.control_handler(self, setup, data)
+
+        if bRequest == REQUEST_GET_DESCRIPTOR:
+            response = self.descriptors.get_descriptor_request(wValue, wIndex, wLength)
+            return "GET_DESCRIPTOR", response
+        if bRequest == REQUEST_SET_ADDRESS:
+            self.address = wValue
+            return "SET_ADDRESS", b""
+        if bRequest == REQUEST_SET_CONFIGURATION:
+            self.configuration = wValue
+            return "SET_CONFIGURATION", b""
+        if bRequest == REQUEST_GET_CONFIGURATION:
+            return "GET_CONFIGURATION", bytes([self.configuration])
+        if bRequest == REQUEST_SET_INTERFACE:
+            self.alternate_settings[wIndex] = wValue
+            return "SET_INTERFACE", b""
+        if bRequest == REQUEST_GET_INTERFACE:
+            return "GET_INTERFACE", bytes([self.alternate_settings.get(wIndex, 0)])
+        if bRequest == REQUEST_GET_STATUS:
+            return "GET_STATUS", bytes(2)[:wLength]
+        if bRequest in (REQUEST_CLEAR_FEATURE, REQUEST_SET_FEATURE):
+            return "FEATURE", b""
+        return "standard", None
+
+    async def transfer(self, endpoint, data, length):
+        """Returns ``(kind, response)`` for a transfer on a non-control endpoint.
+           ``response`` is None to stall."""
+        handler = self.endpoint_handlers.get(endpoint)
+        if endpoint & standard.EndpointDescriptor.DIRECTION_IN:
+            if handler is None:
+                await asyncio.Event().wait()
+            response = await handler(self, endpoint, None, length)
+            return "in", response if response is None else response[:length]
+        if handler is None:
+            return "out", len(data)
+        return "out", await handler(self, endpoint, data, length)
+
+
+class UsbipServer:
+    """asyncio USB/IP server for any number of `EmulatedDevice` s.
+
+       Each imported device gets its own connection so devices are served
+       concurrently. Non-control URBs run as separate tasks, so a pending IN
+       transfer doesn't hold up the others and can be unlinked.
+    """
+
+    def __init__(self, devices, *, host="127.0.0.1", port=USBIP_PORT):
+        self.devices = {device.busid: device for device in devices}
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        # Report the real port when bound to port 0.
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _connection(self, reader, writer):
+        try:
+            device = await self._operation(reader, writer)
+            if device is not None:
+                await _UrbConnection(device, reader, writer).run()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _operation(self, reader, writer):
+        """Handles the operation that opens a connection. Returns the imported device,
+           if any."""
+        _, code, _ = _op_header.unpack(await reader.readexactly(_op_header.size))
+        if code == OP_REQ_DEVLIST:
+            reply = [_op_header.pack(USBIP_VERSION, OP_REP_DEVLIST, 0),
+                     _devlist_count.pack(len(self.devices))]
+            for device in self.devices.values():
+                reply.append(device.udev())
+                reply.append(device.udev_interfaces())
+            writer.write(b''.join(reply))
+            await writer.drain()
+            return None
+        if code == OP_REQ_IMPORT:
+            busid = _busid.unpack(await reader.readexactly(_busid.size))[0]
+            device = self.devices.get(busid.rstrip(b'\0').decode())
+            if device is None:
+                writer.write(_op_header.pack(USBIP_VERSION, OP_REP_IMPORT, 1))
+            else:
+                writer.write(_op_header.pack(USBIP_VERSION, OP_REP_IMPORT, 0) + device.udev())
+            await writer.drain()
+            return device
+        return None
+
+
+class _UrbConnection:
+    def __init__(self, device, reader, writer):
+        self.device = device
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}
+
+    async def run(self):
+        try:
+            while True:
+                header = await self.reader.readexactly(_basic_header.size)
+                command, seqnum, devid, direction, ep = _basic_header.unpack(header)
+                if command == USBIP_CMD_SUBMIT:
+                    await self._submit(seqnum, devid, direction, ep)
+                elif command == USBIP_CMD_UNLINK:
+                    await self._unlink(seqnum, devid)
+                else:
+                    raise ConnectionError("Unknown USB/IP command {}".format(command))
+        finally:
+            for task in self.pending.values():
+                task.cancel()
+
+    async def _submit(self, seqnum, devid, direction, ep):
+        start = time.perf_counter()
+        fields = await self.reader.readexactly(_cmd_submit.size)
+        _, length, _, number_of_packets, _, setup = _cmd_submit.unpack(fields)
+        # Non-isochronous URBs have 0 packets, or -1 from some kernels. The stream
+        # can't be followed past a bad count, so the connection is dropped.
+        if length < 0 or not -1 <= number_of_packets <= USBIP_MAX_ISO_PACKETS:
+            raise ConnectionError("Bad URB with {} bytes in {} packets".format(
+                length, number_of_packets))
+        data = b""
+        if direction == USBIP_DIR_OUT and length:
+            data = await self.reader.readexactly(length)
+        if number_of_packets > 0:
+            # Isochronous transfers aren't emulated.
+            await self.reader.readexactly(number_of_packets * _iso_packet.size)
+            self._reply(seqnum, devid, direction, ep, STATUS_STALL, b"")
+            return
+        if ep == 0:
+            try:
+                kind, response = await self.device.control(setup, data)
+            except Exception:
+                # Stall rather than drop the connection when a handler fails.
+                kind, response = "error", None
+            self._complete(seqnum, devid, direction, ep, start, kind, response, len(data))
+            await self.writer.drain()
+            return
+        endpoint = ep | (standard.EndpointDescriptor.DIRECTION_IN if direction == USBIP_DIR_IN else 0)
+        self.pending[seqnum] = asyncio.ensure_future(
+            self._endpoint(seqnum, devid, direction, ep, endpoint, data, length, start))
+
+    async def _endpoint(self, seqnum, devid, direction, ep, endpoint, data, length, start):
+        try:
+            kind, response = await self.device.transfer(endpoint, data, length)
+        except asyncio.CancelledError:
+            return
+        except Exception:
+            kind, response = "error", None
+        finally:
+            self.pending.pop(seqnum, None)
+        self._complete(seqnum, devid, direction, ep, start, kind, response, len(data))
+        await self.writer.drain()
+
+    def _complete(self, seqnum, devid, direction, ep, start, kind, response, out_length):
+        if response is None:
+            self._reply(seqnum, devid, direction, ep, STATUS_STALL, b"")
+        elif isinstance(response, int):
+            self._reply(seqnum, devid, direction, ep, STATUS_OK, b"", response)
+        elif direction == USBIP_DIR_OUT:
+            self._reply(seqnum, devid, direction, ep, STATUS_OK, b"", out_length)
+        else:
+            self._reply(seqnum, devid, direction, ep, STATUS_OK, response)
+        self.device.metrics.record(kind, time.perf_counter() - start)
+
+    def _reply(self, seqnum, devid, direction, ep, status, data, actual_length=None):
+        if actual_length is None:
+            actual_length = len(data)
+        self.writer.write(_basic_header.pack(USBIP_RET_SUBMIT, seqnum, devid, direction, ep) +
+                          _ret_submit.pack(status, actual_length, 0, 0, 0))
+        if data:
+            self.writer.write(data)
+
+    async def _unlink(self, seqnum, devid):
+        unlink_seqnum = _cmd_unlink.unpack(await self.reader.readexactly(_cmd_unlink.size))[0]
+        task = self.pending.pop(unlink_seqnum, None)
+        status = STATUS_OK
+        if task is not None:
+            task.cancel()
+            status = STATUS_UNLINKED
+        self.writer.write(_basic_header.pack(USBIP_RET_UNLINK, seqnum, devid, 0, 0) +
+                          _ret_unlink.pack(status))
+        await self.writer.drain()
+
+
+class UsbipClient:
+    """Minimal USB/IP host for testing `UsbipServer` over loopback.
+
+       Requests are answered in order, so only one transfer may be outstanding,
+       apart from those sent with `send_submit` and then cancelled with `unlink`.
+    """
+
+    def __init__(self, host="127.0.0.1", port=USBIP_PORT):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.devid = 0
+        self._seqnum = 0
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+
+    async def list_devices(self):
+        """Returns ``[(busid, idVendor, idProduct, interfaces)]`` exported by the server."""
+        await self._open()
+        try:
+            self.writer.write(_op_header.pack(USBIP_VERSION, OP_REQ_DEVLIST, 0))
+            await self.reader.readexactly(_op_header.size)
+            count = _devlist_count.unpack(await self.reader.readexactly(_devlist_count.size))[0]
+            devices = []
+            for _ in range(count):
+                udev = _udev.unpack(await self.reader.readexactly(_udev.size))
+                interfaces = [_udev_interface.unpack(
+                                  await self.reader.readexactly(_udev_interface.size))
+                              for _ in range(udev[13])]
+                devices.append((udev[1].rstrip(b'\0').decode(), udev[5], udev[6], interfaces))
+            return devices
+        finally:
+            await self.close()
+
+    async def import_device(self, busid):
+        await self._open()
+        self.writer.write(_op_header.pack(USBIP_VERSION, OP_REQ_IMPORT, 0) +
+                          _busid.pack(busid.encode()))
+        _, _, status = _op_header.unpack(await self.reader.readexactly(_op_header.size))
+        if status != 0:
+            await self.close()
+            raise ValueError("Import of {} failed".format(busid))
+        udev = _udev.unpack(await self.reader.readexactly(_udev.size))
+        self.devid = (udev[2] << 16) | udev[3]
+
+    def send_submit(self, ep, direction, *, length=0, data=b"", setup=bytes(8)):
+        """Sends one URB without waiting for its reply and returns its seqnum."""
+        self._seqnum += 1
+        if direction == USBIP_DIR_OUT:
+            length = len(data)
+        self.writer.write(_basic_header.pack(USBIP_CMD_SUBMIT, self._seqnum, self.devid, direction, ep) +
+                          _cmd_submit.pack(0, length, 0, 0, 0, setup) + data)
+        return self._seqnum
+
+    async def unlink(self, seqnum):
+        """Cancels the URB sent as ``seqnum`` and returns the unlink status,
+           `STATUS_UNLINKED` if it was still pending."""
+        self._seqnum += 1
+        self.writer.write(_basic_header.pack(USBIP_CMD_UNLINK, self._seqnum, self.devid, 0, 0) +
+                          _cmd_unlink.pack(seqnum))
+        header = _basic_header.unpack(await self.reader.readexactly(_basic_header.size))
+        status = _ret_unlink.unpack(await self.reader.readexactly(_ret_unlink.size))[0]
+        if header[0] != USBIP_RET_UNLINK or header[1] != self._seqnum:
+            raise ConnectionError("Reply to {} out of order".format(header[1]))
+        return status
+
+    async def submit(self, ep, direction, *, length=0, data=b"", setup=bytes(8)):
+        """Returns ``(status, data)`` of one URB."""
+        self.send_submit(ep, direction, length=length, data=data, setup=setup)
+        header = _basic_header.unpack(await self.reader.readexactly(_basic_header.size))
+        status, actual_length, _, _, _ = _ret_submit.unpack(
+            await self.reader.readexactly(_ret_submit.size))
+        response = b""
+        if direction == USBIP_DIR_IN and status == STATUS_OK and actual_length:
+            response = await self.reader.readexactly(actual_length)
+        if header[1] != self._seqnum:
+            raise ConnectionError("Reply to {} out of order".format(header[1]))
+        return status, response
+
+    async def control(self, bmRequestType, bRequest, wValue=0, wIndex=0, wLength=0, data=b""):
+        direction = USBIP_DIR_IN if bmRequestType & 0x80 else USBIP_DIR_OUT
+        setup = _setup.pack(bmRequestType, bRequest, wValue, wIndex, wLength or len(data))
+        return await self.submit(0, direction, length=wLength, data=data, setup=setup)
+
+    async def get_descriptor(self, bDescriptorType, index=0, wIndex=0, wLength=0xFF):
+        recipient = 0x81 if bDescriptorType == 0x22 else 0x80
+        status, data = await self.control(recipient, REQUEST_GET_DESCRIPTOR,
+                                          (bDescriptorType << 8) | index, wIndex, wLength)
+        return data if status == STATUS_OK else None
+
+    async def enumerate(self):
+        """Runs a host style enumeration and returns the descriptors read, keyed like
+           `descriptor_set.DescriptorSet`."""
+        found = {}
+        device = await self.get_descriptor(standard.DeviceDescriptor.bDescriptorType, wLength=0x12)
+        found[(standard.DeviceDescriptor.bDescriptorType, 0, 0)] = device
+        for index in range(device[17]):
+            header = await self.get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, index, wLength=9)
+            total = struct.unpack_from("<H", header, 2)[0]
+            found[(standard.ConfigurationDescriptor.bDescriptorType, index, 0)] = \
+                await self.get_descriptor(standard.ConfigurationDescriptor.bDescriptorType, index, wLength=total)
+        langids = await self.get_descriptor(standard.StringDescriptor.bDescriptorType, 0)
+        if langids:
+            found[(standard.StringDescriptor.bDescriptorType, 0, 0)] = langids
+            langid = struct.unpack_from("<H", langids, 2)[0]
+            for index in (device[14], device[15], device[16]):
+                if index:
+                    found[(standard.StringDescriptor.bDescriptorType, index, langid)] = \
+                        await self.get_descriptor(standard.StringDescriptor.bDescriptorType, index, langid)
+        configuration = found[(standard.ConfigurationDescriptor.bDescriptorType, 0, 0)]
+        await self.control(0x00, REQUEST_SET_CONFIGURATION, configuration[5])
+        return found
@@ -20,35 +20,186 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import re
+import struct
+
+from . import frozen
 from . import standard
 
+def _offset_interface_fields(descriptor, base_interface_number):
+    changes = {}
+    for name in getattr(descriptor, "interface_fields", ()):
+        value = getattr(descriptor, name)
+        if isinstance(value, int):
+            changes[name] = value + base_interface_number
+        else:
+            changes[name] = type(value)(x + base_interface_number for x in value)
+    if not changes:
+        return descriptor
+    return frozen.update(descriptor, **changes)
+
 def join_interfaces(args, *, renumber_endpoints=True):
     """Renumbers interfaces and endpoints so they are compatible.
 
        ``args`` is any number of interface sequences (usually lists with
        `InterfaceDescriptor` s inside them). Interfaces within a sequence
        should be numbered beginning at 0x0. Endpoints should be numbered per
-       interface."""
+       interface.
+
+       An interface with a non-zero ``bAlternateSetting`` shares the number and
+       endpoints of the interface before it. A sequence may also hold an
+       `InterfaceAssociationDescriptor` in front of the interfaces it groups. Its
+       ``bFirstInterface`` and the ``interface_fields`` of class specific
+       subdescriptors, such as `cdc.Union`, are numbered within the sequence too and
+       are offset along with the interfaces.
+
+       Mutable descriptors are renumbered in place. Frozen ones (see
+       `frozen.freeze`) are left alone: the result holds renumbered copies of them
+       that share every descriptor that didn't change, so one frozen template can be
+       joined any number of times."""
     interfaces = []
+    interface_count = 0
     base_endpoint_number = 1
     for interface_set in args:
-        base_interface_number = len(interfaces)
-        for i, interface in enumerate(interface_set):
-            interfaces.append(interface)
-            interface.bInterfaceNumber = interfaces.index(interface)
-            max_endpoint_address = base_endpoint_number
+        base_interface_number = interface_count
+        interface_base_endpoint = base_endpoint_number
+        for interface in interface_set:
+            interface = _offset_interface_fields(interface, base_interface_number)
+            if interface.bDescriptorType != standard.InterfaceDescriptor.bDescriptorType:
+                interfaces.append(interface)
+                continue
+            if interface.bAlternateSetting == 0:
+                interface_count += 1
+                interface_base_endpoint = base_endpoint_number
+            max_endpoint_address = interface_base_endpoint
+            endpoint_used = False
+            subdescriptors = []
             for subdescriptor in interface.subdescriptors:
-                endpoint_used = False
+                subdescriptor = _offset_interface_fields(subdescriptor, base_interface_number)
                 if (subdescriptor.bDescriptorType ==
                         standard.EndpointDescriptor.bDescriptorType):
                     if renumber_endpoints:
                         endpoint_used = True
-                        subdescriptor.bEndpointAddress += base_endpoint_number
+                        subdescriptor = frozen.update(
+                            subdescriptor,
+                            bEndpointAddress=subdescriptor.bEndpointAddress + interface_base_endpoint)
                         endpoint_address = subdescriptor.bEndpointAddress & 0xf
                         max_endpoint_address = max(max_endpoint_address,
                                                 endpoint_address)
                     elif subdescriptor.bEndpointAddress == 0:
                         raise ValueError('Endpoint address must not be 0')
+                subdescriptors.append(subdescriptor)
+            changes = {"bInterfaceNumber": interface_count - 1}
+            if any(new is not old for new, old in zip(subdescriptors, interface.subdescriptors)):
+                changes["subdescriptors"] = subdescriptors
+            interfaces.append(frozen.update(interface, **changes))
             if endpoint_used:
-                base_endpoint_number = max_endpoint_address + 1
+                base_endpoint_number = max(base_endpoint_number,
+                                           max_endpoint_address + 1)
     return interfaces
+
+# Attributes that hold nested descriptors, in the order they are serialized after
+# their parent.
+CHILD_FIELDS = ("subdescriptors", "companion", "jacks_and_elements",
+                "audio_streaming_interfaces", "midi_streaming_interfaces", "capabilities")
+
+def children(descriptor):
+    """Yields ``(path, child)`` for the descriptors nested directly in ``descriptor``.
+       ``path`` is the attribute name, followed by the index for lists."""
+    for name in CHILD_FIELDS:
+        value = getattr(descriptor, name, None)
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            for index, child in enumerate(value):
+                yield (name, index), child
+        else:
+            yield (name,), value
+
+def walk(tree):
+    """Yields ``(depth, path, descriptor)`` for every descriptor in ``tree`` in
+       serialization order, parents before their children.
+
+       ``tree`` is a descriptor or nested lists of them, such as the result of
+       `join_interfaces`. ``path`` is a tuple of list indices and attribute names
+       from ``tree`` to the descriptor. Lists don't add depth. It uses its own stack
+       rather than recursion, so any depth of nesting works."""
+    stack = [(0, (), tree)]
+    while stack:
+        depth, path, node = stack.pop()
+        if isinstance(node, (list, tuple)):
+            for index in range(len(node) - 1, -1, -1):
+                stack.append((depth, path + (index,), node[index]))
+            continue
+        yield depth, path, node
+        nested = [(depth + 1, path + child_path, child) for child_path, child in children(node)]
+        stack.extend(reversed(nested))
+
+_hex_prefixes = ("bm", "bcd")
+_format_codes = re.compile(r"\d*[a-zA-Z?]")
+_hex_names = ("idVendor", "idProduct", "bEndpointAddress")
+# Read from every descriptor without ``fields``. Some of them are properties.
+_header_names = ("bLength", "bDescriptorType", "bDescriptorSubtype", "bString",
+                 "wLength", "wDescriptorType")
+_directions = {0: "OUT", 0x80: "IN"}
+
+def _format_value(name, value, size):
+    if isinstance(value, bool) or not isinstance(value, int):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return "{} bytes".format(len(value))
+        if isinstance(value, (list, tuple)):
+            if all(isinstance(x, int) for x in value):
+                return " ".join(str(x) for x in value)
+            return "{} items".format(len(value))
+        return repr(value)
+    if name.startswith(_hex_prefixes) or name in _hex_names:
+        text = "0x{:0{}x}".format(value, size * 2)
+        if name == "bEndpointAddress":
+            text += "  EP {} {}".format(value & 0x0F, _directions[value & 0x80])
+        return text
+    return str(value)
+
+def field_items(descriptor):
+    """Returns ``(name, value, size)`` for each field of ``descriptor`` alone, with
+       ``size`` in bytes. Descriptors with ``fields`` list those. For the rest, it is
+       their header fields and public attributes besides ``description`` and nested
+       descriptors."""
+    cls = type(descriptor)
+    fields = getattr(cls, "fields", None)
+    if fields is not None:
+        # Sizes of each field from the format, skipping the byte order. Strings such
+        # as "8s" are one field.
+        sizes = [struct.calcsize("<" + code) for code in _format_codes.findall(cls.fmt.lstrip("<"))]
+        return [(name, getattr(descriptor, name), size) for name, size in zip(fields, sizes)]
+    items = []
+    for name in _header_names:
+        value = getattr(descriptor, name, None)
+        if value is not None:
+            items.append((name, value, 1))
+    for name, value in vars(descriptor).items():
+        if (name.startswith("_") or name == "description" or name in CHILD_FIELDS or
+                name in _header_names):
+            continue
+        items.append((name, value, 2 if name.startswith(("w", "bcd")) else 1))
+    return items
+
+def describe(descriptor):
+    """Yields the lines describing the fields of ``descriptor`` alone, in the style
+       of ``lsusb -v``. Nested descriptors are left to `walk`. Fields computed during
+       serialization, such as ``bNumEndpoints``, show their last serialized value."""
+    cls = type(descriptor)
+    description = getattr(descriptor, "description", None)
+    if description is None:
+        yield "{}:".format(cls.__name__)
+    else:
+        yield "{}: {}".format(cls.__name__, description)
+    for name, value, size in field_items(descriptor):
+        yield "  {:<22}{}".format(name, _format_value(name, value, size))
+
+def iter_notes(tree):
+    """Lazily yields `describe` lines for every descriptor in ``tree``, indented by
+       their depth."""
+    for depth, _, descriptor in walk(tree):
+        indent = "  " * depth
+        for line in describe(descriptor):
+            yield indent + line
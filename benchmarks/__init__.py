@@ -0,0 +1,38 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Benchmarks
+==========
+
+Synthetic workloads that exercise descriptor serialization, joining, parsing,
+HID report layout and emission at scale. Run them from the repository root::
+
+    python -m benchmarks --output results.json --baseline benchmarks/baseline.json
+
+Each workload reports its throughput, the memory its run allocates at peak and
+what it leaves allocated, as measured by `tracemalloc`. Results are saved as JSON
+and compared against a baseline, and the run fails when any workload's memory use
+regresses by more than the threshold. Throughput from another machine can't be
+compared directly, so ``--compare-throughput`` compares each workload's speedup
+with the median speedup of the run instead.
+"""
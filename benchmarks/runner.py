@@ -0,0 +1,202 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from . import workloads
+
+"""
+Runs the workloads, saves their results as JSON and compares them with a baseline.
+"""
+
+FORMAT_VERSION = 1
+
+# Metrics where bigger is better. Regressions in the others are increases.
+HIGHER_IS_BETTER = ("ops_per_second",)
+COMPARED = ("ops_per_second", "peak_bytes", "retained_bytes")
+
+
+def measure(function, *, min_seconds=0.2, repeat=5):
+    """Returns the metrics of calling ``function`` repeatedly."""
+    # Calibrate a batch size that takes about min_seconds.
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_seconds / elapsed) + 1))
+
+    best = elapsed
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    # One more call, traced, for memory.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        before_snapshot = tracemalloc.take_snapshot()
+        result = function()
+        after, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().compare_to(before_snapshot, "filename")
+    finally:
+        tracemalloc.stop()
+    del result
+    return {
+        "ops_per_second": number / best,
+        "seconds_per_op": best / number,
+        "peak_bytes": peak - before,
+        "retained_bytes": after - before,
+        "retained_blocks": sum(max(stat.count_diff, 0) for stat in stats),
+    }
+
+
+def run(names=None, *, min_seconds=0.2, repeat=5, progress=None):
+    """Returns ``{name: metrics}`` for the workloads in ``names``, or all of them."""
+    results = {}
+    for name in names or sorted(workloads.WORKLOADS):
+        function = workloads.WORKLOADS[name]()
+        results[name] = measure(function, min_seconds=min_seconds, repeat=repeat)
+        if progress is not None:
+            progress(name, results[name])
+    return results
+
+
+def document(results):
+    """Wraps ``results`` with what's needed to judge a comparison with them later."""
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(results, baseline, *, threshold=0.25, throughput=False):
+    """Returns ``[(name, metric, baseline, current, change)]`` for every metric in
+       `COMPARED` that is more than ``threshold`` worse than ``baseline``. ``change``
+       is the signed fraction it changed by, so a throughput drop is negative.
+
+       Memory is compared directly. Throughput depends on the machine, so it's only
+       compared when ``throughput`` is true, and then relative to the other
+       workloads: each workload's speedup over the baseline is divided by the
+       median speedup of the run, which cancels out a uniformly faster or slower
+       machine."""
+    regressions = []
+    speedups = {}
+    for name, metrics in sorted(results.items()):
+        old_metrics = baseline.get(name)
+        if old_metrics is None:
+            continue
+        for metric in COMPARED:
+            old = old_metrics.get(metric)
+            new = metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                if throughput and old and new:
+                    speedups[(name, metric)] = (old, new)
+                continue
+            # Small allocations vary with interpreter internals, so allow 4 KiB.
+            if old and (new - old - 4096) / old > threshold:
+                regressions.append((name, metric, old, new, (new - old) / old))
+    if speedups:
+        ratios = sorted(new / old for old, new in speedups.values())
+        middle = len(ratios) // 2
+        median = ratios[middle] if len(ratios) % 2 else (ratios[middle - 1] + ratios[middle]) / 2
+        for (name, metric), (old, new) in speedups.items():
+            change = new / old / median - 1
+            if -change > threshold:
+                regressions.append((name, metric, old, new, change))
+    regressions.sort()
+    return regressions
+
+
+def _print_result(name, metrics):
+    print("{:32} {:>12.1f} ops/s {:>10} peak B {:>10} retained B".format(
+        name, metrics["ops_per_second"], metrics["peak_bytes"], metrics["retained_bytes"]))
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Runs the descriptor benchmarks.")
+    parser.add_argument("workloads", nargs="*", help="workloads to run, all by default")
+    parser.add_argument("--output", help="save results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fraction a metric may get worse by (default 0.25)")
+    parser.add_argument("--compare-throughput", action="store_true",
+                        help="also compare throughput, relative to the run's median speedup")
+    parser.add_argument("--min-seconds", type=float, default=0.2,
+                        help="minimum time per timed repetition")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="list the workloads")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name in sorted(workloads.WORKLOADS):
+            print(name)
+        return 0
+    unknown = [name for name in args.workloads if name not in workloads.WORKLOADS]
+    if unknown:
+        parser.error("unknown workloads: {}".format(", ".join(unknown)))
+
+    results = run(args.workloads, min_seconds=args.min_seconds, repeat=args.repeat,
+                  progress=_print_result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document(results), f, indent=2, sort_keys=True)
+            f.write("\n")
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("version") != FORMAT_VERSION:
+        print("Baseline format {} isn't {}".format(baseline.get("version"), FORMAT_VERSION))
+        return 2
+    regressions = compare(results, baseline["results"], threshold=args.threshold,
+                          throughput=args.compare_throughput)
+    for name, metric, old, new, change in regressions:
+        print("REGRESSION {} {}: {:.6g} -> {:.6g} ({:+.0%})".format(name, metric, old, new, change))
+    return 1 if regressions else 0
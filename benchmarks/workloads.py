@@ -0,0 +1,451 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import atexit
+import importlib
+import importlib.util
+import io
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+
+from adafruit_usb_descriptor import capture
+from adafruit_usb_descriptor import cdc
+from adafruit_usb_descriptor import codegen
+from adafruit_usb_descriptor import columnar
+from adafruit_usb_descriptor import descriptor_set
+from adafruit_usb_descriptor import diff
+from adafruit_usb_descriptor import emit
+from adafruit_usb_descriptor import frozen
+from adafruit_usb_descriptor import fuzz
+from adafruit_usb_descriptor import hid
+from adafruit_usb_descriptor import midi
+from adafruit_usb_descriptor import msc
+from adafruit_usb_descriptor import parse
+from adafruit_usb_descriptor import spec
+from adafruit_usb_descriptor import standard
+from adafruit_usb_descriptor import sysfs
+from adafruit_usb_descriptor import util
+
+"""
+Each workload is a function that does any setup and returns the function to time.
+One call of the returned function is one operation.
+"""
+
+WORKLOADS = {}
+
+
+def workload(function):
+    WORKLOADS[function.__name__] = function
+    return function
+
+
+def fresh_import(names):
+    """Returns a function that imports ``names``, package modules, as a new process
+       would: from compiled bytecode, with none of the package imported yet. The
+       modules imported before are put back after each call."""
+    package = "adafruit_usb_descriptor"
+
+    def run():
+        saved = {name: module for name, module in sys.modules.items()
+                 if name == package or name.startswith(package + ".")}
+        for name in saved:
+            del sys.modules[name]
+        try:
+            for name in names:
+                importlib.import_module(name)
+        finally:
+            for name in [name for name in sys.modules
+                         if name == package or name.startswith(package + ".")]:
+                del sys.modules[name]
+            sys.modules.update(saved)
+    return run
+
+
+@workload
+def import_package():
+    return fresh_import(["adafruit_usb_descriptor"])
+
+
+@workload
+def import_descriptor_modules():
+    return fresh_import(["adafruit_usb_descriptor." + name for name in
+                         ("standard", "cdc", "hid", "midi", "msc", "audio", "audio10")])
+
+
+def hid_interface(report, *, description="HID"):
+    return [standard.InterfaceDescriptor(
+        description=description,
+        bInterfaceClass=hid.HID_CLASS,
+        subdescriptors=[
+            hid.HIDDescriptor(description=description, wDescriptorLength=len(bytes(report))),
+            standard.EndpointDescriptor(
+                description="{} in".format(description),
+                bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_IN,
+                bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+                wMaxPacketSize=64,
+                bInterval=8),
+        ])]
+
+
+def midi_interface(jack_count=64):
+    """MIDI streaming interface whose header has ``jack_count`` jacks, half of them
+       external OUT jacks wired to embedded IN jacks."""
+    in_jacks = [midi.InJackDescriptor(description="in {}".format(i),
+                                      bJackType=midi.JACK_TYPE_EMBEDDED)
+                for i in range(jack_count // 2)]
+    out_jacks = [midi.OutJackDescriptor(description="out {}".format(i),
+                                        bJackType=midi.JACK_TYPE_EXTERNAL,
+                                        input_pins=[(jack, 1)])
+                 for i, jack in enumerate(in_jacks)]
+    return [standard.InterfaceDescriptor(
+        description="MIDI",
+        bInterfaceClass=0x01,
+        bInterfaceSubClass=0x03,
+        subdescriptors=[
+            midi.Header(jacks_and_elements=in_jacks + out_jacks),
+            standard.EndpointDescriptor(
+                description="MIDI out",
+                bEndpointAddress=0x0 | standard.EndpointDescriptor.DIRECTION_OUT,
+                bmAttributes=standard.EndpointDescriptor.TYPE_BULK),
+            midi.DataEndpointDescriptor(baAssocJack=in_jacks),
+        ])]
+
+
+def composite_functions():
+    return (cdc.acm_functions(4) +
+            [msc.mass_storage_interfaces(),
+             cdc.network_interfaces(iMACAddress=0),
+             hid_interface(hid.ReportDescriptor.MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT),
+             midi_interface()])
+
+
+def composite_configuration():
+    interfaces = util.join_interfaces(composite_functions())
+    configuration = standard.ConfigurationDescriptor(
+        description="composite",
+        wTotalLength=0,
+        bNumInterfaces=sum(1 for d in interfaces
+                           if isinstance(d, standard.InterfaceDescriptor)
+                           and d.bAlternateSetting == 0))
+    return [configuration] + interfaces
+
+
+@workload
+def serialize_composite():
+    tree = composite_configuration()
+    return lambda: b"".join(bytes(descriptor) for descriptor in tree)
+
+
+@workload
+def serialize_composite_compiled():
+    serializer = codegen.compile_serializer(composite_configuration())
+    return serializer
+
+
+@workload
+def build_composite():
+    return lambda: b"".join(bytes(descriptor) for descriptor in composite_configuration())
+
+
+@workload
+def join_64_interfaces_frozen():
+    # 32 ACM functions have 64 interfaces.
+    template = frozen.freeze(cdc.acm_functions(1)[0])
+    templates = [template] * 32
+    return lambda: util.join_interfaces(templates)
+
+
+@workload
+def join_64_interfaces_mutable():
+    return lambda: util.join_interfaces(cdc.acm_functions(32))
+
+
+@workload
+def string_table_10k():
+    # StringTable indices stop at 255, so 10000 strings take 40 tables.
+    strings = ["String {:05d} of the table".format(i) for i in range(10000)]
+
+    def run():
+        tables = []
+        for start in range(0, len(strings), 250):
+            table = standard.StringTable()
+            for string in strings[start:start + 250]:
+                table.index(string)
+            for index in range(1, len(table)):
+                table.descriptor(index)
+            tables.append(table)
+        return tables
+    return run
+
+
+def renumber_report_ids(report, first_id):
+    """Returns ``report`` with every Report ID item offset so the first one is
+       ``first_id``, and the next unused ID."""
+    data = bytearray(report)
+    offset = 0
+    next_id = first_id
+    base = None
+    while offset < len(data):
+        prefix = data[offset]
+        size = (0, 1, 2, 4)[prefix & 0x03]
+        if prefix == 0x85:
+            if base is None:
+                base = data[offset + 1]
+            data[offset + 1] = data[offset + 1] - base + first_id
+            next_id = max(next_id, data[offset + 1] + 1)
+        offset += 1 + size
+    return bytes(data), next_id
+
+
+def report_layout(report):
+    """Returns the length in bits of the input report with each report ID."""
+    lengths = {}
+    report_id = 0
+    report_size = 0
+    report_count = 0
+    offset = 0
+    while offset < len(report):
+        prefix = report[offset]
+        size = (0, 1, 2, 4)[prefix & 0x03]
+        value = int.from_bytes(report[offset + 1:offset + 1 + size], "little")
+        tag = prefix & 0xFC
+        if tag == 0x84:
+            report_id = value
+        elif tag == 0x74:
+            report_size = value
+        elif tag == 0x94:
+            report_count = value
+        elif tag == 0x80:
+            lengths[report_id] = lengths.get(report_id, 0) + report_size * report_count
+        offset += 1 + size
+    return lengths
+
+
+@workload
+def hid_large_report():
+    # 60 copies of the four report composite use report IDs 1 to 240.
+    base = bytes(hid.ReportDescriptor.MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT)
+
+    def run():
+        parts = []
+        next_id = 1
+        for _ in range(60):
+            part, next_id = renumber_report_ids(base, next_id)
+            parts.append(part)
+        report = hid.ReportDescriptor(description="large", report_descriptor=b"".join(parts))
+        layout = report_layout(bytes(report))
+        return b"".join(bytes(d) for d in hid_interface(report)), layout
+    return run
+
+
+@workload
+def midi_64_jacks():
+    interface = midi_interface(64)
+    return lambda: bytes(interface[0])
+
+
+@workload
+def parse_ntb16():
+    rng = random.Random(0)
+    frames = [bytes(rng.randrange(256) for _ in range(rng.randrange(60, 1515)))
+              for _ in range(64)]
+    buffer = bytearray(65536)
+    length, count = cdc.pack_ntb16(buffer, frames)
+    block = bytes(buffer[:length])
+    return lambda: sum(len(datagram) for datagram in cdc.unpack_ntb16(block))
+
+
+@workload
+def parse_cbw():
+    cbw = msc.CommandBlockWrapper()
+    cbw.pack_read10(dCBWTag=1, lba=1234, blocks=8)
+    blob = bytes(cbw.buffer) * 1000
+    view = memoryview(blob)
+    size = msc.CommandBlockWrapper.size
+
+    def run():
+        total = 0
+        for offset in range(0, len(blob), size):
+            parsed = msc.CommandBlockWrapper(view[offset:offset + size])
+            parsed.validate()
+            total += parsed.read_write10()[1]
+        return total
+    return run
+
+
+def composite_descriptor_set():
+    strings = standard.StringTable()
+    tree = composite_configuration()
+    strings.assign(tree)
+    device = standard.DeviceDescriptor(description="benchmark",
+                                       idVendor=0x239A,
+                                       idProduct=0x8000,
+                                       iManufacturer=strings.index("Adafruit Industries"),
+                                       iProduct=strings.index("Benchmark"),
+                                       iSerialNumber=strings.index("123456"))
+    return descriptor_set.DescriptorSet(device=device, configurations=[tree], strings=strings)
+
+
+@workload
+def freeze_descriptor_set():
+    descriptors = composite_descriptor_set()
+    return descriptors.freeze
+
+
+@workload
+def build_descriptor_set():
+    return composite_descriptor_set
+
+
+@workload
+def load_spec_descriptor_set():
+    """Loads what `build_descriptor_set` builds from its binary spec."""
+    data = spec.dumps(composite_descriptor_set())
+    return lambda: spec.loads(data)
+
+
+@workload
+def emit_c_source():
+    descriptors = composite_descriptor_set()
+    return lambda: sum(len(line) for line in emit.iter_c_source(descriptors))
+
+
+def configuration_corpus(count):
+    """Returns ``count`` device and configuration blobs of varying composites."""
+    blobs = []
+    for i in range(count):
+        device = standard.DeviceDescriptor(description="corpus",
+                                           idVendor=0x239A,
+                                           idProduct=i & 0xFFFF,
+                                           iManufacturer=0,
+                                           iProduct=0,
+                                           iSerialNumber=0)
+        interfaces = util.join_interfaces(cdc.acm_functions(1 + i % 3) +
+                                          [msc.mass_storage_interfaces()])
+        body = b"".join(bytes(descriptor) for descriptor in interfaces)
+        configuration = standard.ConfigurationDescriptor(description="corpus",
+                                                         wTotalLength=9 + len(body),
+                                                         bNumInterfaces=3 + 2 * (i % 3))
+        blobs.append(bytes(device) + bytes(configuration) + body)
+    return blobs
+
+
+@workload
+def parse_device_file():
+    descriptors = composite_descriptor_set()
+    blob = bytes(descriptors.get_descriptor(1)) + bytes(descriptors.get_descriptor(2))
+    return lambda: parse.parse_device_file(blob)
+
+
+@workload
+def fuzz_100_trees():
+    """Round trips 100 random trees through parsing, with 4 malformed mutants of
+       each. Trees per second are 100 times the operations per second."""
+    return lambda: fuzz.run(100)
+
+
+@workload
+def sysfs_rescan_256():
+    """Rescans 256 unchanged devices, with an interface directory each."""
+    root = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, root, True)
+    for i, blob in enumerate(configuration_corpus(256)):
+        name = "1-{}".format(i + 1)
+        os.makedirs(os.path.join(root, name))
+        os.makedirs(os.path.join(root, name + ":1.0"))
+        with open(os.path.join(root, name, "descriptors"), "wb") as f:
+            f.write(blob)
+    scanner = sysfs.Scanner(root)
+    scanner.scan()
+    return scanner.scan
+
+
+def usbmon_capture(transfers):
+    """Returns a pcap capture of a HID and MIDI device enumerating, followed by
+       ``transfers`` HID reports and as many MIDI transfers."""
+    report = hid.ReportDescriptor.MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT
+    interfaces = util.join_interfaces([hid_interface(report), midi_interface(4)])
+    body = b"".join(bytes(descriptor) for descriptor in interfaces)
+    configuration = bytes(standard.ConfigurationDescriptor(description="capture",
+                                                           wTotalLength=9 + len(body),
+                                                           bNumInterfaces=2)) + body
+    device = bytes(standard.DeviceDescriptor(description="capture",
+                                             idVendor=0x239A,
+                                             idProduct=0x8000,
+                                             iManufacturer=0,
+                                             iProduct=0,
+                                             iSerialNumber=0))
+    stream = io.BytesIO()
+    writer = capture.Writer(stream)
+    urb_id = 0
+    for wValue, wIndex, response in ((0x0100, 0, device),
+                                     (0x0200, 0, configuration[:9]),
+                                     (0x0200, 0, configuration),
+                                     (0x2200, 0, bytes(report))):
+        urb_id += 1
+        setup = struct.pack("<BBHHH", 0x81 if wValue == 0x2200 else 0x80, 6, wValue, wIndex,
+                            len(response))
+        writer.write(capture.Urb(urb_id, urb_id, capture.URB_SUBMIT, capture.TRANSFER_CONTROL,
+                                 0x80, 5, 1, setup, -115, len(response), b""))
+        writer.write(capture.Urb(urb_id, urb_id, capture.URB_COMPLETE,
+                                 capture.TRANSFER_CONTROL, 0x80, 5, 1, None, 0,
+                                 len(response), response))
+    mouse = bytes([hid.ReportDescriptor.REPORT_IDS["MOUSE"], 1, 5, 0xFB, 0])
+    notes = bytes([0x09, 0x90, 0x40, 0x7F, 0x08, 0x80, 0x40, 0x00] * 8)
+    for i in range(transfers):
+        timestamp = 10 + i / 1000
+        writer.write(capture.Urb(timestamp, 1000, capture.URB_COMPLETE,
+                                 capture.TRANSFER_INTERRUPT, 0x81, 5, 1, None, 0,
+                                 len(mouse), mouse))
+        writer.write(capture.Urb(timestamp, 1001, capture.URB_SUBMIT, capture.TRANSFER_BULK,
+                                 0x02, 5, 1, None, -115, len(notes), notes))
+    return stream.getvalue()
+
+
+@workload
+def decode_usbmon_capture():
+    """Decodes a capture of 1000 HID reports and 1000 MIDI transfers, 0.3 MB."""
+    data = usbmon_capture(1000)
+    return lambda: sum(1 for _ in capture.Decoder().events(io.BytesIO(data)))
+
+
+@workload
+def diff_100_variants():
+    """Diffs 100 composite configurations, each with one changed endpoint."""
+    base = composite_configuration()
+    variants = {}
+    for i in range(100):
+        variant = composite_configuration()
+        variant[-1].subdescriptors[1].wMaxPacketSize = 8 + i
+        variants[i] = variant
+    return lambda: diff.Differ().diff_variants(base, variants)
+
+
+if importlib.util.find_spec("numpy") is not None:
+    @workload
+    def columnar_endpoints_10k():
+        corpus = b"".join(configuration_corpus(10000))
+        return lambda: columnar.Corpus(corpus).endpoints()
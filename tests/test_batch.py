@@ -0,0 +1,57 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from adafruit_usb_descriptor import batch, cdc, frozen, util
+
+"""Tests of the batch builder"""
+
+
+def serialize(descriptors):
+    return b"".join(bytes(d) for d in descriptors)
+
+
+def test_shared_reuses_frozen_tree():
+    first = batch.shared(("test", "acm"), lambda: cdc.acm_functions(1)[0])
+    second = batch.shared(("test", "acm"), lambda: None)
+    assert first is second
+    assert all(frozen.is_frozen(d) for d in first)
+    before = serialize(first)
+
+    joined = util.join_interfaces([cdc.acm_functions(1)[0], first])
+    assert joined[4].bInterfaceNumber == 2
+    assert first[1].bInterfaceNumber == 0
+    assert serialize(second) == before
+    # Descriptors that don't change are shared, not copied.
+    assert joined[4].subdescriptors[0] is first[1].subdescriptors[0]
+
+
+def build_variant(variant):
+    return variant["a"] * 10 + variant["b"]
+
+
+def test_build_in_process():
+    results = list(batch.build({"a": [1, 2], "b": [3, 4]}, build_variant,
+                               workers=0, key=lambda v: (v["a"], v["b"] % 2),
+                               exclude=lambda v: v == {"a": 2, "b": 4}))
+    assert [(r.variant, r.value) for r in results] == [
+        ({"a": 1, "b": 3}, 13), ({"a": 1, "b": 4}, 14), ({"a": 2, "b": 3}, 23)]
+    assert batch.summary(results)["errors"] == 0
@@ -0,0 +1,99 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+
+import pytest
+
+from adafruit_usb_descriptor import cache, cdc
+
+"""Tests of the content addressed descriptor cache"""
+
+
+def entry_size(artifacts):
+    return len(cache._encode(artifacts))
+
+
+def test_structural_hash():
+    first = cdc.acm_functions(1)[0]
+    assert cache.structural_hash(first) == cache.structural_hash(cdc.acm_functions(1)[0])
+    before = cache.structural_hash(first)
+    # Serializing fills in derived fields, which aren't hashed.
+    b"".join(bytes(d) for d in first)
+    assert cache.structural_hash(first) == before
+    first[1].subdescriptors[-1].wMaxPacketSize = 8
+    assert cache.structural_hash(first) != before
+
+
+def test_get_or_build(tmp_path):
+    descriptors = cache.DescriptorCache(str(tmp_path))
+    tree = cdc.acm_functions(1)[0]
+    calls = []
+
+    def build(tree):
+        calls.append(tree)
+        return {"image": b"".join(bytes(d) for d in tree), "c": b"// c"}
+
+    first = descriptors.get_or_build(tree, build)
+    second = descriptors.get_or_build(cdc.acm_functions(1)[0], build)
+    assert first == second and len(calls) == 1
+    assert descriptors.get("missing") is None
+
+
+def test_eviction_is_least_recently_used(tmp_path):
+    artifacts = {"image": bytes(100)}
+    descriptors = cache.DescriptorCache(str(tmp_path), max_bytes=3 * entry_size(artifacts))
+    for age, key in enumerate(("a", "b", "c")):
+        descriptors.put(key, artifacts)
+        os.utime(descriptors._entry(key), (1000 + age, 1000 + age))
+    # Reading "a" makes it the most recently used, so "b" goes first.
+    assert descriptors.get("a") == artifacts
+    descriptors.put("d", artifacts)
+    assert sorted(os.listdir(str(tmp_path))) == ["a.usbc", "c.usbc", "d.usbc"]
+    descriptors.clear()
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_failed_put_keeps_old_entry(tmp_path, monkeypatch):
+    descriptors = cache.DescriptorCache(str(tmp_path))
+    descriptors.put("key", {"image": b"old"})
+
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        descriptors.put("key", {"image": b"new"})
+    monkeypatch.undo()
+    assert os.listdir(str(tmp_path)) == ["key.usbc"]
+    assert descriptors.get("key") == {"image": b"old"}
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    descriptors = cache.DescriptorCache(str(tmp_path))
+    descriptors.put("key", {"image": bytes(64), "c": b"int x;"})
+    with open(descriptors._entry("key"), "r+b") as f:
+        f.truncate(30)
+    assert descriptors.get("key") is None
+    with open(descriptors._entry("key"), "wb") as f:
+        f.write(b"junk")
+    assert descriptors.get("key") is None
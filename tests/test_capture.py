@@ -0,0 +1,142 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import io
+import struct
+
+import pytest
+
+from adafruit_usb_descriptor import capture, hid, standard
+
+"""Tests of the usbmon capture decoder"""
+
+REPORT = hid.ReportDescriptor.GENERIC_MOUSE_REPORT.report_descriptor
+
+
+def configuration():
+    endpoint = standard.EndpointDescriptor(description="ep", bEndpointAddress=0x81,
+                                           bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+                                           wMaxPacketSize=4, bInterval=10)
+    interface = standard.InterfaceDescriptor(
+        description="mouse", bInterfaceClass=hid.HID_CLASS,
+        subdescriptors=[hid.HIDDescriptor(description="hid", wDescriptorLength=len(REPORT)),
+                        endpoint])
+    body = bytes(interface)
+    return bytes(standard.ConfigurationDescriptor(description="c", wTotalLength=9 + len(body),
+                                                  bNumInterfaces=1)) + body
+
+
+def urb(timestamp, urb_id, urb_type, transfer_type, endpoint, *, setup=None, data=b""):
+    return capture.Urb(timestamp, urb_id, urb_type, transfer_type, endpoint, 5, 1, setup,
+                       -115 if urb_type == capture.URB_SUBMIT else 0, len(data), data)
+
+
+def get_descriptor(timestamp, urb_id, wValue, wIndex, data):
+    setup = struct.pack("<BBHHH", 0x80 if wValue >> 8 != 0x22 else 0x81,
+                        capture.REQUEST_GET_DESCRIPTOR, wValue, wIndex, len(data))
+    return [urb(timestamp, urb_id, capture.URB_SUBMIT, capture.TRANSFER_CONTROL, 0x80,
+                setup=setup),
+            urb(timestamp + 0.001, urb_id, capture.URB_COMPLETE, capture.TRANSFER_CONTROL, 0x80,
+                data=data)]
+
+
+def enumeration():
+    set_configuration = struct.pack("<BBHHH", 0, capture.REQUEST_SET_CONFIGURATION, 1, 0, 0)
+    return (get_descriptor(1.0, 1, 0x0200, 0, configuration()[:9])
+            + get_descriptor(1.1, 2, 0x0200, 0, configuration())
+            + get_descriptor(1.2, 3, 0x2200, 0, REPORT)
+            + [urb(1.3, 4, capture.URB_SUBMIT, capture.TRANSFER_CONTROL, 0x00,
+                   setup=set_configuration),
+               urb(1.4, 5, capture.URB_COMPLETE, capture.TRANSFER_INTERRUPT, 0x81,
+                   data=bytes([1, 5, 0xFF, 0])),
+               urb(1.5, 6, capture.URB_COMPLETE, capture.TRANSFER_INTERRUPT, 0x82,
+                   data=bytes([1]))])
+
+
+def pcap(linktype):
+    stream = io.BytesIO()
+    writer = capture.Writer(stream, linktype=linktype)
+    for item in enumeration():
+        writer.write(item)
+    return stream.getvalue()
+
+
+def pcapng(linktype):
+    """The pcap records of ``linktype`` in a pcapng section with nanosecond times."""
+    def block(block_type, body):
+        body += bytes(-len(body) % 4)
+        return struct.pack("<II", block_type, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+    data = block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1))
+    data += block(1, struct.pack("<HHI", linktype, 0, 0) + struct.pack("<HHB3xHH", 9, 1, 9, 0, 0))
+    records = io.BytesIO(pcap(linktype)[24:])
+    while True:
+        header = records.read(16)
+        if not header:
+            return data
+        seconds, microseconds, captured, _ = struct.unpack("<IIII", header)
+        nanoseconds = seconds * 10**9 + microseconds * 1000
+        packet = records.read(captured)
+        data += block(6, struct.pack("<IIIII", 0, nanoseconds >> 32, nanoseconds & 0xFFFFFFFF,
+                                     captured, captured) + packet)
+
+
+def check_events(events):
+    assert [type(event) for event in events] == [capture.DescriptorEvent] * 3 + [capture.ReportEvent]
+    assert events[0].descriptor is None
+    assert events[1].descriptor[1].bInterfaceClass == hid.HID_CLASS
+    assert bytes(events[2].descriptor) == REPORT
+    report = events[3]
+    assert (report.bus, report.device, report.endpoint) == (1, 5, 0x81)
+    assert report.values[(0x01, 0x30)] == 5 and report.values[(0x01, 0x31)] == -1
+    assert report.timestamp == pytest.approx(1.4)
+
+
+@pytest.mark.parametrize("linktype", [capture.LINKTYPE_USB_LINUX, capture.LINKTYPE_USB_LINUX_MMAPPED])
+def test_pcap(linktype):
+    data = pcap(linktype)
+    header_size = 48 if linktype == capture.LINKTYPE_USB_LINUX else 64
+    assert len(data) == 24 + sum(16 + header_size + len(item.data) for item in enumeration())
+    decoder = capture.Decoder()
+    check_events(list(decoder.events(io.BytesIO(data))))
+    assert decoder.throughput.bytes == len(data)
+    assert decoder.throughput.packets == len(enumeration())
+
+
+@pytest.mark.parametrize("linktype", [capture.LINKTYPE_USB_LINUX, capture.LINKTYPE_USB_LINUX_MMAPPED])
+def test_pcapng(linktype):
+    check_events(list(capture.Decoder().events(io.BytesIO(pcapng(linktype)))))
+
+
+def test_iter_urbs():
+    urbs = list(capture.iter_urbs(io.BytesIO(pcap(capture.LINKTYPE_USB_LINUX_MMAPPED))))
+    assert [(u.id, u.type, bytes(u.data)) for u in urbs] == [
+        (u.id, u.type, u.data) for u in enumeration()]
+    assert urbs[0].setup == enumeration()[0].setup
+    assert urbs[1].setup is None
+
+
+def test_bad_captures():
+    assert list(capture.iter_records(io.BytesIO())) == []
+    with pytest.raises(ValueError):
+        list(capture.iter_records(io.BytesIO(b"nope" + bytes(20))))
+    with pytest.raises(ValueError):
+        list(capture.iter_urbs(io.BytesIO(pcap(capture.LINKTYPE_USB_LINUX)[:-1])))
@@ -0,0 +1,78 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import cdc
+
+"""Tests of the NTB16 codec"""
+
+
+def test_ntb16_round_trip():
+    frames = [bytes([i]) * (60 + i) for i in range(10)]
+    buffer = bytearray(2048)
+    length, count = cdc.pack_ntb16(buffer, frames, divisor=4, payload_remainder=2)
+    assert count == len(frames)
+    assert [bytes(d) for d in cdc.unpack_ntb16(buffer[:length])] == frames
+
+
+def test_ntb16_partial():
+    frames = [bytes(600)] * 4
+    buffer = bytearray(1536)
+    length, count = cdc.pack_ntb16(buffer, frames)
+    assert count == 2
+    assert len(list(cdc.unpack_ntb16(buffer[:length]))) == 2
+
+
+def test_empty_ntb16():
+    buffer = bytearray(64)
+    length, count = cdc.pack_ntb16(buffer, [])
+    assert count == 0
+    # A 12 byte NTH16 and the minimum 16 byte NDP16.
+    assert length == 28
+    assert list(cdc.unpack_ntb16(buffer[:length])) == []
+
+
+def test_ntb16_block_length_limit():
+    # Everything in an NTB16, including its NDP16, has 16 bit offsets.
+    buffer = bytearray(80000)
+    with pytest.raises(ValueError):
+        cdc.pack_ntb16(buffer, [bytes(65523)])
+    length, count = cdc.pack_ntb16(buffer, [bytes(40000), bytes(30000)])
+    assert count == 1 and length <= 0xFFFF
+    assert [len(d) for d in cdc.unpack_ntb16(buffer[:length])] == [40000]
+
+
+def test_ntb16_parameters():
+    parameters = cdc.NTBParameters(dwNtbInMaxSize=256, wNdpInDivisor=8,
+                                   wNdpInPayloadRemainder=2, wNdpInAlignment=8)
+    frames = [bytes([i]) * 61 for i in range(4)]
+    buffer = bytearray(2048)
+    length, count = cdc.pack_ntb16(buffer, frames, parameters=parameters)
+    assert length <= 256 and count == 3
+    datagrams = list(cdc.unpack_ntb16(buffer[:length]))
+    assert [bytes(d) for d in datagrams] == frames[:3]
+    ndp_index = int.from_bytes(buffer[10:12], "little")
+    assert ndp_index % 8 == 0
+    for i in range(count):
+        index = int.from_bytes(buffer[ndp_index + 8 + 4 * i:ndp_index + 10 + 4 * i], "little")
+        assert index % 8 == 2
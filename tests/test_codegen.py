@@ -0,0 +1,70 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import cdc, codegen, hid, standard
+
+"""Tests of the compiled serializers against bytes()"""
+
+
+def tree():
+    iad, comm, data = cdc.acm_functions(1)[0]
+    report = hid.ReportDescriptor(description="report", report_descriptor=bytes([0x05, 0x01, 0xC0]))
+    return [iad, comm, data, report]
+
+
+def test_matches_bytes():
+    descriptors = tree()
+    serializer = codegen.compile_serializer(descriptors)
+    expected = b"".join(bytes(d) for d in descriptors)
+    assert serializer() == expected
+    assert len(serializer) == len(expected)
+    assert serializer.pack(serializer.values()) == expected
+    buffer = bytearray(len(expected) + 2)
+    serializer.pack_into(buffer, 2)
+    assert bytes(buffer[2:]) == expected
+
+
+def test_reads_fields_on_each_call():
+    descriptors = tree()
+    serializer = codegen.compile_serializer(descriptors)
+    descriptors[1].bInterfaceNumber = 4
+    descriptors[1].subdescriptors[-1].bEndpointAddress = 0x85
+    assert serializer() == b"".join(bytes(d) for d in descriptors)
+
+
+def test_same_shape_shares_struct():
+    first = codegen.compile_serializer(tree())
+    second = codegen.compile_serializer(tree())
+    assert first.struct is second.struct
+    assert first.source == second.source
+    bare = standard.InterfaceDescriptor(description="i", bInterfaceClass=0xFF)
+    assert codegen.compile_serializer(bare).struct is not first.struct
+
+
+def test_opaque_length_change():
+    descriptors = tree()
+    serializer = codegen.compile_serializer(descriptors)
+    descriptors[-1].report_descriptor += bytes([0xC0])
+    with pytest.raises(ValueError):
+        serializer()
@@ -0,0 +1,91 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import cdc, columnar, standard, util
+
+"""Tests of columnar decoding"""
+
+pytest.importorskip("numpy")
+
+
+def configuration(interfaces, value=1):
+    body = b"".join(bytes(d) for d in interfaces)
+    return bytes(standard.ConfigurationDescriptor(description="c", bConfigurationValue=value,
+                                                  wTotalLength=9 + len(body),
+                                                  bNumInterfaces=1)) + body
+
+
+def device(idProduct):
+    return bytes(standard.DeviceDescriptor(description="d", idVendor=0x239A, idProduct=idProduct,
+                                           iManufacturer=0, iProduct=0, iSerialNumber=0))
+
+
+def vendor():
+    return standard.InterfaceDescriptor(
+        description="vendor", bInterfaceClass=0xFF, bAlternateSetting=1,
+        subdescriptors=[standard.EndpointDescriptor(description="ep",
+                                                    bEndpointAddress=0x83,
+                                                    bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+                                                    wMaxPacketSize=8,
+                                                    bInterval=4)])
+
+
+def corpus():
+    acm = util.join_interfaces(cdc.acm_functions(1))
+    return columnar.Corpus([device(1) + configuration(acm, 2),
+                            configuration([vendor()]),
+                            device(3)])
+
+
+def test_records():
+    data = corpus()
+    assert data.record_count == 3
+    assert list(data.records(standard.DeviceDescriptor)) == [0, 2]
+    assert list(data.records(standard.ConfigurationDescriptor)) == [0, 1]
+    assert list(data.records(standard.EndpointDescriptor)) == [0, 0, 0, 1]
+    interfaces = data.table(standard.InterfaceDescriptor)
+    assert list(interfaces["bInterfaceClass"]) == [0x02, 0x0A, 0xFF]
+
+
+def test_endpoints_join():
+    endpoints = corpus().endpoints()
+    assert list(endpoints["record"]) == [0, 0, 0, 1]
+    assert list(endpoints["idProduct"]) == [1, 1, 1, 0]
+    assert list(endpoints["bConfigurationValue"]) == [2, 2, 2, 1]
+    assert list(endpoints["bInterfaceNumber"]) == [0, 1, 1, 0]
+    assert list(endpoints["bAlternateSetting"]) == [0, 0, 0, 1]
+    assert list(endpoints["bInterfaceClass"]) == [0x02, 0x0A, 0x0A, 0xFF]
+    assert endpoints["transfer_type"][-1] == standard.EndpointDescriptor.TYPE_INTERRUPT
+    assert (endpoints["wMaxPacketSize"][-1], endpoints["bInterval"][-1]) == (8, 4)
+
+
+def test_short_and_malformed():
+    data = columnar.Corpus(bytes([4, 0x04, 0, 0]) + configuration([]))
+    assert data.short == 1
+    assert data.record_count == 1
+    assert len(data) == 1
+    with pytest.raises(ValueError):
+        columnar.Corpus(bytes([9, 0x02, 0]))
+    with pytest.raises(ValueError):
+        columnar.Corpus(bytes([1, 0x02]))
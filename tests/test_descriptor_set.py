@@ -0,0 +1,130 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from adafruit_usb_descriptor import descriptor_set, frozen, hid, standard, util
+
+"""Tests of precomputed GET_DESCRIPTOR responses"""
+
+STRING = standard.StringDescriptor.bDescriptorType
+CONFIGURATION = standard.ConfigurationDescriptor.bDescriptorType
+
+
+def vendor_interface(endpoints=1):
+    return standard.InterfaceDescriptor(
+        description="vendor",
+        bInterfaceClass=0xFF,
+        subdescriptors=[standard.EndpointDescriptor(description="ep",
+                                                    bEndpointAddress=0x81 - 0x80 * i,
+                                                    bmAttributes=standard.EndpointDescriptor.TYPE_BULK)
+                        for i in range(endpoints)])
+
+
+def configuration(*interfaces):
+    header = standard.ConfigurationDescriptor(description="config", wTotalLength=0,
+                                              bNumInterfaces=0)
+    return [header] + util.join_interfaces([[i] for i in interfaces])
+
+
+def descriptors(**kwargs):
+    strings = standard.StringTable(langids=(0x0409, 0x0407))
+    device = standard.DeviceDescriptor(description="device",
+                                       idVendor=0x239A,
+                                       idProduct=0x8000,
+                                       iManufacturer=strings.index({0x0409: "Adafruit",
+                                                                    0x0407: "Adafruit GmbH"}),
+                                       iProduct=strings.index("Test"),
+                                       iSerialNumber=0)
+    return descriptor_set.DescriptorSet(device=device,
+                                        configurations=[configuration(vendor_interface(),
+                                                                      vendor_interface()),
+                                                        configuration(vendor_interface(2))],
+                                        strings=strings,
+                                        **kwargs)
+
+
+def test_configuration_totals():
+    descriptors_ = descriptors()
+    response = descriptors_.get_descriptor(CONFIGURATION)
+    assert len(response) == 9 + 2 * (9 + 7)
+    assert response[2:5] == bytes([41, 0, 2])
+    assert descriptors_.get_descriptor(CONFIGURATION, 1)[2:5] == bytes([32, 0, 1])
+    # wLength truncates the response, as hosts read the header first.
+    assert bytes(descriptors_.get_descriptor(CONFIGURATION, wLength=9)) == bytes(response[:9])
+    assert descriptors_.get_descriptor(CONFIGURATION, 2) is None
+
+
+def test_frozen_configuration():
+    header = frozen.freeze(standard.ConfigurationDescriptor(description="config",
+                                                             wTotalLength=0, bNumInterfaces=0))
+    device = standard.DeviceDescriptor(description="device", idVendor=1, idProduct=2,
+                                       iManufacturer=0, iProduct=0, iSerialNumber=0)
+    descriptors_ = descriptor_set.DescriptorSet(
+        device=device, configurations=[[header] + util.join_interfaces([[vendor_interface()]])])
+    assert descriptors_.get_descriptor(CONFIGURATION)[2:5] == bytes([25, 0, 1])
+    assert header.wTotalLength == 0
+
+
+def test_strings():
+    descriptors_ = descriptors()
+    assert bytes(descriptors_.get_descriptor(STRING, 0)) == bytes([6, 3, 0x09, 0x04, 0x07, 0x04])
+    # The LANGID list ignores wIndex.
+    assert bytes(descriptors_.get_descriptor(STRING, 0, 0x0407)) == bytes([6, 3, 0x09, 0x04, 0x07, 0x04])
+    german = descriptors_.get_descriptor(STRING, 1, 0x0407)
+    assert bytes(german[2:]).decode("utf-16-le") == "Adafruit GmbH"
+    # Unknown languages fall back to the first.
+    assert bytes(descriptors_.get_descriptor(STRING, 1, 0x040C)) == \
+        bytes(descriptors_.get_descriptor(STRING, 1, 0x0409))
+    assert descriptors_.get_descriptor(STRING, 3, 0x0409) is None
+
+
+def test_bos_and_hid_reports():
+    report = hid.ReportDescriptor.GENERIC_MOUSE_REPORT
+    descriptors_ = descriptors(bos=standard.BOSDescriptor(capabilities=[standard.USB20ExtensionDescriptor()]),
+                               hid_reports={1: report})
+    assert bytes(descriptors_.get_descriptor(standard.DESCRIPTOR_TYPE_BOS)) == \
+        bytes([5, 0x0F, 12, 0, 1, 7, 0x10, 2, 2, 0, 0, 0])
+    assert bytes(descriptors_.get_descriptor(descriptor_set.DESCRIPTOR_TYPE_HID_REPORT, 0, 1)) == bytes(report)
+    assert descriptors_.get_descriptor(descriptor_set.DESCRIPTOR_TYPE_HID_REPORT, 0, 0) is None
+    # Request fields come straight from the setup packet.
+    assert bytes(descriptors_.get_descriptor_request(0x2200, 1, 8)) == bytes(report)[:8]
+
+
+def test_control_packets():
+    descriptors_ = descriptors()
+    device = standard.DeviceDescriptor.bDescriptorType
+    assert descriptors_.control_packets(device, bMaxPacketSize=8) == 3
+    assert descriptors_.control_packets(device, wLength=8, bMaxPacketSize=8) == 1
+    # A short response that fills its last packet ends with a zero length packet.
+    assert descriptors_.control_packets(CONFIGURATION, 1, bMaxPacketSize=8, wLength=0xFF) == 5
+    assert descriptors_.control_packets(CONFIGURATION, 1, bMaxPacketSize=8, wLength=32) == 4
+    assert descriptors_.control_packets(CONFIGURATION, 1, bMaxPacketSize=64, wLength=0xFF) == 1
+    assert descriptors_.control_packets(CONFIGURATION, bMaxPacketSize=8, wLength=0xFF) == 6
+    assert descriptors_.control_packets(CONFIGURATION, 2) == 0
+
+
+def test_freeze_after_change():
+    descriptors_ = descriptors()
+    endpoint = descriptors_.configurations[0][1].subdescriptors[0]
+    endpoint.wMaxPacketSize = 512
+    assert descriptors_.get_descriptor(CONFIGURATION)[9 + 9 + 4] == 64
+    descriptors_.freeze()
+    assert descriptors_.get_descriptor(CONFIGURATION)[9 + 9 + 4:9 + 9 + 6] == bytes([0, 2])
@@ -0,0 +1,87 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from adafruit_usb_descriptor import cdc, diff, standard, util
+
+"""Tests of the structural diff"""
+
+
+def endpoint(address, wMaxPacketSize=64):
+    return standard.EndpointDescriptor(description="ep", bEndpointAddress=address,
+                                       bmAttributes=standard.EndpointDescriptor.TYPE_BULK,
+                                       wMaxPacketSize=wMaxPacketSize)
+
+
+def vendor(*endpoints, bInterfaceNumber=0):
+    interface = standard.InterfaceDescriptor(description="vendor", bInterfaceClass=0xFF,
+                                             subdescriptors=list(endpoints))
+    interface.bInterfaceNumber = bInterfaceNumber
+    return interface
+
+
+def configuration(interfaces):
+    length = 9 + sum(len(bytes(interface)) for interface in interfaces)
+    return [standard.ConfigurationDescriptor(description="c", wTotalLength=length,
+                                             bNumInterfaces=len(interfaces))] + interfaces
+
+
+def test_identical_trees():
+    tree = util.join_interfaces(cdc.acm_functions(1))
+    assert diff.diff(tree, util.join_interfaces(cdc.acm_functions(1))) == []
+
+
+def test_inserted_endpoint_is_one_addition():
+    old = vendor(endpoint(0x81), endpoint(0x02))
+    new = vendor(endpoint(0x81), endpoint(0x83), endpoint(0x02))
+    changes = diff.diff(old, new)
+    interface = ("interface", 0, 0)
+    assert [(c.kind, c.path, c.field) for c in changes] == [
+        (diff.CHANGED, (interface,), "bNumEndpoints"),
+        (diff.ADDED, (interface, ("endpoint", 0x83)), None),
+    ]
+    assert changes[1].new is new.subdescriptors[1]
+    assert diff.format_change(changes[1]) == "interface 0.0 / endpoint 0x83: added EndpointDescriptor"
+
+
+def test_alignment_by_number():
+    old = configuration([vendor(endpoint(0x81)), vendor(endpoint(0x82), bInterfaceNumber=1)])
+    new = configuration([vendor(endpoint(0x82, 512), bInterfaceNumber=1)])
+    changes = diff.diff(old, new)
+    assert [(c.kind, c.path[-1], c.field, c.old, c.new) for c in changes] == [
+        (diff.REMOVED, ("interface", 0, 0), None, old[1], None),
+        (diff.CHANGED, ("configuration",), "wTotalLength", 41, 25),
+        (diff.CHANGED, ("configuration",), "bNumInterfaces", 2, 1),
+        (diff.CHANGED, ("endpoint", 0x82), "wMaxPacketSize", 64, 512),
+    ]
+    assert diff.format_change(changes[3]) == \
+        "interface 1.0 / endpoint 0x82: wMaxPacketSize 64 -> 512"
+
+
+def test_bytes_and_variants():
+    base = configuration([vendor(endpoint(0x81))])
+    data = b"".join(bytes(d) for d in base)
+    differ = diff.Differ()
+    results = differ.diff_variants(data, {"same": base,
+                                          "more": configuration([vendor(endpoint(0x81),
+                                                                        endpoint(0x01))])})
+    assert results["same"] == []
+    assert [c.kind for c in results["more"]].count(diff.ADDED) == 1
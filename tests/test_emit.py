@@ -0,0 +1,58 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import os
+import stat
+
+from adafruit_usb_descriptor import emit
+
+"""Tests of writing generated sources"""
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / "descriptors.c"
+    umask = os.umask(0o022)
+    try:
+        assert emit.write_if_changed(str(path), ["int x;\n"])
+        assert mode(path) == 0o644
+        assert not emit.write_if_changed(str(path), ["int x;", "\n"])
+        os.chmod(path, 0o664)
+        assert emit.write_if_changed(str(path), ["int y;\n"])
+        assert mode(path) == 0o664
+        assert path.read_text() == "int y;\n"
+    finally:
+        os.umask(umask)
+    assert os.listdir(tmp_path) == ["descriptors.c"]
+
+
+def test_write_if_changed_leaves_umask(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        assert emit.write_if_changed(str(tmp_path / "a.c"), ["int x;\n"])
+        assert mode(tmp_path / "a.c") == 0o640
+        assert os.umask(0o027) == 0o027
+    finally:
+        os.umask(umask)
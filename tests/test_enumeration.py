@@ -0,0 +1,88 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import descriptor_set, enumeration, standard, util
+
+"""Tests of the enumeration cost simulator"""
+
+
+def interface(description, endpoints):
+    return standard.InterfaceDescriptor(
+        description=description,
+        bInterfaceClass=0xFF,
+        subdescriptors=[standard.EndpointDescriptor(description="{} {}".format(description, i),
+                                                    bEndpointAddress=0x81 + i,
+                                                    bmAttributes=standard.EndpointDescriptor.TYPE_BULK)
+                        for i in range(endpoints)])
+
+
+def descriptors():
+    strings = standard.StringTable()
+    device = standard.DeviceDescriptor(description="device", idVendor=0x239A, idProduct=1,
+                                       iManufacturer=strings.index("Adafruit"),
+                                       iProduct=strings.index("Test"),
+                                       iSerialNumber=strings.index("1234"))
+    header = standard.ConfigurationDescriptor(description="config", wTotalLength=0, bNumInterfaces=0)
+    configuration = [header] + util.join_interfaces([[interface("big", 8)], [interface("small", 0)]])
+    return descriptor_set.DescriptorSet(device=device, configurations=[configuration], strings=strings)
+
+
+def test_linux_requests():
+    result = enumeration.simulate(descriptors())
+    names = [(t.request.name, t.request.bDescriptorType, t.request.wLength) for t in result.transfers]
+    assert names[:5] == [("GET_DESCRIPTOR", 1, 64), ("SET_ADDRESS", None, 0), ("GET_DESCRIPTOR", 1, 18),
+                         ("GET_DESCRIPTOR", 2, 9), ("GET_DESCRIPTOR", 2, 9 + 9 + 8 * 7 + 9)]
+    assert names[-1] == ("SET_CONFIGURATION", None, 0)
+    assert result.setup_packets == len(result.transfers)
+    # The 83 byte configuration takes two 64 byte packets.
+    assert result.transfers[4].data_packets == 2
+    assert result.data_packets == sum(t.data_packets for t in result.transfers)
+
+
+def test_windows_probe_stalls():
+    result = enumeration.simulate(descriptors(), host=enumeration.WINDOWS)
+    probe, = [t for t in result.transfers if t.request.index == 0xEE]
+    assert (probe.length, probe.data_packets, probe.status_packets) == (0, 1, 0)
+
+
+def test_bus_time_depends_on_speed_and_packet_size():
+    full = enumeration.simulate(descriptors())
+    high = enumeration.simulate(descriptors(), speed=standard.SPEED_HIGH)
+    small = enumeration.simulate(descriptors(), bMaxPacketSize=8)
+    assert high.bus_time < full.bus_time < small.bus_time
+    assert small.data_packets > full.data_packets
+    with pytest.raises(ValueError):
+        enumeration.simulate(descriptors(), speed=standard.SPEED_SUPER)
+
+
+def test_ranking():
+    result = enumeration.simulate(descriptors())
+    ranking = result.ranking()
+    seconds = [entry[2] for entry in ranking]
+    assert seconds == sorted(seconds, reverse=True)
+    labels = [entry[0] for entry in ranking]
+    assert labels.index("configuration 0: big") < labels.index("configuration 0: small")
+    assert "string 1 'Adafruit'" in labels and "string 0 (LANGIDs)" in labels
+    data_seconds = sum(t.seconds for t in result.transfers if t.request.bDescriptorType is not None)
+    assert sum(seconds) == pytest.approx(data_seconds)
@@ -0,0 +1,86 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import copy
+import pickle
+
+import pytest
+
+from adafruit_usb_descriptor import cdc, frozen, standard
+
+"""Tests of frozen descriptors"""
+
+
+def function():
+    return cdc.acm_functions(1)[0]
+
+
+def test_freeze_is_immutable():
+    iad, comm, data = frozen.freeze(function())
+    assert frozen.is_frozen(comm) and isinstance(comm, standard.InterfaceDescriptor)
+    with pytest.raises(AttributeError):
+        comm.bInterfaceNumber = 3
+    with pytest.raises(AttributeError):
+        del iad.bFirstInterface
+    assert isinstance(comm.subdescriptors, tuple)
+    with pytest.raises(AttributeError):
+        comm.subdescriptors[-1].bEndpointAddress = 0x85
+    # Fields that serialization fills in can still be set.
+    comm.bNumEndpoints = 1
+
+
+def test_freeze_leaves_original_alone():
+    original = function()
+    expected = [bytes(d) for d in original]
+    frozen_function = frozen.freeze(original)
+    assert [bytes(d) for d in frozen_function] == expected
+    original[1].bInterfaceNumber = 7
+    assert frozen_function[1].bInterfaceNumber == 0
+    assert not frozen.is_frozen(original[1])
+
+
+def test_structural_equality():
+    first, second = frozen.freeze(function()), frozen.freeze(function())
+    assert first == second and first is not second
+    assert hash(first) == hash(second)
+    assert all(a is b for a, b in zip(frozen.freeze(first), first))
+    assert copy.deepcopy(first[1]) is first[1]
+    assert frozen.replace(first[1], bInterfaceNumber=1) != first[1]
+
+
+def test_pickle_round_trip():
+    descriptor = frozen.freeze(function())[1]
+    restored = pickle.loads(pickle.dumps(descriptor))
+    assert restored == descriptor and frozen.is_frozen(restored)
+    assert bytes(restored) == bytes(descriptor)
+
+
+def test_replace_and_update():
+    comm = frozen.freeze(function())[1]
+    renumbered = frozen.replace(comm, bInterfaceNumber=2)
+    assert (comm.bInterfaceNumber, renumbered.bInterfaceNumber) == (0, 2)
+    assert renumbered.subdescriptors is comm.subdescriptors
+    assert frozen.update(comm, bInterfaceNumber=0) is comm
+    assert frozen.update(comm, bInterfaceNumber=2) == renumbered
+    mutable = function()[1]
+    assert frozen.update(mutable, bInterfaceNumber=2) is mutable
+    assert mutable.bInterfaceNumber == 2
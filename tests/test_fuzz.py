@@ -0,0 +1,54 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import random
+
+from adafruit_usb_descriptor import fuzz, parse
+
+"""Tests of the fuzzer"""
+
+
+def test_trees_are_deterministic():
+    first = fuzz.serialize(*fuzz.tree("0:7"))
+    assert fuzz.serialize(*fuzz.tree("0:7")) == first
+    device, configurations = parse.parse_device_file(first)
+    assert fuzz.serialize(device, configurations) == first
+
+
+def test_mutations():
+    data = fuzz.serialize(*fuzz.tree(3))
+    for mutation in fuzz.MUTATIONS:
+        mutant = fuzz.mutate(data, random.Random(mutation), mutation)
+        assert mutant == fuzz.mutate(data, random.Random(mutation), mutation)
+        if mutation in ("truncate", "remove"):
+            assert len(mutant) < len(data)
+        elif mutation in ("extend", "duplicate"):
+            assert len(mutant) > len(data)
+
+
+def test_run_smoke():
+    # A loose time limit, so a busy machine doesn't report slow parses.
+    results = fuzz.run(200, time_limit=5.0)
+    assert results.failures == []
+    assert results.trees == 200
+    assert results.mutants == 800
+    assert results.rejected + results.accepted == results.mutants
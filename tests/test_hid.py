@@ -0,0 +1,45 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from adafruit_usb_descriptor import frozen, hid
+
+"""Tests of the built-in HID reports"""
+
+
+def test_built_in_report_is_shared_by_subclasses():
+    class Reports(hid.ReportDescriptor):
+        MOUSE = hid._BuiltInReport(hid._generic_mouse_report)
+
+    subclass = frozen.frozen_class(Reports)
+    through_subclass = subclass.MOUSE
+    assert "MOUSE" not in vars(subclass)
+    assert Reports.MOUSE is through_subclass
+    assert subclass.MOUSE is through_subclass
+    assert bytes(through_subclass)[:4] == bytes([0x05, 0x01, 0x09, 0x02])
+    frozen_report = frozen.frozen_class(hid.ReportDescriptor).GENERIC_MOUSE_REPORT
+    assert hid.ReportDescriptor.GENERIC_MOUSE_REPORT is frozen_report
+
+
+def test_built_in_reports():
+    assert hid.ReportDescriptor.GENERIC_KEYBOARD_REPORT is hid.ReportDescriptor.GENERIC_KEYBOARD_REPORT
+    fields = hid.report_fields(bytes(hid.ReportDescriptor.MOUSE_KEYBOARD_CONSUMER_SYS_CONTROL_REPORT))
+    assert {field.report_id for field in fields} == {1, 2, 3, 4}
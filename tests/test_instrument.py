@@ -0,0 +1,79 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+
+from adafruit_usb_descriptor import cdc, instrument, standard, util
+
+"""Tests of the instrumentation"""
+
+
+def originals():
+    return (standard.InterfaceDescriptor.__dict__["__bytes__"],
+            cdc.Union.__dict__["__bytes__"],
+            util.join_interfaces)
+
+
+def test_enable_and_disable_restore_functions():
+    before = originals()
+    instrument.enable()
+    try:
+        assert instrument.enabled()
+        patched = originals()
+        assert all(a is not b for a, b in zip(before, patched))
+        instrument.enable()
+        assert originals() == patched
+    finally:
+        instrument.disable()
+    assert not instrument.enabled()
+    assert originals() == before
+    assert instrument.stage("hid") is instrument.stage("emit")
+
+
+def test_measure():
+    before = originals()
+    total = len(instrument.counters)
+    with instrument.measure() as outer:
+        with instrument.measure() as inner:
+            interfaces = util.join_interfaces(cdc.acm_functions(1))
+            with instrument.stage("emit"):
+                data = b"".join(bytes(d) for d in interfaces)
+        bytes(interfaces[1])
+    assert originals() == before
+    assert inner["util.join_interfaces"]["calls"] == 1
+    assert inner["standard.InterfaceDescriptor.__bytes__"]["calls"] == 2
+    assert inner["stage:emit"]["calls"] == 1
+    assert sum(entry["bytes"] for name, entry in inner.as_dict().items()
+               if name in ("standard.InterfaceAssociationDescriptor.__bytes__",
+                           "standard.InterfaceDescriptor.__bytes__")) == len(data)
+    # Inner counts are merged into the enclosing measure, then the module counters.
+    assert outer["standard.InterfaceDescriptor.__bytes__"]["calls"] == 3
+    assert len(instrument.counters) >= max(total, len(outer))
+
+
+def test_counters_merge():
+    counters = instrument.Counters()
+    counters.record("x", nbytes=4, seconds=1.0, self_seconds=0.5)
+    merged = instrument.Counters.from_dict(json.loads(counters.to_json())).merge(counters)
+    assert merged["x"] == {"calls": 2, "bytes": 8, "seconds": 2.0, "self_seconds": 1.0}
+    merged.reset()
+    assert "x" not in merged
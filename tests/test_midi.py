@@ -0,0 +1,58 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import midi
+
+"""Tests of the USB-MIDI event packet codec"""
+
+
+def test_event_packets_round_trip():
+    messages = [bytes([0x90, 60, 100]), bytes([0xC0, 5]), bytes([0xF8]),
+                bytes([0xF0, 1, 2, 3, 4, 0xF7]), bytes([0xF0, 1, 0xF7]), bytes([0xF0, 0xF7])]
+    buffer = bytearray(64)
+    length, count = midi.pack_event_packets(buffer, messages, cable_number=2)
+    assert count == len(messages)
+    assert buffer[:8] == bytes([0x29, 0x90, 60, 100, 0x2C, 0xC0, 5, 0])
+    events = list(midi.unpack_event_packets(buffer[:length]))
+    assert {cable for cable, _, _ in events} == {2}
+    assert [code_index for _, code_index, _ in events] == [0x9, 0xC, 0xF, 0x4, 0x7, 0x7, 0x6]
+    assert b"".join(bytes(data) for _, _, data in events) == b"".join(messages)
+
+
+def test_event_packets_partial():
+    buffer = bytearray(8)
+    assert midi.pack_event_packets(buffer, [bytes([0x80, 60, 0])] * 3) == (8, 2)
+    assert midi.pack_event_packets(buffer, [bytes([0xF0, 1, 2, 3, 4, 5, 0xF7])]) == (0, 0)
+
+
+@pytest.mark.parametrize("message", [
+    bytes([0xF0, 1, 2, 3]),
+    bytes([0xF0, 1, 2, 3, 4]),
+    bytes([0xF0, 1, 0xF7, 2, 0xF7]),
+    bytes([0x90, 60]),
+    bytes([60, 100]),
+])
+def test_malformed_messages(message):
+    with pytest.raises(ValueError):
+        midi.pack_event_packets(bytearray(64), [message])
@@ -0,0 +1,116 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import msc, standard, util
+
+"""Tests of the mass storage interface and Bulk-Only Transport codec"""
+
+
+def test_mass_storage_interfaces():
+    interface, = msc.mass_storage_interfaces(speed=standard.SPEED_HIGH)
+    assert (interface.bInterfaceClass, interface.bInterfaceSubClass,
+            interface.bInterfaceProtocol) == (msc.MSC_CLASS, msc.MSC_SUBCLASS_TRANSPARENT,
+                                              msc.MSC_PROTOCOL_BULK)
+    joined = util.join_interfaces([msc.mass_storage_interfaces(speed=standard.SPEED_HIGH)])
+    data = b"".join(bytes(d) for d in joined)
+    assert len(data) == 9 + 2 * 7
+    assert data[9 + 2] == 0x81 and data[9 + 7 + 2] == 0x01
+    assert data[9 + 4:9 + 6] == (512).to_bytes(2, "little")
+
+
+def test_mass_storage_interfaces_super_speed():
+    interface, = msc.mass_storage_interfaces(speed=standard.SPEED_SUPER, max_burst=3)
+    data = bytes(interface)
+    assert len(data) == 9 + 2 * (7 + 6)
+    companion = data[9 + 7:9 + 13]
+    assert companion[1] == standard.DESCRIPTOR_TYPE_SUPERSPEED_ENDPOINT_COMPANION
+    assert companion[2] == 3
+
+
+def test_cbw_round_trip():
+    cbw = msc.CommandBlockWrapper()
+    cbw.pack_read10(dCBWTag=0x1234, lba=100, blocks=8, bCBWLUN=1)
+    received = msc.CommandBlockWrapper(bytearray(cbw.buffer))
+    received.validate()
+    assert received.dCBWSignature == msc.CBW_SIGNATURE
+    assert received.dCBWTag == 0x1234
+    assert received.dCBWDataTransferLength == 8 * 512
+    assert received.bmCBWFlags == msc.CommandBlockWrapper.DIRECTION_IN
+    assert received.bCBWLUN == 1
+    assert received.bCBWCBLength == 10
+    assert received.operation_code == msc.SCSI_READ_10
+    assert received.read_write10() == (100, 8)
+
+    cbw.pack_inquiry(dCBWTag=1, allocation_length=36)
+    assert cbw.operation_code == msc.SCSI_INQUIRY
+    assert cbw.inquiry_allocation_length() == 36
+
+
+def test_cbw_rejects_bad_signature_and_short_cbw():
+    cbw = msc.CommandBlockWrapper()
+    cbw.pack_test_unit_ready(dCBWTag=1)
+    cbw.validate()
+    with pytest.raises(ValueError):
+        cbw.validate(msc.CommandBlockWrapper.size - 1)
+    cbw.buffer[0] ^= 0xFF
+    with pytest.raises(ValueError):
+        cbw.validate()
+    with pytest.raises(ValueError):
+        msc.CommandBlockWrapper(bytearray(msc.CommandBlockWrapper.size - 1))
+
+
+def test_csw_reply():
+    cbw = msc.CommandBlockWrapper()
+    cbw.pack_read10(dCBWTag=7, lba=0, blocks=2)
+    csw = msc.CommandStatusWrapper()
+    csw.pack_reply(cbw, transferred=512)
+    received = msc.CommandStatusWrapper(bytes(csw.buffer))
+    received.validate(dCBWTag=7)
+    assert (received.dCSWSignature, received.dCSWTag, received.dCSWDataResidue,
+            received.bCSWStatus) == (msc.CSW_SIGNATURE, 7, 512, msc.CSW_STATUS_PASSED)
+    with pytest.raises(ValueError):
+        received.validate(dCBWTag=8)
+
+
+def test_csw_reply_to_overlong_transfer():
+    cbw = msc.CommandBlockWrapper()
+    cbw.pack_inquiry(dCBWTag=1, allocation_length=8)
+    csw = msc.CommandStatusWrapper()
+    csw.pack_reply(cbw, transferred=msc.INQUIRY_LENGTH)
+    assert csw.dCSWDataResidue == 0
+    assert csw.bCSWStatus == msc.CSW_STATUS_PHASE_ERROR
+
+
+def test_scsi_responses():
+    buffer = bytearray(msc.INQUIRY_LENGTH)
+    msc.pack_inquiry_response(buffer, vendor=b"Adafruit", product=b"Disk", revision=b"1.0")
+    assert buffer[1] == 0x80 and buffer[2] == 0x02 and buffer[4] == msc.INQUIRY_LENGTH - 5
+    assert buffer[8:16] == b"Adafruit"
+    assert buffer[16:32] == b"Disk".ljust(16)
+    assert buffer[32:36] == b"1.0 "
+
+    buffer = bytearray(msc.READ_CAPACITY_10_LENGTH)
+    msc.pack_read_capacity10_response(buffer, last_lba=2047, block_size=4096)
+    assert bytes(buffer) == bytes([0, 0, 7, 0xFF, 0, 0, 0x10, 0])
+    assert msc.unpack_read_capacity10_response(buffer) == (2047, 4096)
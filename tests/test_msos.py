@@ -0,0 +1,96 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import struct
+
+from adafruit_usb_descriptor import codegen, msos, standard
+
+"""Byte-for-byte checks of the Microsoft OS 2.0 descriptors against a hand-built image"""
+
+GUID = "{975F44D9-0D08-43FD-8B3E-127CA8AFFF9D}"
+
+
+def u16(value):
+    return struct.pack("<H", value)
+
+
+def reference_set():
+    """The 0xB2 byte WinUSB descriptor set for interface 2, assembled by hand."""
+    name = "DeviceInterfaceGUIDs\0".encode("utf-16-le")
+    value = (GUID + "\0\0").encode("utf-16-le")
+    registry = (u16(8 + len(name) + 2 + len(value)) + u16(msos.MS_OS_20_FEATURE_REG_PROPERTY)
+                + u16(msos.REG_MULTI_SZ) + u16(len(name)) + name + u16(len(value)) + value)
+    return (u16(10) + u16(0) + struct.pack("<I", 0x06030000) + u16(0xB2)
+            + u16(8) + u16(1) + bytes([0, 0]) + u16(0xB2 - 10)
+            + u16(8) + u16(2) + bytes([2, 0]) + u16(0xB2 - 18)
+            + u16(0x14) + u16(3) + b"WINUSB\0\0" + bytes(8)
+            + registry)
+
+
+REFERENCE_CAPABILITY = bytes([
+    28, 0x10, 5, 0,
+    0xDF, 0x60, 0xDD, 0xD8, 0x89, 0x45, 0xC7, 0x4C, 0x9C, 0xD2, 0x65, 0x9D, 0x9E, 0x64, 0x8A, 0x9F,
+    0x00, 0x00, 0x03, 0x06, 0xB2, 0x00, 1, 0,
+])
+
+
+def vendor_interface(number):
+    interface = standard.InterfaceDescriptor(description="vendor", bInterfaceClass=0xFF)
+    interface.bInterfaceNumber = number
+    return interface
+
+
+def descriptor_set(interface):
+    function = msos.winusb_function(interface, device_interface_guid=GUID)
+    return msos.DescriptorSetHeader(
+        subdescriptors=[msos.ConfigurationSubset(subdescriptors=[function])])
+
+
+def test_descriptor_set_matches_reference():
+    reference = reference_set()
+    assert len(reference) == 0xB2
+    assert bytes(descriptor_set(vendor_interface(2))) == reference
+
+
+def test_platform_capability_matches_reference():
+    capability = msos.PlatformCapability(
+        descriptor_set=descriptor_set(vendor_interface(2)), bMS_VendorCode=1)
+    assert bytes(capability) == REFERENCE_CAPABILITY
+    bos = standard.BOSDescriptor(capabilities=[capability])
+    assert bytes(bos) == bytes([5, 0x0F, 33, 0, 1]) + REFERENCE_CAPABILITY
+
+
+def test_compiled_serializer_matches_bytes():
+    interface = vendor_interface(0)
+    capability = msos.PlatformCapability(
+        descriptor_set=descriptor_set(interface), bMS_VendorCode=1)
+    bos = standard.BOSDescriptor(capabilities=[capability])
+    serialize = codegen.compile_serializer(bos)
+    interface.bInterfaceNumber = 2
+    assert serialize() == bytes(bos) == bytes([5, 0x0F, 33, 0, 1]) + REFERENCE_CAPABILITY
+
+    header = msos.DescriptorSetHeader(subdescriptors=[msos.RegistryProperty(name="X", data=1)])
+    assert codegen.compile_serializer(header)() == bytes(header)
+    assert bytes(header)[8:10] == u16(0x1C)
+
+    serialize = codegen.compile_serializer(descriptor_set(interface))
+    assert serialize() == reference_set()
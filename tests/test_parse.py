@@ -0,0 +1,106 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import cdc, hid, parse, standard, util
+
+"""Tests of parsing descriptors back into the library's classes"""
+
+
+def serialize(descriptors):
+    return b"".join(bytes(d) for d in descriptors)
+
+
+def configuration(interfaces, value=1):
+    body = serialize(interfaces)
+    header = standard.ConfigurationDescriptor(description="c", bConfigurationValue=value,
+                                              wTotalLength=9 + len(body),
+                                              bNumInterfaces=len(interfaces))
+    return bytes(header) + body
+
+
+def device():
+    return bytes(standard.DeviceDescriptor(description="d", idVendor=0x239A, idProduct=0x8014,
+                                           iManufacturer=1, iProduct=2, iSerialNumber=3,
+                                           bNumConfigurations=2))
+
+
+def hid_interface():
+    endpoint = standard.EndpointDescriptor(description="ep", bEndpointAddress=0x81,
+                                           bmAttributes=standard.EndpointDescriptor.TYPE_INTERRUPT,
+                                           wMaxPacketSize=8, bInterval=10)
+    endpoint.companion = standard.SuperSpeedEndpointCompanionDescriptor(description="companion")
+    return standard.InterfaceDescriptor(
+        description="hid", bInterfaceClass=0x03,
+        subdescriptors=[hid.HIDDescriptor(description="hid", wDescriptorLength=52), endpoint])
+
+
+def test_device_file_round_trip():
+    acm = util.join_interfaces(cdc.acm_functions(1))
+    data = device() + configuration(acm) + configuration([hid_interface()], 2)
+    parsed_device, configurations = parse.parse_device_file(data)
+    assert parsed_device.idProduct == 0x8014
+    assert len(configurations) == 2
+    assert bytes(parsed_device) + b"".join(serialize(c) for c in configurations) == data
+
+    first = configurations[0]
+    assert [type(d) for d in first] == [standard.ConfigurationDescriptor,
+                                        standard.InterfaceAssociationDescriptor,
+                                        standard.InterfaceDescriptor,
+                                        standard.InterfaceDescriptor]
+    assert any(isinstance(d, cdc.Union) for d in first[2].subdescriptors)
+    interface = configurations[1][1]
+    assert isinstance(interface.subdescriptors[0], hid.HIDDescriptor)
+    endpoint = interface.subdescriptors[1]
+    assert isinstance(endpoint.companion, standard.SuperSpeedEndpointCompanionDescriptor)
+
+
+def test_unknown_descriptors_stay_raw():
+    interface = standard.InterfaceDescriptor(description="vendor", bInterfaceClass=0xFF)
+    vendor = standard.RawDescriptor(description="vendor", data=bytes([5, 0x24, 0x42, 1, 2]))
+    interface.subdescriptors.append(vendor)
+    data = configuration([interface])
+    parsed = parse.parse_configuration(data)
+    assert isinstance(parsed[1].subdescriptors[0], standard.RawDescriptor)
+    assert serialize(parsed) == data
+
+
+def test_mismatched_endpoint_count_is_flattened():
+    data = bytearray(configuration([hid_interface()]))
+    # bNumEndpoints of the interface says 2, but it has one endpoint.
+    data[9 + 4] = 2
+    parsed = parse.parse_configuration(data)
+    assert isinstance(parsed[1], standard.RawDescriptor)
+    assert serialize(parsed) == bytes(data)
+
+
+def test_malformed_files():
+    data = device() + configuration([hid_interface()])
+    with pytest.raises(ValueError):
+        parse.parse_device_file(data + bytes([1]))
+    with pytest.raises(ValueError):
+        parse.parse_device_file(data[:-1])
+    with pytest.raises(ValueError):
+        parse.parse_device(data[9:27])
+    with pytest.raises(ValueError):
+        parse.parse_configuration(bytes([9, 0x02, 200, 0, 0, 1, 0, 0x80, 50]))
@@ -0,0 +1,95 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import itertools
+import random
+
+from adafruit_usb_descriptor import planner, standard
+
+"""Tests of the composite function planner"""
+
+
+def vendor(endpoints, bmAttributes=standard.EndpointDescriptor.TYPE_BULK, bInterval=0):
+    def factory():
+        return [standard.InterfaceDescriptor(
+            description="vendor", bInterfaceClass=0xFF,
+            subdescriptors=[standard.EndpointDescriptor(description="ep",
+                                                        bEndpointAddress=0x80 | i,
+                                                        bmAttributes=bmAttributes,
+                                                        wMaxPacketSize=64,
+                                                        bInterval=bInterval)
+                            for i in range(endpoints)])]
+    return factory
+
+
+def brute_force(candidates, profile):
+    costs = [planner.measure(c.factory(), profile.speed) for c in candidates]
+    limits = profile.limits()
+    best = 0
+    for count in range(len(candidates) + 1):
+        for chosen in itertools.combinations(range(len(candidates)), count):
+            groups = [candidates[i].group for i in chosen if candidates[i].group is not None]
+            used = [sum(costs[i][r] for i in chosen) for r in range(len(limits))]
+            if len(groups) == len(set(groups)) and all(u <= l for u, l in zip(used, limits)):
+                best = max(best, sum(candidates[i].priority for i in chosen))
+    return best
+
+
+def test_beats_greedy():
+    candidates = [planner.Candidate("big", vendor(3), 5),
+                  planner.Candidate("left", vendor(2), 4),
+                  planner.Candidate("right", vendor(2), 3)]
+    plan = planner.plan(candidates, planner.HardwareProfile(description="mcu", endpoints=4))
+    assert plan.functions == ("left", "right")
+    assert plan.priority == 7
+    assert plan.resources["interfaces"] == 2
+    assert plan.resources["endpoints"] == 4
+    assert plan.resources["configuration_length"] == len(plan.configuration)
+    assert plan.configuration[2:5] == bytes([len(plan.configuration), 0, 2])
+
+
+def test_groups_are_exclusive():
+    candidates = [planner.Candidate("keyboard", vendor(1), 3, "hid"),
+                  planner.Candidate("mouse", vendor(1), 2, "hid"),
+                  planner.Candidate("serial", vendor(1), 1)]
+    plan = planner.plan(candidates, planner.HardwareProfile(description="mcu", endpoints=8))
+    assert plan.functions == ("keyboard", "serial")
+
+
+def test_periodic_bandwidth():
+    # 64 bytes every frame is 64 periodic bytes at full speed.
+    candidates = [planner.Candidate("fast", vendor(1, standard.EndpointDescriptor.TYPE_INTERRUPT, 1), 2),
+                  planner.Candidate("slow", vendor(1, standard.EndpointDescriptor.TYPE_INTERRUPT, 2), 1)]
+    profile = planner.HardwareProfile(description="mcu", endpoints=8, periodic_bytes=64)
+    assert planner.measure(candidates[1].factory())[4] == 32
+    assert planner.plan(candidates, profile).functions == ("fast",)
+
+
+def test_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(20):
+        candidates = [planner.Candidate("c{}".format(i), vendor(rng.randint(1, 4)),
+                                        rng.randint(1, 9), rng.choice((None, None, "a", "b")))
+                      for i in range(rng.randint(1, 7))]
+        profile = planner.HardwareProfile(description="mcu", endpoints=rng.randint(1, 8),
+                                          interfaces=rng.randint(1, 4))
+        assert planner.plan(candidates, profile).priority == brute_force(candidates, profile)
@@ -0,0 +1,83 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+
+import pytest
+
+from adafruit_usb_descriptor import cdc, frozen, hid, spec, standard, util
+
+"""Tests of saving and loading descriptor specs"""
+
+
+def tree():
+    template = frozen.freeze(cdc.acm_functions(1)[0])
+    mutable = util.join_interfaces(cdc.acm_functions(1))
+    report = hid.ReportDescriptor(description="mouse",
+                                  report_descriptor=hid.ReportDescriptor.GENERIC_MOUSE_REPORT.report_descriptor)
+    # The template appears twice, as it would in two configurations.
+    return [template, template, mutable, report]
+
+
+def check(loaded, original):
+    assert len(loaded) == len(original)
+    # Objects referenced from several places are still one object.
+    assert all(a is b for a, b in zip(loaded[0], loaded[1]))
+    assert loaded[0] == original[0] and frozen.is_frozen(loaded[0][1])
+    assert [bytes(d) for d in loaded[2]] == [bytes(d) for d in original[2]]
+    assert not frozen.is_frozen(loaded[2][1])
+    assert type(loaded[2][1].subdescriptors) is list
+    assert bytes(loaded[3]) == bytes(original[3])
+    assert loaded[3].description == "mouse"
+
+
+def test_binary_round_trip(tmp_path):
+    original = tree()
+    check(spec.loads(spec.dumps(original)), original)
+    path = str(tmp_path / "tree.spec")
+    spec.save(original, path)
+    check(spec.load(path), original)
+
+
+def test_json_round_trip(tmp_path):
+    original = tree()
+    text = spec.dumps_json(original)
+    check(spec.loads_json(text), original)
+    saved = json.loads(text)
+    assert saved["format"] == spec.FORMAT
+    assert {entry["class"] for entry in saved["objects"]} >= {"standard.InterfaceDescriptor",
+                                                              "cdc.Union", "hid.ReportDescriptor"}
+    path = str(tmp_path / "tree.json")
+    spec.save(original, path)
+    check(spec.load(path), original)
+
+
+def test_rejects_foreign_documents():
+    with pytest.raises(ValueError):
+        spec.loads(b"not a spec")
+    document = spec.to_document(standard.InterfaceDescriptor(description="i", bInterfaceClass=0xFF))
+    with pytest.raises(ValueError):
+        spec.from_document(dict(document, version=spec.VERSION + 1))
+    with pytest.raises(ValueError):
+        spec.from_document(dict(document, classes=["os.system"]))
+    with pytest.raises(ValueError):
+        spec.from_document(dict(document, classes=["standard.struct"]))
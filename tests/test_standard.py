@@ -0,0 +1,142 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import standard
+
+"""Tests of the BOS, device capability and SuperSpeed endpoint companion descriptors"""
+
+Companion = standard.SuperSpeedEndpointCompanionDescriptor
+
+
+def endpoint(bmAttributes, wMaxPacketSize=1024, bInterval=1):
+    return standard.EndpointDescriptor(description="ep",
+                                       bEndpointAddress=0x81,
+                                       bmAttributes=bmAttributes,
+                                       wMaxPacketSize=wMaxPacketSize,
+                                       bInterval=bInterval)
+
+
+def test_bos():
+    bos = standard.BOSDescriptor(capabilities=[standard.USB20ExtensionDescriptor(),
+                                               standard.SuperSpeedDeviceCapabilityDescriptor()])
+    assert bytes(bos) == bytes([
+        5, 0x0F, 22, 0, 2,
+        7, 0x10, 0x02, 0x02, 0, 0, 0,
+        10, 0x10, 0x03, 0, 0x0E, 0, 1, 0x0A, 0xFF, 0x07,
+    ])
+    assert (bos.wTotalLength, bos.bNumDeviceCaps) == (22, 2)
+    assert bytes(standard.BOSDescriptor()) == bytes([5, 0x0F, 5, 0, 0])
+
+
+def test_companion_follows_endpoint():
+    ep = endpoint(standard.EndpointDescriptor.TYPE_BULK)
+    ep.companion = Companion(description="companion", bMaxBurst=3, bmAttributes=4)
+    interface = standard.InterfaceDescriptor(description="i", bInterfaceClass=0xFF,
+                                             subdescriptors=[ep])
+    data = bytes(interface)
+    assert data[9:] == bytes(ep) + bytes([6, 0x30, 3, 4, 0, 0])
+    assert interface.bNumEndpoints == 1
+
+
+def test_for_throughput_bulk():
+    companion = Companion.for_throughput(400e6, endpoint=endpoint(standard.EndpointDescriptor.TYPE_BULK),
+                                         max_streams=4)
+    # 400 MB/s is 50000 bytes per 125us, which needs the full 16 packet burst.
+    assert (companion.bMaxBurst, companion.bmAttributes, companion.wBytesPerInterval) == (15, 4, 0)
+    companion = Companion.for_throughput(10e6, endpoint=endpoint(standard.EndpointDescriptor.TYPE_BULK))
+    assert companion.bMaxBurst == 1
+
+
+def test_for_throughput_isochronous():
+    iso = endpoint(standard.EndpointDescriptor.TYPE_ISOCHRONOUS)
+    companion = Companion.for_throughput(200e6, endpoint=iso)
+    # 25000 bytes per interval is 25 packets: Mult 1 with bursts of 13.
+    assert (companion.bMaxBurst, companion.bmAttributes, companion.wBytesPerInterval) == (12, 1, 26624)
+    with pytest.raises(ValueError):
+        Companion.for_throughput(500e6, endpoint=iso)
+
+
+def test_for_throughput_rejects_bad_arguments():
+    bulk = endpoint(standard.EndpointDescriptor.TYPE_BULK)
+    with pytest.raises(ValueError):
+        Companion.for_throughput(1e6, endpoint=endpoint(standard.EndpointDescriptor.TYPE_BULK, 0))
+    with pytest.raises(ValueError):
+        Companion.for_throughput(1e6, endpoint=bulk, max_streams=17)
+    with pytest.raises(ValueError):
+        Companion.for_throughput(1e6, endpoint=bulk, max_streams=-1)
+    with pytest.raises(ValueError):
+        Companion.for_throughput(1e6, endpoint=endpoint(standard.EndpointDescriptor.TYPE_INTERRUPT),
+                                 max_streams=1)
+    assert Companion.for_throughput(1e6, endpoint=bulk, max_streams=16).bmAttributes == 16
+
+
+def test_string_table_deduplicates_and_indexes():
+    strings = standard.StringTable()
+    assert strings.index("Adafruit") == 1
+    assert strings.index("Feather") == 2
+    assert strings.index("Adafruit") == 1
+    assert len(strings) == 3
+    assert strings.string(2) == "Feather"
+    assert bytes(strings.descriptor(1)) == bytes([18, 3]) + "Adafruit".encode("utf-16-le")
+    with pytest.raises(KeyError):
+        strings.string(0)
+    with pytest.raises(KeyError):
+        strings.descriptor(3)
+
+
+def test_string_table_assign():
+    strings = standard.StringTable()
+    device = standard.DeviceDescriptor(description="d", idVendor=0x239A, idProduct=1,
+                                       iManufacturer="Adafruit", iProduct="Feather",
+                                       iSerialNumber=0)
+    interface = standard.InterfaceDescriptor(description="i", bInterfaceClass=0xFF,
+                                             iInterface="Feather")
+    strings.assign(device, [interface])
+    assert (device.iManufacturer, device.iProduct, interface.iInterface) == (1, 2, 2)
+
+
+def test_string_table_langids():
+    strings = standard.StringTable(langids=(0x0409, 0x0407))
+    index = strings.index({0x0409: "Keyboard", 0x0407: "Tastatur"})
+    assert strings.index("Mouse") == index + 1
+    assert bytes(strings.descriptor(0)) == bytes([6, 3, 0x09, 0x04, 0x07, 0x04])
+    assert strings.string(index, 0x0407) == "Tastatur"
+    assert strings.string(index, 0x0409) == "Keyboard"
+    # Unknown languages fall back to the first.
+    assert strings.string(index, 0x040C) == "Keyboard"
+    # Missing translations use the first language's string.
+    assert strings.string(strings.index({0x0409: "Disk"}), 0x0407) == "Disk"
+    with pytest.raises(ValueError):
+        strings.index({0x0407: "Maus"})
+    with pytest.raises(ValueError):
+        standard.StringTable(langids=())
+
+
+def test_string_descriptors():
+    strings = standard.StringTable()
+    strings.index("Adafruit")
+    descriptors = strings.string_descriptors()
+    assert [d.description for d in descriptors] == ["LANGIDs 0x0409", '"Adafruit"']
+    assert descriptors[1].bString == "Adafruit"
+    assert bytes(descriptors[0]) == bytes([4, 3, 0x09, 0x04])
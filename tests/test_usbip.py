@@ -0,0 +1,162 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+
+from adafruit_usb_descriptor import descriptor_set, standard, usbip, util
+
+"""Round trips between `usbip.UsbipServer` and `usbip.UsbipClient` over loopback"""
+
+BUSID = "1-1"
+
+
+def endpoint(address, bmAttributes=standard.EndpointDescriptor.TYPE_BULK):
+    return standard.EndpointDescriptor(description="ep {:02x}".format(address),
+                                       bEndpointAddress=address,
+                                       bmAttributes=bmAttributes,
+                                       wMaxPacketSize=64)
+
+
+def vendor_descriptors():
+    interface = standard.InterfaceDescriptor(
+        description="vendor",
+        bInterfaceClass=0xFF,
+        subdescriptors=[endpoint(0x81), endpoint(0x01), endpoint(0x82), endpoint(0x83),
+                        endpoint(0x02)])
+    strings = standard.StringTable()
+    # DescriptorSet fills in wTotalLength and bNumInterfaces.
+    configuration = [standard.ConfigurationDescriptor(description="vendor", wTotalLength=0,
+                                                      bNumInterfaces=0)]
+    configuration += util.join_interfaces([[interface]])
+    device = standard.DeviceDescriptor(description="vendor",
+                                       idVendor=0x239A,
+                                       idProduct=0x8001,
+                                       iManufacturer=strings.index("Adafruit Industries"),
+                                       iProduct=strings.index("USB/IP test"),
+                                       iSerialNumber=strings.index("123456"))
+    return descriptor_set.DescriptorSet(device=device, configurations=[configuration],
+                                        strings=strings)
+
+
+def emulated_device():
+    received = []
+
+    async def read(device, address, data, length):
+        return b"hello" * 100
+
+    async def write(device, address, data, length):
+        received.append(data)
+        return len(data)
+
+    async def stall(device, address, data, length):
+        return None
+
+    async def fail(device, address, data, length):
+        raise RuntimeError("handler failed")
+
+    async def control(device, setup, data):
+        raise RuntimeError("handler failed")
+
+    device = usbip.EmulatedDevice(vendor_descriptors(),
+                                  busid=BUSID,
+                                  control_handler=control,
+                                  endpoint_handlers={0x81: read, 0x01: write,
+                                                     0x83: stall, 0x02: fail})
+    return device, received
+
+
+def run(test):
+    async def main():
+        device, received = emulated_device()
+        server = await usbip.UsbipServer([device], port=0).start()
+        client = usbip.UsbipClient(port=server.port)
+        try:
+            await test(device, received, client)
+        finally:
+            await client.close()
+            await server.close()
+    asyncio.run(asyncio.wait_for(main(), 10))
+
+
+def test_enumeration():
+    async def test(device, received, client):
+        assert await client.list_devices() == [(BUSID, 0x239A, 0x8001, [(0xFF, 0, 0)])]
+        await client.import_device(BUSID)
+        found = await client.enumerate()
+        for key, data in found.items():
+            assert data == device.descriptors.get_descriptor(*key)
+        assert device.configuration == 1
+    run(test)
+
+
+def test_in_and_out_transfers():
+    async def test(device, received, client):
+        await client.import_device(BUSID)
+        assert await client.submit(1, usbip.USBIP_DIR_IN, length=64) == \
+            (usbip.STATUS_OK, (b"hello" * 100)[:64])
+        assert await client.submit(1, usbip.USBIP_DIR_OUT, data=b"world") == (usbip.STATUS_OK, b"")
+        assert received == [b"world"]
+    run(test)
+
+
+def test_unlink():
+    async def test(device, received, client):
+        await client.import_device(BUSID)
+        seqnum = client.send_submit(2, usbip.USBIP_DIR_IN, length=64)
+        assert await client.unlink(seqnum) == usbip.STATUS_UNLINKED
+        assert await client.unlink(seqnum) == usbip.STATUS_OK
+        # The connection is still in step after the unlinked URB.
+        assert await client.submit(1, usbip.USBIP_DIR_IN, length=5) == (usbip.STATUS_OK, b"hello")
+    run(test)
+
+
+def test_stalls():
+    async def test(device, received, client):
+        await client.import_device(BUSID)
+        assert await client.submit(3, usbip.USBIP_DIR_IN, length=64) == (usbip.STATUS_STALL, b"")
+        assert await client.submit(2, usbip.USBIP_DIR_OUT, data=b"x") == (usbip.STATUS_STALL, b"")
+        assert await client.control(0xC0, 0x01, wLength=8) == (usbip.STATUS_STALL, b"")
+        assert await client.submit(1, usbip.USBIP_DIR_IN, length=5) == (usbip.STATUS_OK, b"hello")
+    run(test)
+
+
+def iso_submit(client, number_of_packets, descriptors):
+    client.writer.write(
+        usbip._basic_header.pack(usbip.USBIP_CMD_SUBMIT, 1, client.devid, usbip.USBIP_DIR_IN, 1) +
+        usbip._cmd_submit.pack(0, 64, 0, number_of_packets, 0, bytes(8)) +
+        bytes(usbip._iso_packet.size * descriptors))
+
+
+def test_isochronous_urbs():
+    async def test(device, received, client):
+        await client.import_device(BUSID)
+        iso_submit(client, 2, 2)
+        header = await client.reader.readexactly(usbip._basic_header.size)
+        status = usbip._ret_submit.unpack(await client.reader.readexactly(usbip._ret_submit.size))[0]
+        assert usbip._basic_header.unpack(header)[1] == 1
+        assert status == usbip.STATUS_STALL
+
+        # A count beyond the limit ends the connection rather than being read.
+        iso_submit(client, 0x7FFFFFFF, 0)
+        await client.writer.drain()
+        assert await client.reader.read() == b""
+    run(test)
@@ -0,0 +1,92 @@
+# The MIT License (MIT)
+#
+# Copyright (c) 2026 Adafruit Industries
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pytest
+
+from adafruit_usb_descriptor import cdc, standard, util
+
+"""Tests of walking and joining descriptor trees"""
+
+
+def endpoint(address, bmAttributes=standard.EndpointDescriptor.TYPE_BULK):
+    return standard.EndpointDescriptor(description="ep",
+                                       bEndpointAddress=address,
+                                       bmAttributes=bmAttributes,
+                                       wMaxPacketSize=64)
+
+
+def vendor(*endpoints, bAlternateSetting=0):
+    return standard.InterfaceDescriptor(description="vendor", bInterfaceClass=0xFF,
+                                        bAlternateSetting=bAlternateSetting,
+                                        subdescriptors=list(endpoints))
+
+
+def test_walk_order_and_paths():
+    ep = endpoint(0x81)
+    ep.companion = standard.SuperSpeedEndpointCompanionDescriptor(description="companion")
+    interface = vendor(ep, endpoint(0x01))
+    walked = list(util.walk([[interface], vendor()]))
+    assert [node for _, _, node in walked] == [interface, ep, ep.companion,
+                                              interface.subdescriptors[1], walked[-1][2]]
+    assert [depth for depth, _, _ in walked] == [0, 1, 2, 1, 0]
+    assert walked[2][1] == (0, 0, "subdescriptors", 0, "companion")
+    assert walked[-1][1] == (1,)
+
+
+def test_walk_deep_nesting():
+    tree = vendor()
+    for _ in range(5000):
+        tree = [tree]
+    assert len(list(util.walk(tree))) == 1
+
+
+def test_join_offsets_iads_and_unions():
+    first, second = cdc.acm_functions(2)
+    joined = util.join_interfaces([first, second])
+    iads = [d for d in joined if isinstance(d, standard.InterfaceAssociationDescriptor)]
+    assert [iad.bFirstInterface for iad in iads] == [0, 2]
+    interfaces = [d for d in joined if isinstance(d, standard.InterfaceDescriptor)]
+    assert [i.bInterfaceNumber for i in interfaces] == [0, 1, 2, 3]
+    unions = [d for i in interfaces for d in i.subdescriptors if isinstance(d, cdc.Union)]
+    assert [(u.bMasterInterface, list(u.bSlaveInterface_list)) for u in unions] == [(0, [1]), (2, [3])]
+    addresses = [d.bEndpointAddress for i in interfaces for d in i.subdescriptors
+                 if isinstance(d, standard.EndpointDescriptor)]
+    assert len(set(addresses)) == len(addresses)
+
+
+def test_join_alternate_settings():
+    idle = vendor()
+    active = vendor(endpoint(0x80), endpoint(0x00), bAlternateSetting=1)
+    other = vendor(endpoint(0x80))
+    joined = util.join_interfaces([[idle, active], [other]])
+    assert [i.bInterfaceNumber for i in joined] == [0, 0, 1]
+    assert [e.bEndpointAddress for e in active.subdescriptors] == [0x81, 0x01]
+    # The alternate setting's endpoints are counted before the next interface.
+    assert other.subdescriptors[0].bEndpointAddress == 0x82
+
+
+def test_join_without_renumbering():
+    with pytest.raises(ValueError):
+        util.join_interfaces([[vendor(endpoint(0x00))]], renumber_endpoints=False)
+    interface = vendor(endpoint(0x83))
+    util.join_interfaces([[interface]], renumber_endpoints=False)
+    assert interface.subdescriptors[0].bEndpointAddress == 0x83